@@ -0,0 +1,79 @@
+"""
+Compare the streaming DOCX reader with python-docx
+
+Times reading every paragraph (as the DDL scanner receives them) with
+parsers.docx_reader and with python-docx's object model, and reports the
+peak traced memory of each. python-docx builds its tree in lxml, whose C
+allocations tracemalloc does not see, so its memory figure is a lower bound;
+run large files through /usr/bin/time -v to compare peak RSS.
+
+Usage:
+    python benchmarks/docx_reader.py [FILE.docx ...] [--repeat 20]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from parsers.docx_reader import iter_docx_blocks  # noqa: E402
+
+
+def read_streaming(file_path):
+    return sum(len(block) for block in iter_docx_blocks(file_path))
+
+
+def read_python_docx(file_path):
+    from docx import Document
+
+    return sum(len(paragraph.text) + 1 for paragraph in Document(file_path).paragraphs)
+
+
+READERS = {"streaming": read_streaming, "python-docx": read_python_docx}
+
+
+def measure(reader, file_path, repeat):
+    """
+    Returns:
+        tuple: (best seconds over repeat runs, peak traced memory in bytes, characters read)
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        characters = reader(file_path)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    tracemalloc.start()
+    try:
+        reader(file_path)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak, characters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="*", help="Files to read (default: schema_validation/*.docx)")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per file (best is reported)")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(glob.glob(os.path.join(REPO_ROOT, "schema_validation", "*.docx")))
+    for file_path in files:
+        print(f"📄 {os.path.relpath(file_path)} ({os.path.getsize(file_path)} bytes)")
+        timings = {}
+        for name, reader in READERS.items():
+            seconds, peak, characters = measure(reader, file_path, args.repeat)
+            timings[name] = seconds
+            print(f"  {name:<12} {seconds * 1000:9.2f} ms, peak {peak / 2 ** 20:7.2f} MiB, {characters} characters")
+        print(f"  streaming is {timings['python-docx'] / timings['streaming']:.1f}x faster")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""
+Import-time regression check for the fast CLI paths
+
+Imports the modules behind ``cli.py compare`` in a fresh interpreter, then
+fails when a heavy dependency was pulled in or the import took longer than
+the budget.
+
+Usage:
+    python benchmarks/import_time.py [--budget SECONDS]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must never be imported by the compare path
+HEAVY_MODULES = ("great_expectations", "langchain", "langchain_ollama", "chromadb", "pandas", "docx", "numpy")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import cli
+import generate_report
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"seconds": elapsed, "heavy_modules": heavy}}))
+"""
+
+
+def measure(runs=3):
+    """
+    Import the compare path in fresh interpreters
+
+    Returns:
+        dict: Best import time in seconds and any heavy modules that were loaded
+    """
+    best = None
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, check=True, capture_output=True, text=True
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum import time in seconds")
+    args = parser.parse_args(argv)
+
+    result = measure()
+    print(f"Import time of the compare path: {result['seconds'] * 1000:.1f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    failed = False
+    if result["heavy_modules"]:
+        print(f"❌ Heavy modules imported: {', '.join(result['heavy_modules'])}")
+        failed = True
+    if result["seconds"] > args.budget:
+        print("❌ Import time over budget")
+        failed = True
+    if not failed:
+        print("✅ Import time check passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
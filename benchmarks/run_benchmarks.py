@@ -0,0 +1,253 @@
+"""
+Benchmark every pipeline stage on synthetic schemas
+
+For each size, a source/destination schema pair is generated with
+synthetic_schema.py and these stages are timed and memory-profiled:
+extract_sql_schemas (.sql, .txt, .docx), chunk_tables, compare_schemas
+(including building the table IR), generate_html_report and ingestion into
+ChromaDB with a local fake embedder (no Ollama needed).
+
+Each stage is timed in a plain run; its peak traced memory is measured in a
+second run under tracemalloc so the tracing overhead does not skew the timings.
+Results are written as JSON to benchmarks/results/ and can be compared with an
+earlier run using --baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--sizes 100,1000,10000,100000]
+        [--stages extract,chunk,compare,html,ingest] [--no-memory] [--baseline OLD.json]
+"""
+import argparse
+import contextlib
+import datetime
+import gc
+import hashlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.synthetic_schema import write_schema_pair  # noqa: E402
+from parsers.docx_schema_parser import extract_sql_schemas  # noqa: E402
+from parsers.schema_ir import build_schema_ir, clear_table_cache  # noqa: E402
+from utils.chunk_utils import chunk_tables, column_records  # noqa: E402
+from utils.html_report import generate_html_report  # noqa: E402
+from validators.schema_comparator import compare_schemas  # noqa: E402
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+STAGES = ("extract", "chunk", "compare", "html", "ingest")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+# Chunking settings of the shipped config.yaml
+CHUNK_SIZE = 500
+CHUNK_OVERLAP = 50
+
+
+class FakeEmbeddingFunction:
+    """Deterministic local embedder: hashes each text into a small unit vector"""
+
+    dimensions = 64
+
+    def __init__(self):
+        self.cache = None
+
+    def __call__(self, input):
+        embeddings = []
+        for text in input:
+            digest = hashlib.blake2b(text.encode("utf-8"), digest_size=self.dimensions).digest()
+            vector = [byte / 255.0 - 0.5 for byte in digest]
+            norm = sum(value * value for value in vector) ** 0.5 or 1.0
+            embeddings.append([value / norm for value in vector])
+        return embeddings
+
+    @staticmethod
+    def name():
+        return "benchmark-fake"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _measure(function, memory=True, reset=None):
+    """
+    Time a stage, then measure its peak traced memory in a second run
+
+    Args:
+        function: Zero-argument callable running the stage; called twice when memory is True
+        memory: Also measure peak memory
+        reset: Optional callable run before each run (e.g. to drop caches)
+
+    Returns:
+        tuple: (return value of the timed run, seconds, peak memory in bytes or None)
+    """
+    if reset is not None:
+        reset()
+    gc.collect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        value = function()
+        seconds = time.perf_counter() - start
+
+    peak = None
+    if memory:
+        if reset is not None:
+            reset()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return value, seconds, peak
+
+
+def run_size(tables, work_dir, stages=STAGES, memory=True, columns=8, drift=0.1, seed=42):
+    """
+    Benchmark the selected stages at one size
+
+    Returns:
+        list: One result dict per stage
+    """
+    paths = write_schema_pair(os.path.join(work_dir, "schemas"), tables=tables, columns=columns,
+                              drift=drift, seed=seed)
+    results = []
+
+    def record(stage, seconds, peak, items, **extra):
+        result = {"tables": tables, "stage": stage, "seconds": round(seconds, 6),
+                  "peak_memory_bytes": peak, "items": items}
+        result.update(extra)
+        results.append(result)
+        peak_text = f", peak {peak / 2 ** 20:.1f} MiB" if peak is not None else ""
+        print(f"  {stage:<28} {seconds:9.3f} s{peak_text}")
+
+    # Parsing is always run: the later stages need the parsed tables
+    parsed = {}
+    for ext, (source_path, destination_path) in paths.items():
+        source, seconds, peak = _measure(lambda: extract_sql_schemas(source_path),
+                                         memory and "extract" in stages)
+        parsed[ext] = source
+        if "extract" in stages:
+            record(f"extract_sql_schemas[{ext}]", seconds, peak, len(source),
+                   file_bytes=os.path.getsize(source_path))
+    source_tables = parsed[".sql"]
+    destination_tables = extract_sql_schemas(paths[".sql"][1])
+
+    if "chunk" in stages:
+        chunks, seconds, peak = _measure(lambda: chunk_tables(source_tables, CHUNK_SIZE, CHUNK_OVERLAP), memory)
+        record("chunk_tables", seconds, peak, len(chunks))
+
+    report = None
+    if "compare" in stages or "html" in stages:
+        def compare():
+            return compare_schemas(build_schema_ir("synthetic_source", source_tables),
+                                   build_schema_ir("synthetic_destination", destination_tables))
+        # Table IR is memoized, so every run starts from an empty cache
+        report, seconds, peak = _measure(compare, memory, reset=clear_table_cache)
+        if "compare" in stages:
+            record("compare_schemas", seconds, peak, len(report["results"]),
+                   different_tables=report["meta"]["statistics"]["different_tables"])
+
+    if "html" in stages:
+        html_path = os.path.join(work_dir, "report.html")
+        _, seconds, peak = _measure(lambda: generate_html_report(report, html_path), memory)
+        record("generate_html_report", seconds, peak, len(report["results"]),
+               file_bytes=os.path.getsize(html_path))
+
+    if "ingest" in stages:
+        from database.chroma_store import store_schemas
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            chunks = chunk_tables(source_tables, CHUNK_SIZE, CHUNK_OVERLAP)
+        columns = column_records(source_tables)
+        runs = iter(range(2))
+
+        def ingest():
+            # Every run stores into a fresh database so both runs do the same work
+            config = {"chromadb_path": os.path.join(work_dir, f"chromadb_{next(runs)}")}
+            store_schemas(chunks, config, incremental=True,
+                          embedding_function=FakeEmbeddingFunction(), column_records=columns)
+        _, seconds, peak = _measure(ingest, memory)
+        record("ingest[fake_embedder]", seconds, peak, len(source_tables))
+
+    return results
+
+
+def compare_with_baseline(results, baseline_path):
+    """Print the change of every stage relative to an earlier results file"""
+    with open(baseline_path, "r") as f:
+        baseline = json.load(f)
+    previous = {(r["tables"], r["stage"]): r for r in baseline["results"]}
+
+    print(f"\nChange relative to {baseline_path} (commit {baseline.get('commit', 'unknown')}):")
+    for result in results:
+        old = previous.get((result["tables"], result["stage"]))
+        if old is None or not old["seconds"]:
+            continue
+        change = (result["seconds"] - old["seconds"]) / old["seconds"] * 100
+        print(f"  {result['tables']:>7} {result['stage']:<28} {old['seconds']:9.3f} s -> "
+              f"{result['seconds']:9.3f} s ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated table counts")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run")
+    parser.add_argument("--columns", type=int, default=8, help="Average columns per table")
+    parser.add_argument("--drift", type=float, default=0.1, help="Fraction of drifted tables")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc runs")
+    parser.add_argument("--output", help="Results path (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    stages = tuple(stage.strip() for stage in args.stages.split(","))
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(sorted(unknown))}")
+
+    commit = _git_commit()
+    results = []
+    for tables in sizes:
+        print(f"📊 {tables} tables")
+        with tempfile.TemporaryDirectory() as work_dir:
+            results.extend(run_size(tables, work_dir, stages, not args.no_memory,
+                                    args.columns, args.drift, args.seed))
+
+    timestamp = datetime.datetime.now()
+    output_path = args.output or os.path.join(
+        RESULTS_DIR, f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{commit}.json")
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump({
+            "commit": commit,
+            "timestamp": timestamp.isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "parameters": {"sizes": sizes, "stages": list(stages), "columns": args.columns,
+                           "drift": args.drift, "seed": args.seed, "memory": not args.no_memory},
+            "results": results
+        }, f, indent=2)
+    print(f"✅ Benchmark results saved to {output_path}")
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Deterministic synthetic DDL generator
+
+Generates a source schema and a drifted destination schema and writes them as
+.sql (one column per line), .txt (one statement per line) and .docx (one
+statement per paragraph), the layouts used by the files in schema_validation/.
+The same arguments and seed always produce byte-identical files.
+
+Usage:
+    python benchmarks/synthetic_schema.py OUTPUT_DIR --tables 1000 [--columns 8]
+        [--type-mix INT=0.5,VARCHAR=0.5] [--constraint-density 0.2] [--drift 0.1] [--seed 42]
+"""
+import argparse
+import os
+import random
+import sys
+import zipfile
+from xml.sax.saxutils import escape
+
+# Relative frequency of each column type
+DEFAULT_TYPE_MIX = {
+    "INT": 0.30,
+    "VARCHAR": 0.25,
+    "DATE": 0.10,
+    "DECIMAL": 0.10,
+    "TEXT": 0.08,
+    "BOOLEAN": 0.07,
+    "TIMESTAMP": 0.05,
+    "BIGINT": 0.05,
+}
+
+_WORDS = (
+    "account address asset audit balance branch budget category client contract cost customer "
+    "department device employee event invoice item ledger location member order payment payroll "
+    "period product project rating record region report request review role schedule service "
+    "shift skill status supplier task team ticket training transaction vendor"
+).split()
+
+_COLUMN_WORDS = (
+    "amount code comment created date description email end flag hours label level name note "
+    "number owner phone price quantity rate reference score start state title total type updated value"
+).split()
+
+
+def _render_type(rng, type_name):
+    if type_name == "VARCHAR":
+        return f"VARCHAR({rng.choice((20, 50, 100, 255))})"
+    if type_name == "DECIMAL":
+        return f"DECIMAL({rng.choice((10, 12, 18))},{rng.choice((2, 4))})"
+    return type_name
+
+
+def _pick_type(rng, type_mix):
+    return rng.choices(list(type_mix), weights=list(type_mix.values()))[0]
+
+
+def _table_name(index):
+    # Word pairs keep names readable; the index keeps them unique at any scale
+    first = _WORDS[index % len(_WORDS)].capitalize()
+    second = _WORDS[(index // len(_WORDS)) % len(_WORDS)].capitalize()
+    return f"{first}{second}{index // (len(_WORDS) ** 2) or ''}"
+
+
+def _column(rng, name, type_mix, constraint_density, table_names, referenceable):
+    definition = _render_type(rng, _pick_type(rng, type_mix))
+    if rng.random() < constraint_density:
+        constraint = rng.choice(("NOT NULL", "UNIQUE", "DEFAULT", "REFERENCES"))
+        if constraint == "DEFAULT":
+            definition += " DEFAULT 0" if definition.startswith(("INT", "BIGINT", "DECIMAL")) else " NOT NULL"
+        elif constraint == "REFERENCES" and referenceable:
+            # Only tables defined earlier are referenced
+            definition += f" REFERENCES {table_names[rng.randrange(referenceable)]}(id)"
+        elif constraint != "REFERENCES":
+            definition += f" {constraint}"
+    return [name, definition]
+
+
+def generate_tables(tables=100, columns=8, type_mix=None, constraint_density=0.2, seed=42):
+    """
+    Generate table definitions
+
+    Args:
+        tables: Number of tables
+        columns: Average number of columns per table (besides the primary key)
+        type_mix: Dict of column type -> relative frequency
+        constraint_density: Probability that a column carries a constraint
+        seed: Random seed
+
+    Returns:
+        list: (table name, [[column name, definition], ...]) tuples
+    """
+    rng = random.Random(seed)
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    names = [_table_name(i) for i in range(tables)]
+    result = []
+
+    for i, table_name in enumerate(names):
+        column_count = max(1, rng.randint(columns // 2, columns + columns // 2))
+        column_defs = [["id", "INT PRIMARY KEY"]]
+        used = {"id"}
+        for _ in range(column_count):
+            name = f"{rng.choice(_COLUMN_WORDS)}_{rng.choice(_COLUMN_WORDS)}"
+            while name in used:
+                name += f"_{len(used)}"
+            used.add(name)
+            column_defs.append(_column(rng, name, type_mix, constraint_density, names, i))
+        result.append((table_name, column_defs))
+    return result
+
+
+def drift_tables(tables, drift=0.1, type_mix=None, seed=43):
+    """
+    Derive a destination schema in which a fraction of the tables changed
+
+    A drifted table has a column type changed, a column dropped, a column
+    added, or a column renamed; a few drifted tables are removed outright and
+    replaced by new ones.
+
+    Args:
+        tables: Output of generate_tables
+        drift: Fraction of tables to change
+        type_mix: Dict of column type -> relative frequency for changed columns
+        seed: Random seed
+
+    Returns:
+        list: (table name, columns) tuples
+    """
+    rng = random.Random(seed)
+    type_mix = type_mix or DEFAULT_TYPE_MIX
+    drifted = []
+
+    for table_name, column_defs in tables:
+        if rng.random() >= drift:
+            drifted.append((table_name, column_defs))
+            continue
+
+        column_defs = [list(column) for column in column_defs]
+        change = rng.choice(("type", "drop", "add", "rename", "type", "drop", "add", "rename", "table"))
+        if change == "table":
+            drifted.append((f"{table_name}New", column_defs))
+            continue
+
+        index = rng.randrange(1, len(column_defs)) if len(column_defs) > 1 else None
+        if change == "type" and index is not None:
+            column_defs[index][1] = _render_type(rng, _pick_type(rng, type_mix))
+        elif change == "drop" and index is not None:
+            del column_defs[index]
+        elif change == "rename" and index is not None:
+            column_defs[index][0] += "_renamed"
+        else:
+            column_defs.append([f"added_{rng.choice(_COLUMN_WORDS)}", _render_type(rng, _pick_type(rng, type_mix))])
+        drifted.append((table_name, column_defs))
+    return drifted
+
+
+def iter_ddl(schema_name, tables, multiline=True):
+    """Yield one CREATE TABLE statement per table"""
+    separator = ",\n    " if multiline else ", "
+    for table_name, column_defs in tables:
+        body = separator.join(f"{name} {definition}" for name, definition in column_defs)
+        if multiline:
+            yield f"CREATE TABLE {schema_name}.{table_name} (\n    {body}\n);"
+        else:
+            yield f"CREATE TABLE {schema_name}.{table_name} ( {body} );"
+
+
+def write_sql(path, schema_name, tables):
+    with open(path, "w", encoding="utf-8") as f:
+        for statement in iter_ddl(schema_name, tables):
+            f.write(statement + "\n\n")
+
+
+def write_txt(path, schema_name, tables):
+    with open(path, "w", encoding="utf-8") as f:
+        for statement in iter_ddl(schema_name, tables, multiline=False):
+            f.write(statement + "\n")
+
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+
+_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+
+def write_docx(path, schema_name, tables):
+    """Write a minimal .docx (one statement per paragraph) without python-docx"""
+    # A fixed timestamp keeps the archive byte-identical between runs
+    def entry(name):
+        info = zipfile.ZipInfo(name, date_time=(2020, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return info
+
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr(entry("[Content_Types].xml"), _CONTENT_TYPES)
+        archive.writestr(entry("_rels/.rels"), _RELS)
+        with archive.open(entry("word/document.xml"), "w", force_zip64=True) as document:
+            document.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                           b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                           b'<w:body>')
+            for statement in iter_ddl(schema_name, tables, multiline=False):
+                document.write(f'<w:p><w:r><w:t xml:space="preserve">{escape(statement)}</w:t></w:r></w:p>'.encode("utf-8"))
+            document.write(b"</w:body></w:document>")
+
+
+WRITERS = {".sql": write_sql, ".txt": write_txt, ".docx": write_docx}
+
+
+def write_schema_pair(output_dir, tables=100, columns=8, type_mix=None, constraint_density=0.2,
+                      drift=0.1, seed=42, formats=(".sql", ".txt", ".docx"),
+                      source_name="synthetic_source", destination_name="synthetic_destination"):
+    """
+    Generate a source schema and its drifted destination and write them to disk
+
+    Args:
+        output_dir: Directory for the generated files
+        tables, columns, type_mix, constraint_density: See generate_tables
+        drift: See drift_tables
+        seed: Random seed (the destination uses seed + 1)
+        formats: File extensions to write
+        source_name, destination_name: Schema (and file) names
+
+    Returns:
+        dict: extension -> (source path, destination path)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    source = generate_tables(tables, columns, type_mix, constraint_density, seed)
+    destination = drift_tables(source, drift, type_mix, seed + 1)
+
+    paths = {}
+    for ext in formats:
+        source_path = os.path.join(output_dir, source_name + ext)
+        destination_path = os.path.join(output_dir, destination_name + ext)
+        WRITERS[ext](source_path, source_name, source)
+        WRITERS[ext](destination_path, destination_name, destination)
+        paths[ext] = (source_path, destination_path)
+    return paths
+
+
+def parse_type_mix(text):
+    """Parse a type mix such as "INT=0.5,VARCHAR=0.3,DATE=0.2" """
+    type_mix = {}
+    for part in text.split(","):
+        type_name, _, weight = part.partition("=")
+        type_mix[type_name.strip().upper()] = float(weight or 1)
+    return type_mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("output_dir")
+    parser.add_argument("--tables", type=int, default=100)
+    parser.add_argument("--columns", type=int, default=8)
+    parser.add_argument("--type-mix", type=parse_type_mix, default=None,
+                        help="Column type frequencies, e.g. INT=0.5,VARCHAR=0.3,DATE=0.2")
+    parser.add_argument("--constraint-density", type=float, default=0.2)
+    parser.add_argument("--drift", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--formats", default=".sql,.txt,.docx", help="Comma-separated file extensions")
+    args = parser.parse_args(argv)
+
+    paths = write_schema_pair(args.output_dir, args.tables, args.columns, args.type_mix, args.constraint_density,
+                              args.drift, args.seed, tuple(args.formats.split(",")))
+    for source_path, destination_path in paths.values():
+        print(f"✅ Wrote {source_path} and {destination_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import argparse
+import sys
+
+# Only the standard library is imported here; each subcommand imports what it
+# needs, so `compare` never pays for great_expectations, langchain or chromadb.
+
+
+def _setup(args):
+    from setup_environment import setup_environment
+
+    setup_environment(args.config)
+    return 0
+
+
+def _ingest(args):
+    import load_data
+
+    load_data.main(args.config)
+    return 0
+
+
+def _compare(args):
+    from generate_report import load_config, report_file_path, run_comparison
+    from utils.metrics import metrics_run
+    from utils.report_io import report_passed
+    from utils.result_store import ResultStore
+
+    config = load_config(args.config)
+    if args.diffs:
+        config["diff_export_path"] = args.diffs
+    with metrics_run(config, "compare"):
+        report = run_comparison(config, use_vector_store=False, write_html=args.html,
+                                result_store=ResultStore.from_config(config), force=args.force)
+    if report is None:
+        return 2
+    # With --check the exit status tells CI whether the written report passed
+    return 1 if args.check and not report_passed(report_file_path(config)) else 0
+
+
+def _report(args):
+    from generate_report import generate_report, load_config
+    from utils.metrics import metrics_run
+
+    config = load_config(args.config)
+    with metrics_run(config, "report"):
+        report = generate_report(config, force=args.force)
+    return 0 if report is not None else 2
+
+
+def _ask(args):
+    from generate_report import ask_questions, load_config
+    from utils.metrics import metrics_run
+
+    config = load_config(args.config)
+    with metrics_run(config, "ask"):
+        ask_questions(config)
+    return 0
+
+
+def _serve(args):
+    import validation_service
+
+    validation_service.main(args.config, host=args.host, port=args.port, use_vector_store=args.store)
+    return 0
+
+
+def _watch(args):
+    import watch_schemas
+
+    watch_schemas.main(args.config, write_html=args.html, use_vector_store=args.store, validate=args.ge)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="cli.py", description="Database schema validation")
+    parser.add_argument("--config", default="config.yaml", help="Path of the YAML configuration")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    setup = subparsers.add_parser("setup", help="Create directories and initialize Great Expectations")
+    setup.set_defaults(handler=_setup)
+
+    ingest = subparsers.add_parser("ingest", help="Parse schema files and store them in ChromaDB")
+    ingest.set_defaults(handler=_ingest)
+
+    compare = subparsers.add_parser("compare", help="Compare schemas and write the report (no vector store, no LLM)")
+    compare.add_argument("--html", action="store_true", help="Also write the HTML report")
+    compare.add_argument("--check", action="store_true", help="Exit with status 1 when the schemas differ")
+    compare.add_argument("--diffs", metavar="PATH", help="Export the diff records as CSV (or Parquet for .parquet)")
+    compare.add_argument("--force", action="store_true", help="Recompute even when a stored result exists")
+    compare.set_defaults(handler=_compare)
+
+    report = subparsers.add_parser("report", help="Full report: vector store, rename suggestions, HTML and LLM summary")
+    report.add_argument("--force", action="store_true", help="Recompute even when a stored result exists")
+    report.set_defaults(handler=_report)
+
+    ask = subparsers.add_parser("ask", help="Ask questions about the saved comparison report")
+    ask.set_defaults(handler=_ask)
+
+    serve = subparsers.add_parser("serve", help="Run the local HTTP validation service with schemas kept in memory")
+    serve.add_argument("--host", help="Address to listen on (default: service_host from the config)")
+    serve.add_argument("--port", type=int, help="Port to listen on (default: service_port from the config)")
+    serve.add_argument("--store", action="store_true", help="Sync schemas into ChromaDB and allow rename suggestions")
+    serve.set_defaults(handler=_serve)
+
+    watch = subparsers.add_parser("watch", help="Re-validate incrementally whenever schema files change")
+    watch.add_argument("--html", action="store_true", help="Also rewrite the HTML report")
+    watch.add_argument("--store", action="store_true", help="Also sync changed schemas into ChromaDB")
+    watch.add_argument("--ge", action="store_true", help="Also run Great Expectations on changed schemas")
+    watch.set_defaults(handler=_watch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,46 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import chromadb
-from langchain_ollama import OllamaEmbeddings
 from chromadb.utils.embedding_functions import EmbeddingFunction
+from database.embedding_cache import EmbeddingCache
+from utils.chunk_utils import content_fingerprint
+from utils.metrics import count, span
 
 
 class LangchainEmbeddingFunction(EmbeddingFunction):
     """
     Adapter class to make langchain embeddings compatible with ChromaDB
+
+    Texts are sent to the model through ``embed_documents`` in batches of
+    ``batch_size``, with up to ``max_workers`` batches in flight at once.
+    Failed batches are retried ``max_retries`` times with exponential backoff.
+    When an ``EmbeddingCache`` is given, only texts missing from it reach the model.
     """
 
-    def __init__(self, model_name):
+    def __init__(self, model_name, batch_size=32, max_workers=4, max_retries=3, retry_backoff=1.0, cache=None):
+        from langchain_ollama import OllamaEmbeddings
+
+        self.model_name = model_name
         self.embedding_model = OllamaEmbeddings(model=model_name)
+        self.cache = cache
+        self.batch_size = max(1, int(batch_size))
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max(1, int(max_retries))
+        self.retry_backoff = retry_backoff
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the embedding function from the ``embedding_*`` settings in config.yaml"""
+        return cls(
+            config["embedding_model"],
+            batch_size=config.get("embedding_batch_size", 32),
+            max_workers=config.get("embedding_concurrency", 4),
+            max_retries=config.get("embedding_max_retries", 3),
+            cache=EmbeddingCache.from_config(config)
+        )
 
     def __call__(self, input):
         """
@@ -19,80 +50,267 @@ class LangchainEmbeddingFunction(EmbeddingFunction):
             input: List of texts to embed
 
         Returns:
-            List of embeddings, one per input text
+            List of embeddings, one per input text, in input order
         """
-        embeddings = []
-        for text in input:
-            embedding = self.embedding_model.embed_query(text)
-            embeddings.append(embedding)
+        texts = list(input)
+        if not texts:
+            return []
+
+        if self.cache is None:
+            return self._embed_texts(texts)
+
+        embeddings = self.cache.get_many(self.model_name, texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        count("embedding_cache_hits", len(texts) - len(missing))
+        count("embedding_cache_misses", len(missing))
+
+        if missing:
+            computed = self._embed_texts([texts[i] for i in missing])
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+            self.cache.put_many(self.model_name, [texts[i] for i in missing], computed)
+
         return embeddings
 
+    def _embed_texts(self, texts):
+        """Embed texts through the model in concurrent batches"""
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        count("chunks_embedded", len(texts))
+        count("embedding_batches", len(batches))
+
+        if len(batches) == 1 or self.max_workers == 1:
+            batch_embeddings = [self._embed_batch(batch) for batch in batches]
+        else:
+            # executor.map preserves the order of the batches
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as executor:
+                batch_embeddings = list(executor.map(self._embed_batch, batches))
+
+        return [embedding for batch in batch_embeddings for embedding in batch]
+
+    def _embed_batch(self, batch):
+        """Embed one batch of texts, retrying on failure"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                with span("embed_batch"):
+                    embeddings = self.embedding_model.embed_documents(batch)
+                if len(embeddings) != len(batch):
+                    raise ValueError(f"expected {len(batch)} embeddings, got {len(embeddings)}")
+                return embeddings
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self.retry_backoff * (2 ** (attempt - 1))
+                print(f"⚠️ Embedding batch failed (attempt {attempt}/{self.max_retries}): {e}. Retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+
+SCHEMAS_COLLECTION = "schemas"
+COLUMNS_COLLECTION = "schema_columns"
+
+
+def record_ids(records, fields):
+    """
+    Stable, unambiguous IDs for records from their identifying metadata
+
+    The ID is a hash of the metadata values, so names containing the joining
+    character cannot collide (``employee.role_id`` vs ``employee_role.id``) and
+    a record keeps its ID whatever the order of the other records. Records with
+    identical values (a table defined twice in a schema) are numbered in order.
+
+    Args:
+        records: List of dicts with content and metadata
+        fields: Metadata keys that identify a record; a missing key counts as 1
+
+    Returns:
+        list: One ID per record, in record order
+    """
+    ids = []
+    occurrences = {}
+    for record in records:
+        key = tuple(record["metadata"].get(field, 1) for field in fields)
+        occurrences[key] = occurrences.get(key, 0) + 1
+        digest = hashlib.sha256(json.dumps([*key, occurrences[key]]).encode("utf-8")).hexdigest()
+        ids.append(digest[:32])
+    return ids
+
+
+def _sync_collection(chroma_client, collection, records, ids, incremental):
+    """
+    Bring one collection in line with a list of records
+
+    Each record's content hash is compared with the one stored in its
+    metadata: unchanged records are skipped, new or changed records are
+    embedded and upserted, and records of the same schemas that are no longer
+    present are deleted. Without ``incremental`` every record is re-embedded.
+
+    Returns:
+        dict: Numbers of added, updated, deleted and skipped records
+    """
+    # Make sure every record carries a content fingerprint
+    for record in records:
+        if "content_hash" not in record["metadata"]:
+            record["metadata"]["content_hash"] = content_fingerprint(record["content"])
+
+    # Get all unique schema names in the records
+    unique_schemas = set(record['metadata']['schema'] for record in records)
 
-def store_schemas(schema_chunks, config):
+    # Collect the fingerprints of the records already stored for each schema
+    existing_hashes = {}
+    for schema_name in unique_schemas:
+        try:
+            existing = collection.get(where={"schema": schema_name}, include=["metadatas"])
+            for record_id, metadata in zip(existing["ids"], existing["metadatas"]):
+                existing_hashes[record_id] = (metadata or {}).get("content_hash")
+        except Exception as e:
+            print(f"Warning when trying to read schema {schema_name}: {e}")
+
+    new_ids = set(ids)
+    removed_ids = [record_id for record_id in existing_hashes if record_id not in new_ids]
+
+    # A full refresh drops everything and re-embeds every record
+    stale_ids = removed_ids if incremental else list(existing_hashes)
+
+    upsert_ids, upsert_documents, upsert_metadatas = [], [], []
+    added = updated = skipped = 0
+
+    for record_id, record in zip(ids, records):
+        if incremental and record_id in existing_hashes:
+            if existing_hashes[record_id] == record["metadata"]["content_hash"]:
+                skipped += 1
+                continue
+            updated += 1
+        else:
+            added += 1
+
+        upsert_ids.append(record_id)
+        upsert_documents.append(record["content"])
+        upsert_metadatas.append(record["metadata"])
+
+    # ChromaDB rejects writes larger than its maximum batch size
+    max_batch_size = chroma_client.get_max_batch_size()
+
+    # Delete records that no longer exist
+    if stale_ids:
+        print(f"Deleting {len(stale_ids)} stale records from {collection.name}")
+        with span("chroma_delete"):
+            for start in range(0, len(stale_ids), max_batch_size):
+                collection.delete(ids=stale_ids[start:start + max_batch_size])
+
+    # Only new or changed records are sent to the embedding model
+    # (the upsert span includes embedding, which Chroma runs inside upsert)
+    with span("chroma_upsert"):
+        for start in range(0, len(upsert_ids), max_batch_size):
+            end = start + max_batch_size
+            collection.upsert(
+                documents=upsert_documents[start:end],
+                metadatas=upsert_metadatas[start:end],
+                ids=upsert_ids[start:end]
+            )
+
+    return {"added": added, "updated": updated, "deleted": len(stale_ids), "skipped": skipped}
+
+
+def store_schemas(schema_chunks, config, incremental=None, embedding_function=None, column_records=None):
     """
     Store schema chunks in ChromaDB with embeddings
 
+    In incremental mode (the default) each chunk's content hash is compared
+    with the one stored in its metadata: unchanged chunks are skipped, new or
+    changed chunks are embedded and upserted, and chunks of tables that no
+    longer exist in a schema are deleted.
+
+    When ``column_records`` are given (see utils.chunk_utils.column_records),
+    they are synced the same way into the ``schema_columns`` collection, which
+    backs column-level matching across schemas.
+
     Args:
         schema_chunks: List of dicts with content and metadata
         config: Configuration dictionary
+        incremental: Override for the ``incremental_ingestion`` config flag
+        embedding_function: Embedding function to use instead of the configured model
+        column_records: Per-column records to store alongside the chunks
+
+    Returns:
+        collection: The ChromaDB collection holding the schema chunks
     """
+    if incremental is None:
+        incremental = config.get("incremental_ingestion", True)
+
     # Use PersistentClient instead of Client with Settings
     chroma_client = chromadb.PersistentClient(
         path=config["chromadb_path"]
     )
 
     # Create embedding function with proper interface
-    embedding_function = LangchainEmbeddingFunction(config["embedding_model"])
+    if embedding_function is None:
+        embedding_function = LangchainEmbeddingFunction.from_config(config)
 
     # Create or get collection
     collection = chroma_client.get_or_create_collection(
-        name="schemas",
+        name=SCHEMAS_COLLECTION,
         embedding_function=embedding_function
     )
 
-    # First, delete existing schema records
-    # Get all unique schema names in the chunks
-    unique_schemas = set(chunk['metadata']['schema'] for chunk in schema_chunks)
+    ids = record_ids(schema_chunks, ("schema", "table", "part"))
 
-    # Delete existing records for each schema
-    for schema_name in unique_schemas:
-        try:
-            # Find existing records for this schema
-            existing = collection.get(where={"schema": schema_name})
-            if existing["ids"] and len(existing["ids"]) > 0:
-                print(f"Deleting {len(existing['ids'])} existing chunks for schema: {schema_name}")
-                collection.delete(ids=existing["ids"])
-        except Exception as e:
-            print(f"Warning when trying to delete schema {schema_name}: {e}")
+    stats = _sync_collection(chroma_client, collection, schema_chunks, ids, incremental)
+    count("chunks_added", stats["added"])
+    count("chunks_updated", stats["updated"])
+    count("chunks_deleted", stats["deleted"])
+    count("chunks_skipped", stats["skipped"])
 
-    # Prepare data for ChromaDB
-    documents = [chunk["content"] for chunk in schema_chunks]
-    metadatas = [chunk["metadata"] for chunk in schema_chunks]
+    print(f"✅ Stored {len(schema_chunks)} schema chunks in ChromaDB "
+          f"(added: {stats['added']}, updated: {stats['updated']}, deleted: {stats['deleted']}, "
+          f"skipped: {stats['skipped']}).")
 
-    # Create unique IDs with counter suffix to avoid duplicates
-    ids = []
-    id_counter = {}
+    if column_records is not None:
+        column_collection = chroma_client.get_or_create_collection(
+            name=COLUMNS_COLLECTION,
+            embedding_function=embedding_function
+        )
+        column_ids = record_ids(column_records, ("schema", "table", "column"))
+        column_stats = _sync_collection(chroma_client, column_collection, column_records, column_ids, incremental)
+        count("columns_embedded", column_stats["added"] + column_stats["updated"])
+        print(f"✅ Stored {len(column_records)} column records in ChromaDB "
+              f"(added: {column_stats['added']}, updated: {column_stats['updated']}, "
+              f"deleted: {column_stats['deleted']}, skipped: {column_stats['skipped']}).")
 
-    for chunk in schema_chunks:
-        base_id = f"{chunk['metadata']['schema']}_{chunk['metadata']['table']}"
+    if getattr(embedding_function, "cache", None) is not None:
+        cache_stats = embedding_function.cache.stats()
+        print(f"Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+              f"{cache_stats['entries']} entries")
 
-        # Initialize counter for this base ID if it doesn't exist
-        if base_id not in id_counter:
-            id_counter[base_id] = 0
+    return collection
 
-        # Increment counter for this base ID
-        id_counter[base_id] += 1
 
-        # Create a unique ID with counter
-        unique_id = f"{base_id}_{id_counter[base_id]}"
-        ids.append(unique_id)
+def delete_schemas(schema_names, config):
+    """
+    Remove every chunk and column record of schemas that no longer exist
 
-    # Add documents to collection
-    collection.add(
-        documents=documents,
-        metadatas=metadatas,
-        ids=ids
-    )
+    store_schemas only prunes records of the schemas it is given, so a schema
+    whose last file was removed has to be deleted explicitly.
+
+    Args:
+        schema_names: Names of the schemas to remove
+        config: Configuration dictionary
+
+    Returns:
+        int: Number of records deleted
+    """
+    chroma_client = chromadb.PersistentClient(path=config["chromadb_path"])
+    existing = {collection if isinstance(collection, str) else collection.name
+                for collection in chroma_client.list_collections()}
 
-    print(f"✅ Stored {len(schema_chunks)} schema chunks in ChromaDB.")
-    return collection
\ No newline at end of file
+    deleted = 0
+    for name in (SCHEMAS_COLLECTION, COLUMNS_COLLECTION):
+        if name not in existing:
+            continue
+        collection = chroma_client.get_collection(name)
+        for schema_name in schema_names:
+            ids = collection.get(where={"schema": schema_name}, include=[])["ids"]
+            if ids:
+                collection.delete(ids=ids)
+                deleted += len(ids)
+    count("chunks_deleted", deleted)
+    print(f"🗑️ Deleted {deleted} records of schemas {', '.join(sorted(schema_names))} from ChromaDB")
+    return deleted
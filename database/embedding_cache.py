@@ -0,0 +1,139 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+
+
+def normalize_ddl(text):
+    """Collapse whitespace so formatting-only differences share a cache entry"""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """
+    Persistent SQLite cache of embeddings keyed by model name and DDL hash
+
+    Entries are evicted least-recently-used first once the cache holds more
+    than ``max_entries`` vectors. Hit and miss counters are kept per instance.
+    """
+
+    def __init__(self, path, max_entries=100000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, model TEXT NOT NULL, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Create the cache described by config.yaml
+
+        Args:
+            config: Configuration dictionary
+
+        Returns:
+            EmbeddingCache or None when ``embedding_cache_enabled`` is false
+        """
+        if not config.get("embedding_cache_enabled", True):
+            return None
+        path = config.get("embedding_cache_path") or os.path.join(config["chromadb_path"], "embedding_cache.sqlite3")
+        return cls(path, max_entries=config.get("embedding_cache_max_entries", 100000))
+
+    @staticmethod
+    def make_key(model_name, text):
+        """Build the cache key for a text embedded with the given model"""
+        return hashlib.sha256(f"{model_name}\0{normalize_ddl(text)}".encode("utf-8")).hexdigest()
+
+    def get_many(self, model_name, texts):
+        """
+        Look up cached embeddings
+
+        Args:
+            model_name: Name of the embedding model
+            texts: List of texts
+
+        Returns:
+            list: One embedding (list of floats) or None per input text
+        """
+        keys = [self.make_key(model_name, text) for text in texts]
+        found = {}
+
+        with self._lock:
+            unique_keys = list(set(keys))
+            # Stay well below SQLite's bound-parameter limit
+            for i in range(0, len(unique_keys), 500):
+                batch = unique_keys[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = array("d", blob).tolist()
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+
+            results = [found.get(key) for key in keys]
+            hits = sum(1 for result in results if result is not None)
+            # The cache is shared by the threads of the validation service
+            self.hits += hits
+            self.misses += len(results) - hits
+        return results
+
+    def put_many(self, model_name, texts, embeddings):
+        """
+        Store embeddings and evict the least recently used entries over the size cap
+
+        Args:
+            model_name: Name of the embedding model
+            texts: List of texts
+            embeddings: List of embeddings, one per text
+        """
+        now = time.time()
+        rows = [
+            (self.make_key(model_name, text), model_name, array("d", embedding).tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+                    (count - self.max_entries,)
+                )
+            self._conn.commit()
+
+    def stats(self):
+        """Return hit/miss counters and the number of stored entries"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            return {"hits": self.hits, "misses": self.misses, "entries": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,208 +1,554 @@
 import json
 import yaml
 import os
-import great_expectations as ge
-from parsers.docx_schema_parser import extract_sql_schemas, schemas_to_dataframe
-from utils.chunk_utils import chunk_tables
-from database.chroma_store import store_schemas
-from validators.schema_comparator import compare_schemas
-from langchain_ollama import OllamaLLM
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-
-
-def main():
-    # Load configuration
-    with open("config.yaml", "r") as f:
-        config = yaml.safe_load(f)
-
-    # Initialize Great Expectations context
+from parsers.docx_schema_parser import list_schema_files, parse_schema_files
+from parsers.dedup import DEFAULT_FORMAT_PRIORITY, dedupe_tables, report_conflicts, select_schema_files
+from parsers.schema_ir import build_schema_ir
+from validators.schema_comparator import COMPARATOR_VERSION, compare_schemas
+from validators.multi_schema_comparator import compare_many
+from utils.html_report import generate_html_report
+from utils.report_io import open_report, report_file_path, write_report
+from utils.metrics import count, metrics_run, span
+from utils.result_store import ResultStore, result_key
+
+# Heavy dependencies (great_expectations, langchain, chromadb, pandas, docx) are
+# imported inside the steps that need them, so a plain comparison starts fast.
+
+HTML_REPORT_PATH = "validation_reports/validation_report.html"
+SUMMARY_PATH = "validation_reports/validation_reports_summary.txt"
+GE_VALIDATION_PATH = "validation_reports/ge_validation.json"
+MULTI_REPORT_PATH = "validation_reports/multi_schema_report.json"
+
+
+def load_config(config_path="config.yaml"):
+    """Load the YAML configuration"""
+    with open(config_path, "r") as f:
+        return yaml.safe_load(f)
+
+
+def load_ge_context(config):
+    """
+    Initialize the Great Expectations context
+
+    Returns:
+        The data context, or None when it cannot be loaded
+    """
     try:
+        import great_expectations as ge
+
         context = ge.data_context.DataContext(config.get("ge_dir", "./great_expectations"))
         print("✅ Great Expectations context loaded")
-        use_ge = True
+        return context
     except Exception as e:
         print(f"⚠️ Could not load Great Expectations context: {e}")
         print("Continuing without Great Expectations...")
-        use_ge = False
+        return None
 
-    # Step 1: Load and parse schemas from docx files
-    data_dir = config["data_directory"]
-   # files = [f for f in os.listdir(data_dir) if f.endswith(".docx")]
-    # In both instances of main() function where you have this line:
-    files = [f for f in os.listdir(data_dir) if f.endswith((".docx", ".txt", ".sql"))]
 
-    all_schemas = []
-    dataframes = {}
+def load_schemas(config):
+    """
+    Load and parse schemas from all schema files (parsed once, shared by every later step)
 
-    for file in files:
-        file_path = os.path.join(data_dir, file)
-        print(f"📄 Parsing file: {file_path}")
-        schemas = extract_sql_schemas(file_path)
-        all_schemas.extend(schemas)
+    Args:
+        config: Configuration dictionary
+
+    Returns:
+        tuple: (all parsed tables, dict of file schema name -> tables of the files with that name)
+    """
+    files = list_data_files(config)
+
+    print(f"📄 Parsing {len(files)} files with {config.get('parse_workers', 1)} workers")
+    parsed_files = parse_schema_files(files, max_workers=config.get("parse_workers", 1))
+    return collect_schemas(config, parsed_files)
+
+
+def list_data_files(config):
+    """
+    Schema files of the data directory that should be parsed
 
-        # Create dataframe for this schema
+    When format conflicts are not checked, only the highest-priority copy of
+    every schema is listed, so lower-priority copies are not even parsed.
+    """
+    files = list_schema_files(config["data_directory"])
+    if not config.get("format_conflict_check", True):
+        files = select_schema_files(files, config.get("source_format_priority", DEFAULT_FORMAT_PRIORITY))
+    return files
+
+
+def collect_schemas(config, parsed_files, verbose=True):
+    """
+    Deduplicate parsed files across formats and group their tables by schema
+
+    A schema is a file stem: hr.sql, hr.txt and hr.docx make up schema hr,
+    whatever qualifier the DDL uses (dev.sql and prod.sql defining public.users
+    are two schemas). Every table's ``schema_name`` is set to its schema, so
+    the comparison, the vector store, watch mode and the service all use the
+    same grouping.
+
+    Args:
+        config: Configuration dictionary
+        parsed_files: Output of parse_schema_files
+        verbose: Print a line per parsed file
+
+    Returns:
+        tuple: (all parsed tables, dict of file schema name -> tables of the files with that name)
+    """
+    # The same schema may exist as .sql, .txt and .docx; each table is kept once
+    format_priority = config.get("source_format_priority", DEFAULT_FORMAT_PRIORITY)
+    parsed_files, conflicts = dedupe_tables(parsed_files, format_priority)
+    if config.get("format_conflict_check", True):
+        report_conflicts(conflicts)
+        count("format_conflicts", len(conflicts))
+
+    all_schemas = []
+    schemas_by_file = {}
+
+    for parsed in parsed_files:
+        file_path = parsed["file_path"]
+        if parsed["error"]:
+            print(f"⚠️ Failed to parse {file_path}: {parsed['error']}")
+            count("parse_errors")
+            continue
+        if verbose:
+            skipped = f", {parsed['duplicates']} duplicates skipped" if parsed["duplicates"] else ""
+            print(f"📄 Parsed file: {file_path} ({len(parsed['schemas'])} tables{skipped})")
+        count("files_parsed")
+        count("duplicate_tables", parsed["duplicates"])
         schema_name = os.path.basename(file_path).split('.')[0]
-        df = schemas_to_dataframe(schemas)
-        dataframes[schema_name] = df
+        schemas = [schema if schema["schema_name"] == schema_name else dict(schema, schema_name=schema_name)
+                   for schema in parsed["schemas"]]
+        all_schemas.extend(schemas)
+        schemas_by_file.setdefault(schema_name, []).extend(schemas)
+
+    if verbose:
+        print(f"🧠 Total schemas extracted: {len(all_schemas)}")
+    count("tables", len(all_schemas))
+    return all_schemas, schemas_by_file
+
 
-    print(f"🧠 Total schemas extracted: {len(all_schemas)}")
+def resolve_schema_names(config, schemas_by_file):
+    """
+    Schemas to compare: from config, or the first two parsed files as a fallback
 
-    # Load schema names from config
+    Returns:
+        list: Schema names, or None when fewer than two are available
+    """
     schema_names = config.get("schemas", [])
 
-    if len(schema_names) != 2:
+    if len(schema_names) < 2:
         print(f"⚠️ Missing one or both of the required schemas in config.yaml")
-        available_schemas = list(dataframes.keys())
+        available_schemas = list(schemas_by_file.keys())
         if len(available_schemas) >= 2:
             print(f"Using available schemas instead: {available_schemas[0]}, {available_schemas[1]}")
             schema_names = available_schemas[:2]
         else:
             print(f"⚠️ Need at least two schema files to generate comparison report")
-            return
+            return None
+    return schema_names
+
 
-    schema1, schema2 = schema_names
+def run_ge_validation(context, schemas_by_file):
+    """
+    Validate the parsed tables of every schema in one Great Expectations run
 
-    # Step 2: Generate and count chunks
-    chunks = chunk_tables(all_schemas)
+    Args:
+        context: Great Expectations context
+        schemas_by_file: Dict of file schema name -> parsed tables
 
-    # Step 3: Convert schemas to vector representations and store
+    Returns:
+        dict: Validation results with per-schema results, or None on error
+    """
     try:
-        collection = store_schemas(chunks, config)
-        print("✅ Schemas stored in vector database")
+        from parsers.docx_schema_parser import schemas_to_dataframe
+        from validators.ge_validator import validate_all_schemas
+
+        dataframes = {name: schemas_to_dataframe(schemas) for name, schemas in schemas_by_file.items()}
+        with span("ge_validation"):
+            results = validate_all_schemas(dataframes, context)
     except Exception as e:
-        print(f"⚠️ Error storing schemas: {e}")
-        return
+        print(f"⚠️ Error running Great Expectations validation: {e}")
+        return None
+
+    with open(GE_VALIDATION_PATH, "w") as f:
+        json.dump(results, f, indent=2)
+
+    suite_state = "reused" if results["suite_reused"] else "created"
+    print(f"✅ Great Expectations validation of {len(dataframes)} schemas saved to {GE_VALIDATION_PATH} "
+          f"(suite {suite_state})")
+    for name, schema_result in results["schemas"].items():
+        if not schema_result["success"]:
+            print(f"  ⚠️ {name}: {schema_result['failed_checks']} "
+                  f"in tables {', '.join(map(str, schema_result['failing_tables']))}")
+    return results
+
+
+def _result_key(config, schema_names, schema_irs, schemas_by_file, use_vector_store, write_html, validate):
+    """Key of the stored result: schema fingerprints, comparator version and every setting that shapes the outputs"""
+    options = {
+        "schemas": schema_names,
+        "verbose": config.get("verbose_report", False),
+        "html_page_size": config.get("html_page_size") if write_html else None,
+        "diff_export_path": config.get("diff_export_path")
+    }
+    if len(schema_names) > 2:
+        options["fingerprints"] = [schema_irs[name].fingerprint.hex() for name in schema_names]
+    if use_vector_store:
+        options["renames"] = [config.get("rename_detection", True), config.get("rename_min_score", 0.5),
+                               config.get("column_index", True), config.get("embedding_model")]
+    if validate:
+        # Great Expectations validates every schema file, not only the compared pair
+        options["validated"] = {name: build_schema_ir(name, tables).fingerprint.hex()
+                                for name, tables in sorted(schemas_by_file.items())}
+    return result_key(schema_irs[schema_names[0]].fingerprint.hex(), schema_irs[schema_names[1]].fingerprint.hex(),
+                      COMPARATOR_VERSION, options)
+
+
+def restore_results(config, stored):
+    """Rewrite the report and every stored artifact of a stored comparison"""
+    report = stored["report"]
+    report_path = report_file_path(config)
+    with span("write_report"):
+        write_report(report, report_path)
+    for path, content in stored["artifacts"].items():
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+    print(f"✅ Schemas unchanged since the stored comparison: restored {report_path} and "
+          f"{len(stored['artifacts'])} other files (use --force to recompute)")
+    return report
+
+
+def run_comparison(config, use_vector_store=True, write_html=True, ge_context=None, validate=False,
+                   result_store=None, force=False):
+    """
+    Parse, compare and write the comparison report
+
+    When a result store is given and it holds a result for the same schema
+    fingerprints, comparator version and settings, the stored report and
+    artifacts are written back instead of being recomputed.
+
+    Args:
+        config: Configuration dictionary
+        use_vector_store: Store schema embeddings and suggest renames (needs chromadb and Ollama)
+        write_html: Also write the HTML report
+        ge_context: Great Expectations context; when given, every schema is validated in one run
+        validate: Load the Great Expectations context (only when results are recomputed)
+        result_store (ResultStore, optional): Store of earlier results
+        force: Recompute even when a stored result exists
+
+    Returns:
+        dict: The comparison report, or None when nothing could be compared
+    """
+    with span("parse"):
+        all_schemas, schemas_by_file = load_schemas(config)
+
+    schema_names = resolve_schema_names(config, schemas_by_file)
+    if schema_names is None:
+        return None
+
+    # The first two schemas get the detailed source/destination report
+    schema1, schema2 = schema_names[:2]
+
+    # Build the table IR of each schema once from the already parsed tables
+    with span("build_ir"):
+        schema_irs = {name: build_schema_ir(name, schemas_by_file.get(name, [])) for name in schema_names}
+
+    key = None
+    if result_store is not None:
+        key = _result_key(config, schema_names, schema_irs, schemas_by_file, use_vector_store, write_html,
+                          validate or ge_context is not None)
+        stored = None if force else result_store.get(key)
+        if stored is not None:
+            count("result_store_hits")
+            report = restore_results(config, stored)
+            report["meta"]["result_key"] = key
+            return report
+        count("result_store_misses")
+
+    # Files written besides the report, kept in the result store
+    artifacts = []
+    complete = True
+
+    if validate and ge_context is None:
+        ge_context = load_ge_context(config)
+    if ge_context is not None:
+        os.makedirs(os.path.dirname(GE_VALIDATION_PATH), exist_ok=True)
+        if run_ge_validation(ge_context, schemas_by_file) is not None:
+            artifacts.append(GE_VALIDATION_PATH)
+        else:
+            complete = False
+    elif validate:
+        complete = False
 
-    # Generate validation report
-    if len(schema_names) >= 2:
-        print(f"Comparing schemas: {schema1} (source) and {schema2} (destination)")
+    if use_vector_store:
+        from utils.chunk_utils import chunk_tables, column_records
+        from database.chroma_store import store_schemas
 
-        df1 = dataframes[schema1]
-        df2 = dataframes[schema2]
+        # Step 2: Generate and count chunks
+        with span("chunk"):
+            chunks = chunk_tables(all_schemas, config.get("chunk_size"), config.get("chunk_overlap", 0))
+            columns = column_records(all_schemas) if config.get("column_index", True) else None
+        count("chunks", len(chunks))
 
-        # Extract DDL strings for comparison
-        schema1_full = "\n".join([schema["ddl"] for schema in all_schemas if schema["schema_name"] == schema1])
-        schema2_full = "\n".join([schema["ddl"] for schema in all_schemas if schema["schema_name"] == schema2])
+        # Step 3: Convert schemas to vector representations and store
+        try:
+            with span("store"):
+                store_schemas(chunks, config, column_records=columns)
+            print("✅ Schemas stored in vector database")
+        except Exception as e:
+            print(f"⚠️ Error storing schemas: {e}")
+            return None
 
-        # Step 5: Generate detailed comparison report
+    print(f"Comparing schemas: {schema1} (source) and {schema2} (destination)")
+
+    # Step 4: With more than two schemas, compare all of them in one N-way pass
+    if len(schema_names) > 2:
+        with span("compare_many"):
+            multi_report = compare_many(
+                [schema_irs[name] for name in schema_names],
+                verbose=config.get("verbose_report", False)
+            )
+        multi_report_path = MULTI_REPORT_PATH
+        artifacts.append(multi_report_path)
+        os.makedirs(os.path.dirname(multi_report_path), exist_ok=True)
+        with open(multi_report_path, "w") as f:
+            json.dump(multi_report, f, indent=2)
+
+        print(f"✅ N-way comparison of {len(schema_names)} schemas saved to {multi_report_path}")
+        for pair in multi_report["pairwise"]:
+            print(f"  {pair['source_schema']} vs {pair['destination_schema']}: "
+                  f"{pair['identical_tables']} identical, {pair['different_tables']} different, "
+                  f"{pair['only_in_source']} only in {pair['source_schema']}, "
+                  f"{pair['only_in_destination']} only in {pair['destination_schema']}")
+
+    # Step 5: Generate detailed comparison report
+    with span("compare"):
         comparison_report = compare_schemas(
-            schema1_full,
-            schema2_full,
+            schema_irs[schema1],
+            schema_irs[schema2],
             schema1_name=schema1,
-            schema2_name=schema2
+            schema2_name=schema2,
+            verbose=config.get("verbose_report", False)
         )
 
-        # Generate a final report in JSON format
-        report_path = f"validation_reports/validation_reports.json"
-        os.makedirs(os.path.dirname(report_path), exist_ok=True)
-        with open(report_path, "w") as f:
-            json.dump(comparison_report, f, indent=2)
+    # Step 6: Suggest renames for the tables and columns left unmatched
+    if use_vector_store and config.get("rename_detection", True):
+        try:
+            from validators.rename_detector import detect_renames
+            from database.chroma_store import COLUMNS_COLLECTION
+            from utils.schema_retriever import get_retriever
+
+            with span("rename_detection"):
+                column_retriever = None
+                if config.get("column_index", True):
+                    column_retriever = get_retriever(config, COLUMNS_COLLECTION)
+                rename_suggestions = detect_renames(
+                    schema_irs[schema1],
+                    schema_irs[schema2],
+                    retriever=get_retriever(config),
+                    min_score=config.get("rename_min_score", 0.5),
+                    column_retriever=column_retriever
+                )
+            comparison_report["meta"]["rename_suggestions"] = rename_suggestions
+            print(f"🔎 Rename suggestions: {len(rename_suggestions['tables'])} tables, "
+                  f"{len(rename_suggestions['columns'])} columns")
+        except Exception as e:
+            print(f"⚠️ Error detecting renames: {e}")
+            complete = False
+
+    # Generate a final report in JSON (or JSON Lines) format
+    report_path = report_file_path(config)
+    with span("write_report"):
+        write_report(comparison_report, report_path)
 
-        print(f"✅ Comparison report saved to {report_path}")
+    print(f"✅ Comparison report saved to {report_path}")
 
-        # Generate HTML report
-        generate_html_report(comparison_report, f"validation_reports/validation_report.html")
-        print(f"✅ HTML report saved to validation_reports/validation_report.html")
+    # Export the typed diff records (.csv, or .parquet with pyarrow installed)
+    diff_export_path = config.get("diff_export_path")
+    if diff_export_path:
+        from validators.diff_records import export_diffs
 
-        # Use LLM to generate a natural language summary
         try:
-            llm = OllamaLLM(model="llama3")
-            prompt = PromptTemplate(
-                template="""
-                You are a database expert. Analyze this schema comparison report and provide a concise summary:
-
-                {report}
-
-                Provide a clear summary of:
-                1. Major differences between the schemas
-                2. Key similarities
-                3. Potential issues or inconsistencies
-                4. Recommendations for schema alignment
-                """,
-                input_variables=["report"]
+            with span("export_diffs"):
+                records = export_diffs(comparison_report["results"], diff_export_path,
+                                       include_matches=config.get("verbose_report", False))
+            artifacts.append(diff_export_path)
+            print(f"✅ {len(records)} diff records exported to {diff_export_path}")
+        except Exception as e:
+            print(f"⚠️ Error exporting diff records: {e}")
+            complete = False
+
+    # Generate HTML report
+    if write_html:
+        with span("html"):
+            artifacts += generate_html_report(
+                comparison_report,
+                HTML_REPORT_PATH,
+                page_size=config.get("html_page_size")
             )
+        print(f"✅ HTML report saved to {HTML_REPORT_PATH}")
+
+    # Results with a failed step are not stored, so the next run tries again
+    if key is not None:
+        if complete:
+            contents = {}
+            for path in artifacts:
+                with open(path, "rb") as f:
+                    contents[path] = f.read()
+            result_store.put(key, comparison_report, contents, COMPARATOR_VERSION)
+        comparison_report["meta"]["result_key"] = key
+
+    return comparison_report
+
+
+def summarize_report(config, comparison_report, result_store=None):
+    """
+    Use LLM to generate a natural language summary of the comparison report
+
+    With a result store, a summary stored for the same result and the same
+    model, prompts and token budget is written back without loading the LLM,
+    and a new summary is stored with the result.
+    """
+    from utils.llm_summarizer import summary_version
+
+    model_name = config.get("summary_model", "llama3")
+    token_budget = config.get("summary_token_budget", 3000)
+    version = summary_version(model_name, token_budget)
+    key = comparison_report["meta"].get("result_key")
+    if result_store is not None and key is not None:
+        summary = result_store.get_summary(key, version)
+        if summary is not None:
+            with open(SUMMARY_PATH, "w") as f:
+                f.write(summary)
+            print(f"✅ Stored summary restored to {SUMMARY_PATH}")
+            return
 
-            chain = LLMChain(llm=llm, prompt=prompt)
-            result = chain.run(report=json.dumps(comparison_report, indent=2))
+    try:
+        from langchain_ollama import OllamaLLM
+        from utils.llm_summarizer import MapReduceSummarizer
+
+        summarizer = MapReduceSummarizer(
+            OllamaLLM(model=model_name),
+            token_budget=token_budget,
+            max_workers=config.get("summary_concurrency", 4),
+            cache_path=config.get("summary_cache_path", "validation_reports/summary_cache.sqlite3"),
+            model_name=model_name
+        )
+        with span("summary"):
+            result = summarizer.summarize(comparison_report)
 
-            # Save the summary
-            summary_path = f"validation_reports/validation_reports_summary.txt"
-            with open(summary_path, "w") as f:
-                f.write(result)
+        # Save the summary
+        with open(SUMMARY_PATH, "w") as f:
+            f.write(result)
+        if result_store is not None and key is not None:
+            result_store.set_summary(key, result, version)
 
-            print(f"✅ Summary report saved to {summary_path}")
-        except Exception as e:
-            print(f"⚠️ Error generating summary: {e}")
+        print(f"✅ Summary report saved to {SUMMARY_PATH}")
+    except Exception as e:
+        print(f"⚠️ Error generating summary: {e}")
 
-    else:
-        print(f"⚠️ Need at least two schema files to generate comparison report")
 
-    # ---- Q&A with Schema Information ----
-    # Load the actual comparison report
-    report_path = "validation_reports/validation_reports.json"
+QA_PROMPT = """You are a database expert with access to the following FACTS about two database schemas:
 
-    if not os.path.exists(report_path):
-        print(f"Error: Report file not found: {report_path}")
-        exit(1)
+FACTS:
+{facts}
 
-    with open(report_path, "r") as f:
-        actual_report = json.load(f)
+Do not add any information beyond what is stated in the FACTS. If you don't know something based on the FACTS, say "I don't have that information."
 
-    # Extract key information to provide as facts to the LLM
-    source_schema = actual_report["meta"]["source_schema"]
-    destination_schema = actual_report["meta"]["destination_schema"]
+User question: {question}
 
-    # Extract detailed table mapping information
-    schema1_tables = []
-    schema2_tables = []
-    table_mappings = []
+Answer:"""
 
-    for result in actual_report["results"]:
-        table_name = result["kwargs"]["table"]
-        status = result.get("meta", {}).get("status", "")
 
-        if isinstance(status, str):
-            if f"missing in {destination_schema}" in status:
-                schema1_tables.append(table_name)
-            elif f"missing in {source_schema}" in status:
-                schema2_tables.append(table_name)
-            else:
-                schema1_tables.append(table_name)
-                schema2_tables.append(table_name)
-
-                # For common tables, extract column differences
-                if "column_results" in result.get("meta", {}):
-                    column_differences = []
-                    for col_result in result["meta"]["column_results"]:
-                        if "missing" in col_result:
-                            column_differences.append(col_result)
-
-                    # Only add mapping for tables with differences
-                    if column_differences:
-                        table_mappings.append({
-                            "table": table_name,
-                            "differences": column_differences
-                        })
-
-    # Handle questions for Q&A
-    llm = OllamaLLM(model="llama3", temperature=0.1)  # Lower temperature for more factual responses
-    prompt = PromptTemplate(
-        template="""You are a database expert with access to the following FACTS about two database schemas:
+def build_answerer(config, report, embedding_function=None):
+    """
+    Prepare Q&A over a comparison report
 
-FACTS:
-{facts}
+    The report's facts are indexed once; each question then retrieves the
+    most relevant facts and asks the LLM. Repeated questions on an unchanged
+    report, asked with the same model, prompt and qa_top_k, are answered from
+    the answer cache.
 
-Do not add any information beyond what is stated in the FACTS. If you don't know something based on the FACTS, say "I don't have that information."
+    Args:
+        config: Configuration dictionary
+        report: Comparison report (results may be a lazy iterator)
+        embedding_function: Embedding function for vector fact lookup, instead
+            of creating one from config
 
-User question: {question}
+    Returns:
+        function: Takes a question and returns the answer text
+    """
+    from langchain_ollama import OllamaLLM
+    from langchain.prompts import PromptTemplate
+    from langchain.chains import LLMChain
+    from utils.llm_summarizer import count_llm_tokens
+    from utils.qa_facts import AnswerCache, FactIndex, answer_version, build_facts, report_fingerprint
 
-Answer:""",
-        input_variables=["facts", "question"]
-    )
+    # Build the fact index once from the streamed report records
+    with span("qa_index"):
+        facts = build_facts(report["meta"], report["results"])
+        try:
+            if config.get("qa_vector_search", True):
+                if embedding_function is None:
+                    from database.chroma_store import LangchainEmbeddingFunction
 
+                    embedding_function = LangchainEmbeddingFunction.from_config(config)
+                fact_index = FactIndex(facts, embedding_function=embedding_function)
+            else:
+                fact_index = FactIndex(facts)
+        except Exception as e:
+            print(f"⚠️ Vector lookup unavailable for Q&A, using keyword lookup only: {e}")
+            fact_index = FactIndex(facts)
+    count("qa_facts", len(facts))
+
+    model_name = config.get("qa_model", "llama3")
+    top_k = config.get("qa_top_k", 20)
+    fingerprint = report_fingerprint(report["meta"])
+    answer_cache = AnswerCache(config.get("qa_cache_path", "validation_reports/qa_cache.sqlite3"),
+                               version=answer_version(model_name, QA_PROMPT, top_k))
+    print(f"🧠 Indexed {len(facts)} facts for Q&A")
+
+    llm = OllamaLLM(model=model_name, temperature=0.1)  # Lower temperature for more factual responses
+    prompt = PromptTemplate(template=QA_PROMPT, input_variables=["facts", "question"])
     chain = LLMChain(llm=llm, prompt=prompt)
 
+    def answer(question):
+        # Repeated questions on an unchanged report are answered from the cache
+        count("qa_questions")
+        result = answer_cache.get(question, fingerprint)
+        if result is None:
+            with span("qa_answer"):
+                relevant_facts = fact_index.search(question, top_k=top_k)
+                facts_text = "\n".join(f"- {fact}" for fact in relevant_facts)
+                result = chain.run(facts=facts_text, question=question)
+            count_llm_tokens(prompt.template + facts_text + question, result)
+            answer_cache.set(question, fingerprint, result)
+        else:
+            count("qa_cache_hits")
+        return result
+
+    return answer
+
+
+def ask_questions(config):
+    """Interactive Q&A about the saved comparison report"""
+    # Load the actual comparison report lazily, one table result at a time
+    report_path = report_file_path(config)
+
+    if not os.path.exists(report_path):
+        print(f"Error: Report file not found: {report_path}")
+        exit(1)
+
+    actual_report = open_report(report_path)
+
+    # Extract key information to provide as facts to the LLM
+    source_schema = actual_report["meta"]["source_schema"]
+    destination_schema = actual_report["meta"]["destination_schema"]
+
+    answer = build_answerer(config, actual_report)
+
     # Interactive Q&A loop
     print("Database Schema Expert Ready! Ask questions about the compared schemas, or type 'exit' to quit.")
     print(f"Available schemas: {source_schema} database, {destination_schema} database")
@@ -212,204 +558,44 @@ Answer:""",
         if question.lower() in ["exit", "quit"]:
             break
 
-        # Check for schema-specific queries and extract the relevant tables accordingly
-        if schema2.lower() in question.lower():
-            result = chain.run(facts=json.dumps({"tables": schema2_tables}, indent=2), question=question)
-        elif schema1.lower() in question.lower():
-            result = chain.run(facts=json.dumps({"tables": schema1_tables}, indent=2), question=question)
-        else:
-            result = chain.run(
-                facts=json.dumps({"tables": {source_schema: schema1_tables, destination_schema: schema2_tables}},
-                                 indent=2),
-                question=question
-            )
+        print("\nAnswer:", answer(question))
 
-        print("\nAnswer:", result)
-
-
-def generate_html_report(report_data, output_path):
-    """Generate an HTML report based on the JSON comparison report."""
-    # Extract metadata
-    meta_data = report_data["meta"]
-    source_schema = meta_data["source_schema"]
-    destination_schema = meta_data["destination_schema"]
-    timestamp = meta_data["timestamp"]
-    ge_version = meta_data["great_expectations_version"]
-
-    # Start building HTML content
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-  <meta charset="UTF-8">
-  <title>Schema Validation Report</title>
-  <style>
-    body {{
-      font-family: Arial, sans-serif;
-      background-color: #fafafa;
-      padding: 20px;
-    }}
-    h1 {{
-      font-size: 24px;
-    }}
-    .meta-info {{
-      background-color: #f0f0f0;
-      padding: 15px;
-      border-radius: 5px;
-      margin-bottom: 20px;
-    }}
-    .meta-row {{
-      margin-bottom: 5px;
-    }}
-    .meta-label {{
-      font-weight: bold;
-    }}
-    table {{
-      width: 100%;
-      border-collapse: collapse;
-      margin-top: 20px;
-    }}
-    th {{
-      background-color: #333;
-      color: white;
-      padding: 10px;
-      text-align: left;
-    }}
-    td {{
-      padding: 10px;
-      vertical-align: top;
-      background-color: #fff;
-    }}
-    .table-row td {{
-      background-color: #fff7db;
-    }}
-    .failed td {{
-      background-color: #f8d7da;
-    }}
-    .success-details {{
-      color: green;
-    }}
-    .error-details {{
-      color: red;
-    }}
-    .details-title {{
-      font-weight: bold;
-      margin-top: 8px;
-    }}
-    .status-success {{
-      color: green;
-    }}
-    .status-failed {{
-      color: red;
-    }}
-    .statistics {{
-      margin: 20px 0;
-      padding: 10px;
-      background-color: #e9f7ef;
-      border-radius: 5px;
-    }}
-  </style>
-</head>
-<body>
-
-  <h1>Schema Validation Report</h1>
-
-  <div class="meta-info">
-    <div class="meta-row"><span class="meta-label">Great Expectations Version:</span> {ge_version}</div>
-    <div class="meta-row"><span class="meta-label">Source Schema:</span> {source_schema}</div>
-    <div class="meta-row"><span class="meta-label">Destination Schema:</span> {destination_schema}</div>
-    <div class="meta-row"><span class="meta-label">Timestamp:</span> {timestamp}</div>
-  </div>
-
-  <table border="1">
-    <thead>
-      <tr>
-        <th>Table</th>
-        <th>Status</th>
-        <th>Details</th>
-      </tr>
-    </thead>
-    <tbody>
-"""
-
-    # Process each result
-    for result in report_data["results"]:
-        table_name = result["kwargs"]["table"]
-        meta = result.get("meta", {})
-        status = meta.get("status", "")
-        success = result.get("success", False)
-
-        # Determine the status display
-        status_class = "status-success" if success else "status-failed"
-        status_text = "✅ Success" if success else "❌ Failed"
-
-        # Get column results if they exist
-        column_results = meta.get("column_results", [])
-
-        # Check if we have success and error details to split
-        success_details = []
-        error_details = []
-
-        for col_result in column_results:
-            if col_result.startswith("✅"):
-                success_details.append(col_result)
-            elif col_result.startswith("❌"):
-                error_details.append(col_result)
-
-        # If we have both success and error details
-        if success_details and error_details:
-            html_content += f"""
-      <tr class="table-row">
-        <td rowspan="2">{table_name}</td>
-        <td rowspan="2" class="{status_class}">{status_text}</td>
-        <td class="success-details">
-          <div class="details-title">✅ Success:</div>
-          {'<br>'.join(success_details)}
-        </td>
-      </tr>
-      <tr class="failed">
-        <td class="error-details">
-          <div class="details-title">❌ Missing:</div>
-          {'<br>'.join(error_details)}
-        </td>
-      </tr>
-"""
-        # If we only have success details
-        elif success_details:
-            html_content += f"""
-      <tr class="table-row">
-        <td>{table_name}</td>
-        <td class="{status_class}">{status_text}</td>
-        <td class="success-details">
-          <div class="details-title">✅ Success:</div>
-          {'<br>'.join(success_details)}
-        </td>
-      </tr>
-"""
-        # If we have no details or only error details (table missing case)
-        else:
-            html_content += f"""
-      <tr class="failed">
-        <td>{table_name}</td>
-        <td class="{status_class}">{status_text}</td>
-        <td class="error-details">❌ Table missing</td>
-      </tr>
-"""
 
-    # Close HTML
-    html_content += """
-    </tbody>
-  </table>
+def generate_report(config, force=False):
+    """
+    Full report: vector storage, comparison, HTML and LLM summary
+
+    Unchanged schemas are answered from the result store (see run_comparison)
+    unless ``force`` is set.
+
+    Returns:
+        dict: The comparison report, or None when nothing could be compared
+    """
+    result_store = ResultStore.from_config(config)
+
+    comparison_report = run_comparison(config, validate=True, result_store=result_store, force=force)
+    if comparison_report is not None:
+        summarize_report(config, comparison_report, result_store=result_store)
+    return comparison_report
+
 
-</body>
-</html>"""
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare the configured schemas and write every report")
+    parser.add_argument("--force", action="store_true", help="Recompute even when a stored result exists")
+    args = parser.parse_args()
 
-    # Create directory if it doesn't exist
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    config = load_config()
 
-    # Write the HTML file
-    with open(output_path, "w") as f:
-        f.write(html_content)
+    with metrics_run(config, "report"):
+        if generate_report(config, force=args.force) is None:
+            return
+
+    # ---- Q&A with Schema Information ----
+    with metrics_run(config, "ask"):
+        ask_questions(config)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,30 +1,31 @@
-from parsers.docx_schema_parser import extract_sql_schemas
-from database.chroma_store import store_schemas
-from utils.chunk_utils import chunk_tables
-import os
+from generate_report import load_schemas
+from utils.chunk_utils import chunk_tables, column_records
+from utils.metrics import count, metrics_run, span
 import yaml
 
-# Load configuration
-with open("config.yaml", "r") as f:
-    config = yaml.safe_load(f)
 
-data_dir = config["data_directory"]
-#files = sorted([f for f in os.listdir(data_dir) if f.endswith(".docx")])
-# Modify this line in load_data.py
-files = sorted([f for f in os.listdir(data_dir) if f.endswith((".docx", ".txt", ".sql"))])
+def main(config_path="config.yaml"):
+    # Load configuration
+    with open(config_path, "r") as f:
+        config = yaml.safe_load(f)
 
-all_schemas = []
+    with metrics_run(config, "ingest"):
+        # Parse every schema file, keeping each logical table once across formats
+        with span("parse"):
+            all_schemas, _ = load_schemas(config)
 
-for file in files:
-    file_path = os.path.join(data_dir, file)
-    print(f"📄 Parsing file: {file_path}")
-    schemas = extract_sql_schemas(file_path)
-    all_schemas.extend(schemas)
+        # Generate and count chunks
+        with span("chunk"):
+            chunks = chunk_tables(all_schemas, config.get("chunk_size"), config.get("chunk_overlap", 0))
+            columns = column_records(all_schemas) if config.get("column_index", True) else None
+        count("chunks", len(chunks))
 
-print(f"🧠 Total schemas extracted: {len(all_schemas)}")
+        # Store schemas in ChromaDB (chromadb and langchain are only imported here)
+        from database.chroma_store import store_schemas
 
-# Generate and count chunks
-chunks = chunk_tables(all_schemas)
+        with span("store"):
+            store_schemas(chunks, config, column_records=columns)
 
-# Store schemas in ChromaDB
-store_schemas(chunks, config)
\ No newline at end of file
+
+if __name__ == "__main__":
+    main()
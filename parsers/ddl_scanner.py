@@ -0,0 +1,191 @@
+import re
+
+# Tokens the scanner reacts to outside of quotes and comments
+_TOKEN = re.compile(
+    r"--|/\*|'|\"|`|\$[A-Za-z_]*\$|\(|\)|;"
+    r"|\bCREATE\s+(?:(?:GLOBAL|LOCAL)\s+)?(?:(?:TEMPORARY|TEMP|UNLOGGED)\s+)?TABLE\b",
+    re.IGNORECASE
+)
+
+# A CREATE keyword at the end of a block that may continue with TABLE in the next one
+_TRAILING_CREATE = re.compile(
+    r"\bCREATE(?:\s+(?:GLOBAL|LOCAL|TEMPORARY|TEMP|UNLOGGED))*\s*$",
+    re.IGNORECASE
+)
+
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+class DDLScanner:
+    """
+    Incremental scanner that extracts CREATE TABLE statements from SQL text
+
+    Text is fed in blocks through ``feed``; the scanner keeps track of
+    parentheses depth, quoted strings and identifiers, dollar-quoted bodies and
+    comments across blocks, so a statement only ends at a ``;`` outside of all
+    of them. Blocks must not split a token, which ``scan_create_tables``
+    guarantees by only cutting at line breaks (or whitespace on very long lines).
+
+    A backslash escapes the next character inside quoted strings and
+    identifiers (MySQL style), so ``'it\\'s'`` is one string; a string that
+    really ends in a backslash (``'C:\\'``) therefore swallows the rest of the
+    statement.
+
+    With ``flattened_comments``, a ``--`` comment on a statement that sits
+    entirely on one line is scanned as code when its text ends in ``);`` and
+    has balanced quotes. Documents whose line breaks were lost (paragraphs of
+    .docx or .txt exports) otherwise hide the end of the table behind the
+    comment, and every later table with it. This only recovers where the
+    statement ends: the columns after the comment cannot be told apart from
+    the comment text, so the table parser still drops them (see
+    schema_ir.has_flattened_comment). Only enable it for such sources: it is
+    a guess, and SQL files never need it.
+    """
+
+    def __init__(self, flattened_comments=False):
+        self.flattened_comments = flattened_comments
+        self._mode = None  # None, a quote character, "--", "/*" or a dollar tag
+        self._depth = 0
+        self._parts = None  # Pieces of the CREATE TABLE statement being collected
+
+    def feed(self, text):
+        """
+        Scan one block of text
+
+        Args:
+            text: Next block of SQL text
+
+        Yields:
+            str: Each CREATE TABLE statement completed within this block
+        """
+        pos = 0
+        start = 0
+        length = len(text)
+
+        while pos < length:
+            mode = self._mode
+
+            if mode is not None:
+                closer = "\n" if mode == "--" else "*/" if mode == "/*" else mode
+                idx = text.find(closer, pos)
+                if mode in ("'", '"'):
+                    while idx > 0 and _escaped(text, idx):
+                        idx = text.find(closer, idx + 1)
+                if idx == -1:
+                    break
+                self._mode = None
+                if mode == "--" and self._flattened(text, start, pos, idx):
+                    # The rest of a flattened statement follows the comment; scan it as code
+                    continue
+                pos = idx + len(closer)
+                continue
+
+            match = _TOKEN.search(text, pos)
+            if match is None:
+                break
+
+            token = match.group()
+            pos = match.end()
+
+            if token == "(":
+                self._depth += 1
+            elif token == ")":
+                self._depth -= 1
+            elif token == ";":
+                if self._parts is not None and self._depth <= 0:
+                    self._parts.append(text[start:pos])
+                    statement = "".join(self._parts).strip()
+                    self._parts = None
+                    self._depth = 0
+                    if statement:
+                        yield statement
+            elif token in ("'", '"', "`", "--", "/*") or token[0] == "$":
+                self._mode = token
+            elif self._parts is None:
+                # Start of a CREATE TABLE statement
+                self._parts = []
+                self._depth = 0
+                start = match.start()
+
+        if self._parts is not None:
+            self._parts.append(text[start:])
+
+    def _flattened(self, text, start, comment_start, end):
+        """Whether a line comment looks like the middle of a statement flattened onto one line"""
+        if not self.flattened_comments or self._parts != []:
+            # Blocks end at line breaks, so a statement carried over from an earlier block spans lines
+            return False
+        comment = text[comment_start:end]
+        return ("\n" not in text[start:comment_start] and comment.rstrip().endswith(");")
+                and comment.count("'") % 2 == 0)
+
+
+def _escaped(text, idx):
+    """Whether the character at ``idx`` is preceded by an odd number of backslashes"""
+    backslashes = 0
+    while idx - backslashes > 0 and text[idx - backslashes - 1] == "\\":
+        backslashes += 1
+    return backslashes % 2 == 1
+
+
+def _split_point(text):
+    """Find the last position where a block can be cut without splitting a token"""
+    # Prefer line breaks so a line comment is always scanned in one piece
+    idx = text.rfind("\n") + 1
+    if idx <= 0:
+        idx = max(text.rfind(" "), text.rfind("\t")) + 1
+    if idx <= 0:
+        return 0
+
+    trailing = _TRAILING_CREATE.search(text, max(0, idx - 128), idx)
+    if trailing:
+        return trailing.start()
+    return idx
+
+
+def scan_create_tables(blocks, flattened_comments=False):
+    """
+    Yield CREATE TABLE statements from an iterable of text blocks
+
+    Blocks can be cut anywhere (fixed-size file reads, paragraphs); the
+    unfinished tail of each block is carried over to the next one.
+
+    Args:
+        blocks: Iterable of text blocks
+        flattened_comments: Text may have lost its line breaks (see DDLScanner)
+
+    Yields:
+        str: One CREATE TABLE statement at a time
+    """
+    scanner = DDLScanner(flattened_comments=flattened_comments)
+    carry = ""
+
+    for block in blocks:
+        text = carry + block if carry else block
+        split = _split_point(text)
+        carry = text[split:]
+        if split:
+            yield from scanner.feed(text[:split])
+
+    if carry:
+        # Terminate a trailing line comment so the last statement can still complete
+        yield from scanner.feed(carry if carry.endswith("\n") else carry + "\n")
+
+
+def iter_file_blocks(file_path, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Read a text file in fixed-size blocks
+
+    Args:
+        file_path: Path of the file to read
+        buffer_size: Number of characters per block
+
+    Yields:
+        str: Successive blocks of the file
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+        while True:
+            block = file.read(buffer_size)
+            if not block:
+                break
+            yield block
@@ -0,0 +1,149 @@
+import json
+import os
+
+from parsers.schema_ir import has_flattened_comment, parse_table_ddl
+
+DEFAULT_FORMAT_PRIORITY = (".sql", ".txt", ".docx")
+
+CONFLICTS_PATH = "validation_reports/format_conflicts.json"
+
+
+def _schema_key(file_path):
+    """Schema a file belongs to: its name without extension(s)"""
+    return os.path.basename(file_path).split('.')[0]
+
+
+def _format_rank(file_path, format_priority):
+    ext = os.path.splitext(file_path)[1].lower()
+    return format_priority.index(ext) if ext in format_priority else len(format_priority)
+
+
+def table_content_hash(ddl):
+    """
+    Format-independent content hash of a table definition
+
+    Based on the table's structural fingerprint, so layout, whitespace and
+    comments do not matter, while any change to a column does.
+    """
+    table = parse_table_ddl(ddl)
+    return table.fingerprint.hex() if table is not None else None
+
+
+def select_schema_files(file_paths, format_priority=DEFAULT_FORMAT_PRIORITY):
+    """
+    Keep only the highest-priority file of every schema
+
+    Used when conflicts between formats are not checked, so lower-priority
+    copies are not even parsed.
+
+    Args:
+        file_paths: Schema file paths
+        format_priority: File extensions, most trusted first
+
+    Returns:
+        list: Selected paths, in input order
+    """
+    best = {}
+    for file_path in file_paths:
+        key = _schema_key(file_path)
+        if key not in best or _format_rank(file_path, format_priority) < _format_rank(best[key], format_priority):
+            best[key] = file_path
+    selected = set(best.values())
+    return [file_path for file_path in file_paths if file_path in selected]
+
+
+def dedupe_tables(parsed_files, format_priority=DEFAULT_FORMAT_PRIORITY):
+    """
+    Keep one definition of every logical table across .sql, .txt and .docx copies
+
+    A logical table is identified by file stem, schema and table name
+    (case-insensitive), so only copies in files that differ by extension are
+    merged: dev.sql and prod.sql both defining public.users are two tables.
+    The definition from the highest-priority format wins; other copies are
+    dropped, and copies whose content hash differs from the winner are
+    reported as conflicts, except copies with a flattened comment (see
+    schema_ir.has_flattened_comment), which cannot be parsed completely.
+
+    Args:
+        parsed_files: Output of parse_schema_files (file_path, schemas, error)
+        format_priority: File extensions, most trusted first
+
+    Returns:
+        tuple: (parsed_files with duplicate tables removed and a ``duplicates``
+        count per file, list of conflicts)
+    """
+    format_priority = tuple(ext.lower() for ext in format_priority)
+
+    # Pick the winning copy of every table; within a file, later definitions win
+    winners = {}
+    copies = {}
+    for file_index, parsed in enumerate(parsed_files):
+        if parsed["error"]:
+            continue
+        rank = _format_rank(parsed["file_path"], format_priority)
+        for table_index, schema in enumerate(parsed["schemas"]):
+            key = (_schema_key(parsed["file_path"]).lower(), schema["schema_name"].lower(),
+                   schema["table_name"].lower())
+            copies.setdefault(key, {})[parsed["file_path"]] = schema
+            current = winners.get(key)
+            if current is None or rank < current[0] or (rank == current[0] and file_index == current[1]):
+                winners[key] = (rank, file_index, table_index)
+
+    conflicts = []
+    for key, (rank, file_index, table_index) in winners.items():
+        if len(copies[key]) < 2:
+            continue
+        kept = parsed_files[file_index]
+        kept_schema = kept["schemas"][table_index]
+        kept_hash = table_content_hash(kept_schema["ddl"])
+        differing = []
+        for file_path, schema in copies[key].items():
+            # A flattened copy is missing the columns hidden behind its comment; that is not a conflict
+            if file_path == kept["file_path"] or has_flattened_comment(schema["ddl"]) \
+                    or has_flattened_comment(kept_schema["ddl"]):
+                continue
+            content_hash = table_content_hash(schema["ddl"])
+            if content_hash != kept_hash:
+                differing.append({"file_path": file_path, "content_hash": content_hash, "ddl": schema["ddl"]})
+        if differing:
+            conflicts.append({
+                "schema_name": kept_schema["schema_name"],
+                "table_name": kept_schema["table_name"],
+                "kept": {"file_path": kept["file_path"], "content_hash": kept_hash, "ddl": kept_schema["ddl"]},
+                "conflicting": differing
+            })
+
+    kept_positions = {(file_index, table_index) for _, file_index, table_index in winners.values()}
+    deduped = []
+    for file_index, parsed in enumerate(parsed_files):
+        if parsed["error"]:
+            deduped.append(parsed)
+            continue
+        schemas = [schema for table_index, schema in enumerate(parsed["schemas"])
+                   if (file_index, table_index) in kept_positions]
+        deduped.append({"file_path": parsed["file_path"], "schemas": schemas, "error": None,
+                        "duplicates": len(parsed["schemas"]) - len(schemas)})
+    return deduped, conflicts
+
+
+def report_conflicts(conflicts, path=CONFLICTS_PATH):
+    """
+    Print the format conflicts and save them as JSON
+
+    Args:
+        conflicts: Conflicts returned by dedupe_tables
+        path: Output path
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(conflicts, f, indent=2)
+
+    if not conflicts:
+        return
+    print(f"⚠️ {len(conflicts)} tables differ between formats (details in {path}):")
+    for conflict in conflicts:
+        others = ", ".join(os.path.basename(c["file_path"]) for c in conflict["conflicting"])
+        print(f"  {conflict['schema_name']}.{conflict['table_name']}: kept "
+              f"{os.path.basename(conflict['kept']['file_path'])}, differs in {others}")
@@ -0,0 +1,162 @@
+import posixpath
+import zipfile
+from xml.etree import ElementTree
+
+# WordprocessingML namespaces (transitional and strict OOXML)
+_W_NAMESPACES = (
+    "http://schemas.openxmlformats.org/wordprocessingml/2006/main",
+    "http://purl.oclc.org/ooxml/wordprocessingml/main",
+)
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+_RELATIONSHIP = "{http://schemas.openxmlformats.org/package/2006/relationships}Relationship"
+
+_PARAGRAPH = {f"{{{ns}}}p" for ns in _W_NAMESPACES}
+_TEXT = {f"{{{ns}}}t" for ns in _W_NAMESPACES}
+_TAB = {f"{{{ns}}}tab" for ns in _W_NAMESPACES}
+_BREAK = {f"{{{ns}}}br" for ns in _W_NAMESPACES} | {f"{{{ns}}}cr" for ns in _W_NAMESPACES}
+
+_OFFICE_DOCUMENT = "/officeDocument"
+_HEADER = "/header"
+_FOOTER = "/footer"
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+
+
+def _relationships(archive, part):
+    """
+    Relationships of a package part
+
+    Args:
+        archive: Open ZipFile
+        part: Part name, or "" for the package itself
+
+    Returns:
+        list: (type, absolute part name) tuples in file order
+    """
+    directory, name = posixpath.split(part)
+    rels_name = posixpath.join(directory, "_rels", f"{name}.rels")
+    try:
+        with archive.open(rels_name) as f:
+            root = ElementTree.parse(f).getroot()
+    except KeyError:
+        return []
+
+    relationships = []
+    for relationship in root.iter(_RELATIONSHIP):
+        if relationship.get("TargetMode") == "External":
+            continue
+        target = relationship.get("Target", "")
+        # Targets are either absolute ("/word/x.xml") or relative to the source part
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join(directory, target))
+        relationships.append((relationship.get("Type", ""), target))
+    return relationships
+
+
+def docx_text_parts(archive):
+    """
+    Parts of a .docx holding document text: headers, the main document, footers
+
+    The main document is found through the package relationships, so documents
+    whose body is not stored as word/document.xml are read as well.
+    """
+    main = next((target for rel_type, target in _relationships(archive, "")
+                 if rel_type.endswith(_OFFICE_DOCUMENT)), "word/document.xml")
+    related = _relationships(archive, main)
+    headers = [target for rel_type, target in related if rel_type.endswith(_HEADER)]
+    footers = [target for rel_type, target in related if rel_type.endswith(_FOOTER)]
+    names = set(archive.namelist())
+    return [part for part in headers + [main] + footers if part in names]
+
+
+def iter_part_paragraphs(stream):
+    """
+    Stream the paragraph texts of one WordprocessingML part
+
+    Paragraphs are yielded in document order, including those in table cells
+    and text boxes; alternate content fallbacks (mc:Fallback, which repeat the
+    text of text boxes) are skipped. Every element is detached from the tree as
+    soon as it ends, so memory stays flat regardless of the document size.
+
+    Args:
+        stream: Binary file object with the part's XML
+
+    Yields:
+        str: Text of each paragraph (tabs as "\\t", breaks as "\\n")
+    """
+    elements = []     # Open elements, to detach finished children from their parent
+    paragraphs = []   # Text pieces of each open (possibly nested) paragraph
+    fallback_depth = 0
+
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            elements.append(element)
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1
+            elif tag in _PARAGRAPH and not fallback_depth:
+                paragraphs.append([])
+            continue
+
+        elements.pop()
+        if tag == _MC_FALLBACK:
+            fallback_depth -= 1
+        elif not fallback_depth:
+            if tag in _TEXT:
+                if paragraphs and element.text:
+                    paragraphs[-1].append(element.text)
+            elif tag in _TAB:
+                if paragraphs:
+                    paragraphs[-1].append("\t")
+            elif tag in _BREAK:
+                if paragraphs:
+                    paragraphs[-1].append("\n")
+            elif tag in _PARAGRAPH:
+                yield "".join(paragraphs.pop())
+
+        if elements:
+            elements[-1].remove(element)
+
+
+def iter_docx_paragraphs(file_path):
+    """
+    Stream every paragraph of a .docx file without building an object model
+
+    Args:
+        file_path: Path of the .docx file
+
+    Yields:
+        str: Paragraph texts of the headers, the body (including tables and
+        text boxes) and the footers
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        for part in docx_text_parts(archive):
+            with archive.open(part) as stream:
+                yield from iter_part_paragraphs(stream)
+
+
+def iter_docx_blocks(file_path, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Read a .docx file as text blocks for the DDL scanner
+
+    Paragraphs end with a line break and are grouped into blocks of roughly
+    ``block_size`` characters, so blocks always end on a line break.
+
+    Args:
+        file_path: Path of the .docx file
+        block_size: Approximate number of characters per block
+
+    Yields:
+        str: Blocks of paragraph text
+    """
+    pending = []
+    size = 0
+    for paragraph in iter_docx_paragraphs(file_path):
+        pending.append(paragraph)
+        pending.append("\n")
+        size += len(paragraph) + 1
+        if size >= block_size:
+            yield "".join(pending)
+            pending = []
+            size = 0
+    if pending:
+        yield "".join(pending)
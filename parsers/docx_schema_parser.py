@@ -1,10 +1,35 @@
-from docx import Document
 import re
-import pandas as pd
 import os
+from concurrent.futures import ProcessPoolExecutor
+from parsers.ddl_scanner import DEFAULT_BUFFER_SIZE, iter_file_blocks, scan_create_tables
+from parsers.docx_reader import iter_docx_blocks
 
+SUPPORTED_EXTENSIONS = (".docx", ".txt", ".sql")
 
-def extract_sql_schemas(file_path):
+
+# Table name after CREATE TABLE, optionally schema-qualified and quoted
+_TABLE_NAME = re.compile(
+    r"CREATE\s+(?:\w+\s+)*?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    r"(?:[\"`\[]?(\w+)[\"`\]]?\.)?[\"`\[]?(\w+)",
+    re.IGNORECASE
+)
+
+
+def iter_sql_schemas(file_path, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Stream table definitions out of a schema file one at a time
+
+    .sql and .txt files are read in fixed-size buffers and .docx files are
+    streamed out of the zip archive (headers, body paragraphs, table cells and
+    text boxes), so memory use does not grow with the size of the document.
+
+    Args:
+        file_path: Path of a .docx, .txt or .sql file
+        buffer_size: Number of characters read per buffer for text files
+
+    Yields:
+        dict: schema_name, table_name and ddl of each CREATE TABLE statement
+    """
     # Determine file type by extension
     file_ext = os.path.splitext(file_path)[1].lower()
 
@@ -13,39 +38,99 @@ def extract_sql_schemas(file_path):
 
     # Read file content based on file type
     if file_ext == '.docx':
-        # Use Document for .docx files
-        doc = Document(file_path)
-        full_text = "\n".join([para.text for para in doc.paragraphs])
+        blocks = iter_docx_blocks(file_path)
     elif file_ext in ['.txt', '.sql']:
-        # Use standard file reading for .txt and .sql files
-        with open(file_path, 'r') as file:
-            full_text = file.read()
+        blocks = iter_file_blocks(file_path, buffer_size)
     else:
         print(f"Unsupported file type: {file_ext}")
-        return []
+        return
 
+    # Documents exported to .docx or .txt may have DDL flattened onto one line
+    yield from iter_block_schemas(blocks, schema_name, flattened=file_ext != ".sql")
+
+
+def iter_block_schemas(blocks, schema_name, flattened=False):
+    """
+    Split text blocks into table definitions
+
+    Args:
+        blocks: Iterable of text blocks
+        schema_name: Schema of tables whose name is not schema-qualified
+        flattened: The text may have lost its line breaks (see DDLScanner)
+
+    Yields:
+        dict: schema_name, table_name and ddl of each CREATE TABLE statement
+    """
     # Split into individual CREATE TABLE statements - common for all file types
-    schema_blocks = re.findall(r"(CREATE TABLE[\s\S]+?\);)", full_text, re.IGNORECASE)
+    for statement in scan_create_tables(blocks, flattened_comments=flattened):
+        # Parse table name
+        table_match = _TABLE_NAME.search(statement)
+        if table_match:
+            schema_prefix = table_match.group(1) or schema_name
+            table_name = table_match.group(2)
+
+            yield {
+                "schema_name": schema_prefix,
+                "table_name": table_name,
+                "ddl": statement
+            }
 
-    cleaned_schemas = []
-    for schema in schema_blocks:
-        cleaned = schema.strip()
-        if cleaned:
-            # Parse table name
-            table_match = re.search(r"CREATE TABLE\s+(?:(\w+)\.)?(\w+)", cleaned)
-            if table_match:
-                schema_prefix = table_match.group(1) or schema_name
-                table_name = table_match.group(2)
 
-                cleaned_schemas.append({
-                    "schema_name": schema_prefix,
-                    "table_name": table_name,
-                    "ddl": cleaned
-                })
+def extract_sql_schemas(file_path):
+    """
+    Extract every table definition from a schema file
 
-    return cleaned_schemas
+    Args:
+        file_path: Path of a .docx, .txt or .sql file
+
+    Returns:
+        list: schema_name, table_name and ddl of each CREATE TABLE statement
+    """
+    return list(iter_sql_schemas(file_path))
+
+
+def list_schema_files(data_dir):
+    """Return the sorted paths of every supported schema file in a directory"""
+    files = sorted(f for f in os.listdir(data_dir) if f.endswith(SUPPORTED_EXTENSIONS))
+    return [os.path.join(data_dir, f) for f in files]
+
+
+def _parse_file(file_path):
+    """Parse one file, capturing errors instead of raising (runs in worker processes)"""
+    try:
+        return {"file_path": file_path, "schemas": extract_sql_schemas(file_path), "error": None}
+    except Exception as e:
+        return {"file_path": file_path, "schemas": [], "error": f"{type(e).__name__}: {e}"}
+
+
+def parse_schema_files(file_paths, max_workers=None):
+    """
+    Parse schema files in a process pool
+
+    Args:
+        file_paths: List of file paths to parse
+        max_workers: Number of worker processes (1 or None parses in-process)
+
+    Returns:
+        list: One dict per file with file_path, schemas and error, in input order
+    """
+    file_paths = list(file_paths)
+
+    if not max_workers or max_workers <= 1 or len(file_paths) <= 1:
+        return [_parse_file(file_path) for file_path in file_paths]
+
+    workers = min(max_workers, len(file_paths))
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map yields results in input order
+            return list(executor.map(_parse_file, file_paths, chunksize=max(1, len(file_paths) // (workers * 4))))
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ Could not start parser processes ({e}), parsing serially")
+        return [_parse_file(file_path) for file_path in file_paths]
 
 
 def schemas_to_dataframe(schema_list):
     """Convert schema list to a pandas DataFrame for Great Expectations"""
+    import pandas as pd
+
     return pd.DataFrame(schema_list)
\ No newline at end of file
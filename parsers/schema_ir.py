@@ -0,0 +1,354 @@
+import hashlib
+import re
+import sys
+from collections import OrderedDict
+from typing import NamedTuple
+
+from parsers.ddl_scanner import scan_create_tables
+
+# Full (optionally schema-qualified) table name after CREATE TABLE
+_TABLE_NAME = re.compile(
+    r"CREATE\s+(?:\w+\s+)*?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?((?:[\w\"`\[\]]+\.)?[\w\"`\[\]]+)",
+    re.IGNORECASE
+)
+
+# Table-level constraints that must not be mistaken for columns
+_TABLE_CONSTRAINT = re.compile(
+    r"(?:CONSTRAINT\s|PRIMARY\s+KEY|FOREIGN\s+KEY|UNIQUE\s*(?:KEY|INDEX)?\s*[\w\"`]*\s*\(|CHECK\s*\("
+    r"|(?:KEY|INDEX)\s+[\w\"`]*\s*\(|(?:KEY|INDEX)\s*\(|EXCLUDE\s|LIKE\s)",
+    re.IGNORECASE
+)
+
+# First column constraint keyword; everything before it is the data type
+_COLUMN_CONSTRAINT = re.compile(
+    r"\s(?:NOT\s+NULL|NULL|PRIMARY\s+KEY|DEFAULT|REFERENCES|UNIQUE|CHECK|CONSTRAINT|COLLATE"
+    r"|GENERATED|AUTO_INCREMENT|AUTOINCREMENT|IDENTITY|COMMENT)\b",
+    re.IGNORECASE
+)
+
+_PRIMARY_KEY_COLUMNS = re.compile(r"PRIMARY\s+KEY\s*\(([^)]*)\)", re.IGNORECASE)
+
+_TABLE_CACHE_SIZE = 200000
+_table_cache = OrderedDict()
+
+
+class Column(NamedTuple):
+    """One column of a table"""
+    name: str
+    type: str  # Normalized data type, e.g. DECIMAL(10,2)
+    definition: str  # Everything after the column name, whitespace-normalized
+    nullable: bool
+    primary_key: bool
+
+
+def _digest(*parts):
+    hasher = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        hasher.update(part)
+    return hasher.digest()
+
+
+def column_fingerprint(column):
+    """Fingerprint of a column's name and definition (the leaves of the Merkle tree)"""
+    return _digest(column.name.encode("utf-8"), b"\0", column.definition.encode("utf-8"))
+
+
+def normalize_constraint(constraint):
+    """Layout- and case-independent form of a table constraint, e.g. PRIMARY KEY(ID)"""
+    return re.sub(r"\s*([(),])\s*", r"\1", _strip_quotes(constraint).replace('"', "").replace("`", "")).upper()
+
+
+class Table:
+    """
+    Parsed CREATE TABLE statement
+
+    ``fingerprint`` hashes the sorted column fingerprints, the normalized
+    table constraints and the primary key, so two tables with the same
+    columns, definitions and constraints have the same fingerprint regardless
+    of column order, constraint order or table name.
+    """
+
+    __slots__ = ("name", "full_name", "columns", "primary_key", "constraints", "constraint_keys", "fingerprint",
+                 "_index", "_column_fingerprints")
+
+    def __init__(self, name, full_name, columns, primary_key, constraints):
+        self.name = name
+        self.full_name = full_name
+        self.columns = columns
+        self.primary_key = primary_key
+        self.constraints = constraints
+        self.constraint_keys = tuple(sorted({normalize_constraint(constraint) for constraint in constraints}))
+        self._index = {column.name: column for column in columns}
+        self._column_fingerprints = {column.name: column_fingerprint(column) for column in columns}
+        self.fingerprint = _digest(
+            *sorted(self._column_fingerprints.values()),
+            *(b"\1constraint\0" + key.encode("utf-8") for key in self.constraint_keys),
+            b"\1primary key\0" + ",".join(primary_key).lower().encode("utf-8")
+        )
+
+    def column(self, name):
+        """Return the column with the given name, or None"""
+        return self._index.get(name)
+
+    def column_fingerprint(self, name):
+        """Return the fingerprint of the named column, or None"""
+        return self._column_fingerprints.get(name)
+
+    def column_names(self):
+        return self._index.keys()
+
+    def __repr__(self):
+        return f"Table({self.full_name!r}, {len(self.columns)} columns)"
+
+
+class SchemaIR:
+    """
+    All tables of one schema, keyed by lowercase table name
+
+    ``fingerprint`` is the root of the Merkle tree: it hashes every table key
+    together with that table's fingerprint.
+    """
+
+    __slots__ = ("name", "tables", "fingerprint")
+
+    def __init__(self, name, tables):
+        self.name = name
+        self.tables = tables
+        self.fingerprint = _digest(*(
+            key.encode("utf-8") + b"\0" + tables[key].fingerprint for key in sorted(tables)
+        ))
+
+    def __repr__(self):
+        return f"SchemaIR({self.name!r}, {len(self.tables)} tables)"
+
+
+def _strip_quotes(identifier):
+    return identifier.strip('"`[]')
+
+
+def _strip_comments(text):
+    """Remove -- and /* */ comments outside of quoted strings"""
+    if "--" not in text and "/*" not in text:
+        return text
+
+    out = []
+    i = 0
+    length = len(text)
+    quote = None
+    while i < length:
+        char = text[i]
+        if quote:
+            out.append(char)
+            if char == quote:
+                quote = None
+            i += 1
+        elif char in "'\"`":
+            quote = char
+            out.append(char)
+            i += 1
+        elif text.startswith("--", i):
+            end = text.find("\n", i)
+            i = length if end == -1 else end
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = length if end == -1 else end + 2
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def has_flattened_comment(ddl):
+    """
+    Whether a -- comment runs to the end of the statement
+
+    Happens when a document lost its line breaks (see DDLScanner's
+    ``flattened_comments``): the scanner still finds where the statement
+    ends, but the columns written after the comment cannot be told apart from
+    the comment text, so the parsed table lacks them.
+    """
+    if "--" not in ddl:
+        return False
+
+    i = 0
+    length = len(ddl)
+    quote = None
+    while i < length:
+        char = ddl[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif ddl.startswith("--", i):
+            end = ddl.find("\n", i)
+            if end == -1:
+                return True
+            i = end
+        elif ddl.startswith("/*", i):
+            end = ddl.find("*/", i + 2)
+            i = length if end == -1 else end + 1
+        i += 1
+    return False
+
+
+def _split_top_level(body):
+    """Split a column list at commas that are not nested in parentheses or quotes"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(body):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(body[start:i])
+            start = i + 1
+    parts.append(body[start:])
+    return parts
+
+
+def _column_body(ddl):
+    """Return the text between the outermost parentheses of a CREATE TABLE statement"""
+    start = ddl.find("(")
+    if start == -1:
+        return ""
+
+    depth = 0
+    quote = None
+    for i in range(start, len(ddl)):
+        char = ddl[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in "'\"`":
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return ddl[start + 1:i]
+    return ddl[start + 1:]
+
+
+def _parse_column(text, table_primary_key):
+    parts = text.split(None, 1)
+    name = sys.intern(_strip_quotes(parts[0]))
+    definition = sys.intern(" ".join(parts[1].split())) if len(parts) > 1 else ""
+
+    constraint = _COLUMN_CONSTRAINT.search(" " + definition)
+    data_type = definition[:constraint.start()] if constraint else definition
+    data_type = sys.intern(re.sub(r"\s*([(),])\s*", r"\1", data_type.strip()).upper())
+
+    upper = definition.upper()
+    primary_key = "PRIMARY KEY" in upper or name in table_primary_key
+    nullable = not primary_key and "NOT NULL" not in upper
+
+    return Column(name, data_type, definition, nullable, primary_key)
+
+
+def _parse_table(ddl):
+    match = _TABLE_NAME.search(ddl)
+    if not match:
+        return None
+
+    full_name = ".".join(_strip_quotes(part) for part in match.group(1).split("."))
+    name = full_name.split(".")[-1]
+
+    body = _strip_comments(_column_body(ddl[match.end():]))
+    column_defs = []
+    constraints = []
+    primary_key = ()
+
+    for part in _split_top_level(body):
+        part = part.strip()
+        if not part:
+            continue
+        if _TABLE_CONSTRAINT.match(part):
+            constraints.append(sys.intern(" ".join(part.split())))
+            pk_match = _PRIMARY_KEY_COLUMNS.search(part)
+            if pk_match:
+                primary_key = tuple(_strip_quotes(col.strip()) for col in pk_match.group(1).split(","))
+        else:
+            column_defs.append(part)
+
+    columns = tuple(_parse_column(part, primary_key) for part in column_defs)
+    if not primary_key:
+        primary_key = tuple(column.name for column in columns if column.primary_key)
+
+    return Table(name, full_name, columns, primary_key, tuple(constraints))
+
+
+def ddl_hash(ddl):
+    """Hash identifying a DDL statement"""
+    return hashlib.sha1(ddl.encode("utf-8")).hexdigest()
+
+
+def parse_table_ddl(ddl):
+    """
+    Parse one CREATE TABLE statement, memoized by DDL hash
+
+    Args:
+        ddl: CREATE TABLE statement
+
+    Returns:
+        Table or None when the statement has no table name
+    """
+    key = ddl_hash(ddl)
+    table = _table_cache.get(key)
+    if table is not None:
+        _table_cache.move_to_end(key)
+        return table
+
+    table = _parse_table(ddl)
+    if table is not None:
+        _table_cache[key] = table
+        if len(_table_cache) > _TABLE_CACHE_SIZE:
+            _table_cache.popitem(last=False)
+    return table
+
+
+def clear_table_cache():
+    """Drop every memoized table (used to measure cold parses)"""
+    _table_cache.clear()
+
+
+def build_schema_ir(schema_name, schema_list):
+    """
+    Build the intermediate representation of a schema from parsed table dicts
+
+    Args:
+        schema_name: Name of the schema
+        schema_list: Dicts with a ddl key, as returned by extract_sql_schemas
+
+    Returns:
+        SchemaIR: Tables keyed by lowercase table name (later duplicates win)
+    """
+    tables = {}
+    for schema in schema_list:
+        table = parse_table_ddl(schema["ddl"])
+        if table is not None:
+            tables[table.name.lower()] = table
+    return SchemaIR(schema_name, tables)
+
+
+def parse_schema_text(schema_name, ddl_text):
+    """
+    Build the intermediate representation of a schema from raw DDL text
+
+    Args:
+        schema_name: Name of the schema
+        ddl_text: String holding any number of CREATE TABLE statements
+
+    Returns:
+        SchemaIR
+    """
+    return build_schema_ir(schema_name, ({"ddl": ddl} for ddl in scan_create_tables([ddl_text])))
@@ -2,13 +2,10 @@ import os
 import yaml
 import subprocess
 import sys
-import great_expectations as ge
-from great_expectations.data_context import BaseDataContext
-from great_expectations.data_context.types.base import DataContextConfig
 
 
-def setup_environment():
-    with open("config.yaml", "r") as f:
+def setup_environment(config_path="config.yaml"):
+    with open(config_path, "r") as f:
         config = yaml.safe_load(f)
 
     # Ensure directories exist
@@ -25,6 +22,9 @@ def setup_environment():
         print("Initializing Great Expectations...")
 
         try:
+            from great_expectations.data_context import BaseDataContext
+            from great_expectations.data_context.types.base import DataContextConfig
+
             # Use the GreatExpectationsDataContext API for 0.18.19
             context_config = DataContextConfig(
                 config_version=3,
@@ -80,7 +80,7 @@ def setup_environment():
 
     # Update config to include GE path
     config["ge_dir"] = ge_dir
-    with open("config.yaml", "w") as f:
+    with open(config_path, "w") as f:
         yaml.dump(config, f)
 
     print("✅ Environment setup complete")
@@ -0,0 +1,135 @@
+import pytest
+
+chromadb = pytest.importorskip("chromadb")
+
+from database.chroma_store import (COLUMNS_COLLECTION, SCHEMAS_COLLECTION, _sync_collection, delete_schemas,
+                                   record_ids, store_schemas)
+from utils.chunk_utils import chunk_tables, column_records
+
+
+class FakeEmbeddingFunction(chromadb.utils.embedding_functions.EmbeddingFunction):
+    """Deterministic embeddings so the store can be exercised without a model"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += len(input)
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in input]
+
+
+def _tables(schema, ddls):
+    return [{"schema_name": schema, "table_name": table, "ddl": ddl} for table, ddl in ddls.items()]
+
+
+HR = {
+    "employee": "CREATE TABLE employee (\n    id INT,\n    role_id INT\n);",
+    "employee_role": "CREATE TABLE employee_role (\n    id INT,\n    title VARCHAR(50)\n);",
+}
+
+
+def test_column_ids_do_not_collide_across_tables():
+    records = column_records(_tables("hr", HR))
+    ids = record_ids(records, ("schema", "table", "column"))
+    pairs = [(r["metadata"]["table"], r["metadata"]["column"]) for r in records]
+    assert ("employee", "role_id") in pairs and ("employee_role", "id") in pairs
+    assert len(set(ids)) == len(ids)
+
+
+def test_chunk_ids_do_not_depend_on_table_order():
+    chunks = chunk_tables(_tables("hr", HR))
+    ids = record_ids(chunks, ("schema", "table", "part"))
+    reversed_ids = record_ids(chunks[::-1], ("schema", "table", "part"))
+    assert ids == reversed_ids[::-1]
+
+
+def test_repeated_tables_get_distinct_ids():
+    chunks = chunk_tables(_tables("hr", HR) + _tables("hr", {"employee": HR["employee"]}))
+    ids = record_ids(chunks, ("schema", "table", "part"))
+    assert len(set(ids)) == 3
+
+
+def test_store_schemas_accepts_ambiguous_names(tmp_path):
+    config = {"chromadb_path": str(tmp_path)}
+    schemas = _tables("hr", HR)
+    embedding_function = FakeEmbeddingFunction()
+
+    store_schemas(chunk_tables(schemas), config, embedding_function=embedding_function,
+                  column_records=column_records(schemas))
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    assert client.get_collection(SCHEMAS_COLLECTION).count() == 2
+    assert client.get_collection(COLUMNS_COLLECTION).count() == 4
+
+    # A second sync of unchanged schemas embeds nothing
+    embedded = embedding_function.calls
+    store_schemas(chunk_tables(schemas[::-1]), config, embedding_function=embedding_function,
+                  column_records=column_records(schemas[::-1]))
+    assert embedding_function.calls == embedded
+
+
+def test_delete_schemas_removes_chunks_and_columns(tmp_path):
+    config = {"chromadb_path": str(tmp_path)}
+    schemas = _tables("hr", HR) + _tables("fin", {"ledger": "CREATE TABLE ledger (id INT, amount INT);"})
+    store_schemas(chunk_tables(schemas), config, embedding_function=FakeEmbeddingFunction(),
+                  column_records=column_records(schemas))
+
+    assert delete_schemas(["fin"], config) == 3
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    for name in (SCHEMAS_COLLECTION, COLUMNS_COLLECTION):
+        stored = client.get_collection(name).get(include=["metadatas"])["metadatas"]
+        assert stored and {metadata["schema"] for metadata in stored} == {"hr"}
+
+
+def test_watcher_deletes_schemas_whose_files_were_removed(tmp_path):
+    from watch_schemas import SchemaWatcher
+
+    config = {"chromadb_path": str(tmp_path)}
+    hr = _tables("hr", HR)
+    fin = _tables("fin", {"ledger": "CREATE TABLE ledger (id INT, amount INT);"})
+    watcher = SchemaWatcher(config, write_html=False, use_vector_store=True)
+    watcher.embedding_function = FakeEmbeddingFunction()
+    watcher.stored_schemas = set()
+
+    watcher._store(hr + fin, {"hr", "fin"})
+    watcher._store(hr, {"fin"})
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    for name in (SCHEMAS_COLLECTION, COLUMNS_COLLECTION):
+        stored = client.get_collection(name).get(include=["metadatas"])["metadatas"]
+        assert {metadata["schema"] for metadata in stored} == {"hr"}
+
+
+def test_full_refresh_reports_every_deleted_record(tmp_path):
+    config = {"chromadb_path": str(tmp_path)}
+    chunks = chunk_tables(_tables("hr", HR))
+    store_schemas(chunks, config, embedding_function=FakeEmbeddingFunction())
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    collection = client.get_collection(SCHEMAS_COLLECTION, embedding_function=FakeEmbeddingFunction())
+    stats = _sync_collection(client, collection, chunk_tables(_tables("hr", HR)),
+                             record_ids(chunks, ("schema", "table", "part")), incremental=False)
+    assert (stats["deleted"], stats["added"]) == (2, 2)
+
+
+def test_watcher_restores_edited_files_with_qualified_tables(tmp_path):
+    from generate_report import collect_schemas
+    from watch_schemas import SchemaWatcher
+
+    config = {"chromadb_path": str(tmp_path), "format_conflict_check": False}
+
+    def parsed(ddl):
+        return [{"file_path": "data/dev.sql", "error": None,
+                 "schemas": [{"schema_name": "public", "table_name": "users", "ddl": ddl}]}]
+
+    watcher = SchemaWatcher(config, write_html=False, use_vector_store=True)
+    watcher.embedding_function = FakeEmbeddingFunction()
+    watcher._store(collect_schemas(config, parsed("CREATE TABLE public.users (id INT);"), verbose=False)[0], {"dev"})
+    watcher._store(collect_schemas(config, parsed("CREATE TABLE public.users (id BIGINT);"), verbose=False)[0],
+                   {"dev"})
+
+    client = chromadb.PersistentClient(path=str(tmp_path))
+    stored = client.get_collection(SCHEMAS_COLLECTION).get(include=["documents", "metadatas"])
+    assert stored["documents"] == ["CREATE TABLE public.users (id BIGINT);"]
+    assert stored["metadatas"][0]["schema"] == "dev"
@@ -0,0 +1,46 @@
+from parsers.schema_ir import parse_table_ddl
+from utils.chunk_utils import chunk_tables, column_records, split_columns
+
+WIDE = "CREATE TABLE wide (\n" + ",\n".join(f"    column_{n:02d} VARCHAR(100)" for n in range(30)) + \
+       ",\n    PRIMARY KEY (column_00)\n);"
+
+
+def _columns(part):
+    return [line.strip().rstrip(",") for line in part.splitlines()[1:-1]]
+
+
+def test_split_columns_respects_the_chunk_size():
+    parts = split_columns(parse_table_ddl(WIDE), chunk_size=300)
+    assert len(parts) > 1
+    assert all(len(part) <= 300 for part in parts)
+    assert all(part.startswith("CREATE TABLE wide (") for part in parts)
+    # Every column appears, and the table constraint goes into the last part
+    columns = [column for part in parts for column in _columns(part)]
+    assert {f"column_{n:02d} VARCHAR(100)" for n in range(30)} <= set(columns)
+    assert _columns(parts[-1])[-1] == "PRIMARY KEY (column_00)"
+
+
+def test_split_columns_overlaps_trailing_columns():
+    parts = split_columns(parse_table_ddl(WIDE), chunk_size=300, chunk_overlap=60)
+    for previous, current in zip(parts, parts[1:]):
+        assert _columns(current)[0] in _columns(previous)
+
+
+def test_chunk_tables_keeps_small_tables_whole():
+    small = {"schema_name": "s", "table_name": "small", "ddl": "CREATE TABLE small (id INT);"}
+    wide = {"schema_name": "s", "table_name": "wide", "ddl": WIDE}
+    chunks = chunk_tables([small, wide], chunk_size=300)
+
+    assert chunks[0]["content"] == small["ddl"] and "part" not in chunks[0]["metadata"]
+    parts = [chunk["metadata"] for chunk in chunks[1:]]
+    assert [metadata["part"] for metadata in parts] == list(range(1, len(parts) + 1))
+    assert {metadata["parts"] for metadata in parts} == {len(parts)}
+    assert len({chunk["metadata"]["content_hash"] for chunk in chunks}) == len(chunks)
+
+
+def test_column_records_carry_table_column_and_type():
+    records = column_records([{"schema_name": "s", "table_name": "t",
+                               "ddl": "CREATE TABLE t (id INT PRIMARY KEY, price DECIMAL(10, 2));"}])
+    assert [record["content"] for record in records] == ["t.id INT PRIMARY KEY", "t.price DECIMAL(10, 2)"]
+    assert records[1]["metadata"] == {"schema": "s", "table": "t", "column": "price", "type": "DECIMAL(10,2)",
+                                      "content_hash": records[1]["metadata"]["content_hash"]}
@@ -0,0 +1,21 @@
+from generate_report import collect_schemas
+
+
+def _parsed(file_path, ddl, qualifier):
+    return {"file_path": file_path, "error": None,
+            "schemas": [{"schema_name": qualifier, "table_name": "users", "ddl": ddl}]}
+
+
+def test_tables_are_grouped_by_file_stem_whatever_their_qualifier():
+    parsed = [
+        _parsed("data/dev.sql", "CREATE TABLE public.users (id INT);", "public"),
+        _parsed("data/prod.sql", "CREATE TABLE public.users (id BIGINT);", "public"),
+        _parsed("data/prod.txt", "CREATE TABLE public.users ( id BIGINT );", "public"),
+    ]
+    all_schemas, schemas_by_file = collect_schemas({"format_conflict_check": False}, parsed, verbose=False)
+
+    assert sorted(schemas_by_file) == ["dev", "prod"]
+    assert [schema["schema_name"] for schema in all_schemas] == ["dev", "prod"]
+    assert [schema["ddl"] for schema in schemas_by_file["prod"]] == ["CREATE TABLE public.users (id BIGINT);"]
+    # The parsed files are left as they were
+    assert parsed[0]["schemas"][0]["schema_name"] == "public"
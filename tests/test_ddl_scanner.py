@@ -0,0 +1,54 @@
+from parsers.ddl_scanner import scan_create_tables
+from parsers.docx_schema_parser import iter_block_schemas
+
+
+def _tables(text, **kwargs):
+    return [schema["table_name"] for schema in iter_block_schemas([text], "s", **kwargs)]
+
+
+def test_statements_end_at_semicolons_outside_parentheses():
+    text = "CREATE TABLE a (id INT, n NUMERIC(10, 2));\nINSERT INTO a VALUES (1, 2);\nCREATE TABLE b (id INT);\n"
+    assert list(scan_create_tables([text])) == [
+        "CREATE TABLE a (id INT, n NUMERIC(10, 2));",
+        "CREATE TABLE b (id INT);",
+    ]
+
+
+def test_comment_with_closing_paren_does_not_end_table():
+    text = "CREATE TABLE a (\n    id INT, -- see old_t);\n    name TEXT\n);\nCREATE TABLE b (id INT);\n"
+    statements = list(scan_create_tables([text]))
+    assert len(statements) == 2
+    assert "name TEXT" in statements[0]
+
+
+def test_comment_with_apostrophe_does_not_open_a_string():
+    text = "CREATE TABLE a (\n    id INT -- don't );\n);\nCREATE TABLE b (id INT);\nCREATE TABLE c (id INT);\n"
+    assert _tables(text) == ["a", "b", "c"]
+    assert _tables(text, flattened=True) == ["a", "b", "c"]
+
+
+def test_string_with_closing_paren_and_semicolon():
+    text = "CREATE TABLE a (\n    status VARCHAR(10) DEFAULT ');',\n    id INT\n);\nCREATE TABLE b (id INT);\n"
+    statements = list(scan_create_tables([text]))
+    assert len(statements) == 2
+    assert statements[0].endswith("id INT\n);")
+
+
+def test_escaped_quotes_inside_strings():
+    text = "CREATE TABLE a (note TEXT DEFAULT 'it\\'s', b TEXT DEFAULT 'x''y');\nCREATE TABLE b (id INT);\n"
+    assert _tables(text) == ["a", "b"]
+
+
+def test_flattened_comment_only_in_flattened_sources():
+    line = "CREATE TABLE a ( id INT, kind VARCHAR(5), -- Only 'X' allowed name TEXT );\nCREATE TABLE b (id INT);\n"
+    flattened = list(scan_create_tables([line], flattened_comments=True))
+    assert len(flattened) == 2 and "name TEXT" in flattened[0]
+    # Without the flag the comment runs to the end of the line, as in SQL, so table a never closes
+    assert list(scan_create_tables([line])) == []
+
+
+def test_statements_split_across_blocks():
+    text = "CREATE TABLE a (\n    id INT,\n    -- comment ;\n    name TEXT\n);\n" * 3
+    blocks = [text[i:i + 7] for i in range(0, len(text), 7)]
+    assert list(scan_create_tables(blocks)) == list(scan_create_tables([text]))
+    assert len(list(scan_create_tables(blocks))) == 3
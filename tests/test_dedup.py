@@ -0,0 +1,66 @@
+from parsers.dedup import dedupe_tables, select_schema_files
+
+
+def _parsed(file_path, ddls):
+    schemas = [{"schema_name": "hr", "table_name": table, "ddl": ddl} for table, ddl in ddls.items()]
+    return {"file_path": file_path, "schemas": schemas, "error": None}
+
+
+def test_select_schema_files_keeps_the_preferred_format():
+    files = ["data/hr.docx", "data/hr.sql", "data/hr.txt", "data/fin.txt", "data/fin.docx"]
+    assert select_schema_files(files) == ["data/hr.sql", "data/fin.txt"]
+
+
+def test_identical_copies_are_dropped_without_conflicts():
+    parsed = [
+        _parsed("data/hr.docx", {"employee": "CREATE TABLE employee ( id INT, name TEXT );"}),
+        _parsed("data/hr.sql", {"employee": "CREATE TABLE employee (\n    id INT,\n    name TEXT\n);"}),
+    ]
+    deduped, conflicts = dedupe_tables(parsed)
+    assert conflicts == []
+    assert [len(entry["schemas"]) for entry in deduped] == [0, 1]
+    assert [entry["duplicates"] for entry in deduped] == [1, 0]
+
+
+def test_differing_copies_are_reported_and_the_preferred_one_kept():
+    parsed = [
+        _parsed("data/hr.sql", {"employee": "CREATE TABLE employee (id INT, name TEXT);"}),
+        _parsed("data/hr.txt", {"employee": "CREATE TABLE employee (id INT, name VARCHAR(20));",
+                                "payroll": "CREATE TABLE payroll (id INT);"}),
+    ]
+    deduped, conflicts = dedupe_tables(parsed)
+    assert [schema["table_name"] for schema in deduped[0]["schemas"]] == ["employee"]
+    assert [schema["table_name"] for schema in deduped[1]["schemas"]] == ["payroll"]
+    assert len(conflicts) == 1
+    assert conflicts[0]["kept"]["file_path"] == "data/hr.sql"
+    assert [copy["file_path"] for copy in conflicts[0]["conflicting"]] == ["data/hr.txt"]
+
+
+
+def test_flattened_copies_are_not_reported_as_conflicts():
+    parsed = [
+        _parsed("data/hr.sql", {"employee": "CREATE TABLE employee (\n    id INT, -- key\n    name TEXT\n);"}),
+        _parsed("data/hr.txt", {"employee": "CREATE TABLE employee ( id INT, -- key name TEXT );"}),
+    ]
+    deduped, conflicts = dedupe_tables(parsed)
+    assert conflicts == []
+    assert [len(entry["schemas"]) for entry in deduped] == [1, 0]
+
+def test_files_with_errors_pass_through():
+    failed = {"file_path": "data/hr.docx", "schemas": [], "error": "BadZipFile: broken"}
+    deduped, conflicts = dedupe_tables([failed])
+    assert deduped == [failed] and conflicts == []
+
+
+def test_files_of_different_environments_are_not_merged():
+    parsed = [
+        _parsed("data/dev.sql", {"users": "CREATE TABLE public.users (id INT, name TEXT);"}),
+        _parsed("data/prod.sql", {"users": "CREATE TABLE public.users (id BIGINT, name TEXT);"}),
+    ]
+    for entry in parsed:
+        entry["schemas"][0]["schema_name"] = "public"
+
+    deduped, conflicts = dedupe_tables(parsed)
+    assert conflicts == []
+    assert [len(entry["schemas"]) for entry in deduped] == [1, 1]
+    assert [entry["duplicates"] for entry in deduped] == [0, 0]
@@ -0,0 +1,65 @@
+import csv
+
+from parsers.schema_ir import parse_schema_text
+from validators.diff_records import (DEFINITION_MISMATCH, FIELDS, MISSING_IN_DESTINATION, MISSING_IN_SOURCE,
+                                     TYPE_MISMATCH, DiffRecords, describe_column, export_diffs)
+from validators.schema_comparator import compare_schemas
+
+
+def _results(verbose=False):
+    source = parse_schema_text("src", "CREATE TABLE a (id INT, name TEXT, x INT, n INT NOT NULL);\n"
+                                      "CREATE TABLE gone (id INT);")
+    destination = parse_schema_text("dst", "CREATE TABLE a (id INT, name VARCHAR(9), y INT, n INT DEFAULT 0);\n"
+                                           "CREATE TABLE new (id INT);")
+    return compare_schemas(source, destination, verbose=verbose)["results"]
+
+
+def test_records_from_results():
+    records = DiffRecords.from_results(_results())
+    assert sorted(records) == sorted([
+        (TYPE_MISMATCH, "a", "name", "TEXT", "VARCHAR(9)", "TEXT", "VARCHAR(9)"),
+        (DEFINITION_MISMATCH, "a", "n", "INT", "INT", "INT NOT NULL", "INT DEFAULT 0"),
+        (MISSING_IN_DESTINATION, "a", "x", "INT", None, "INT", None),
+        (MISSING_IN_SOURCE, "a", "y", None, "INT", None, "INT"),
+        (MISSING_IN_DESTINATION, "gone", None, None, None, None, None),
+        (MISSING_IN_SOURCE, "new", None, None, None, None, None),
+    ])
+
+
+def test_matches_are_only_kept_on_request():
+    assert len(DiffRecords.from_results(_results(verbose=True))) == 6
+    assert len(DiffRecords.from_results(_results(verbose=True), include_matches=True)) == 7
+
+
+def test_filter_and_count_by():
+    records = DiffRecords.from_results(_results())
+    assert [record[:5] for record in records.filter(kind=TYPE_MISMATCH)] == \
+        [(TYPE_MISMATCH, "a", "name", "TEXT", "VARCHAR(9)")]
+    assert len(records.filter(kind=[MISSING_IN_SOURCE, MISSING_IN_DESTINATION], table="a")) == 2
+    assert len(records.filter(table="a", column="y")) == 1
+    assert records.count_by() == {TYPE_MISMATCH: 1, DEFINITION_MISMATCH: 1, MISSING_IN_DESTINATION: 2,
+                                  MISSING_IN_SOURCE: 2}
+    assert records.count_by("table") == {"a": 4, "gone": 1, "new": 1}
+
+
+def test_export_csv(tmp_path):
+    path = str(tmp_path / "out" / "diffs.csv")
+    records = export_diffs(_results(), path)
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert tuple(rows[0]) == FIELDS
+    assert len(rows) == len(records) + 1
+
+
+def test_describe_column():
+    assert describe_column((TYPE_MISMATCH, "name", "TEXT", "INT", "TEXT NOT NULL", "INT NOT NULL"), "src", "dst") == \
+        "Column 'name' has different datatypes: TEXT vs INT"
+    assert describe_column((DEFINITION_MISMATCH, "n", "INT", "INT", "INT NOT NULL", "INT"), "src", "dst") == \
+        "Column 'n' has different definitions: INT NOT NULL vs INT"
+    assert describe_column((MISSING_IN_DESTINATION, "x", "INT", None, "INT", None), "src", "dst") == \
+        "Column 'x' is missing in dst"
+
+
+def test_rows_of_older_reports_are_padded():
+    result = {"kwargs": {"table": "a"}, "meta": {"column_diffs": [[TYPE_MISMATCH, "c", "INT", "TEXT"]]}}
+    assert list(DiffRecords.from_results([result])) == [(TYPE_MISMATCH, "a", "c", "INT", "TEXT", None, None)]
@@ -0,0 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from database.embedding_cache import EmbeddingCache
+
+
+def test_get_many_returns_cached_embeddings_in_order(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    cache.put_many("m", ["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+
+    assert cache.get_many("m", ["b", "c", "a"]) == [[3.0, 4.0], None, [1.0, 2.0]]
+    assert cache.get_many("other", ["a"]) == [None]
+
+
+def test_counters_are_exact_under_concurrent_lookups(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    cache.put_many("m", ["hit"], [[1.0]])
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: cache.get_many("m", ["hit", "miss"]), range(400)))
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (400, 400, 1)
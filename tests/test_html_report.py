@@ -0,0 +1,23 @@
+import os
+
+from utils.html_report import generate_html_report
+
+
+def _report(tables):
+    meta = {"great_expectations_version": "x", "source_schema": "a", "destination_schema": "b",
+            "timestamp": "now", "statistics": {}}
+    results = [{"kwargs": {"table": table}, "success": True, "meta": {"status": "match"}} for table in tables]
+    return {"meta": meta, "results": results}
+
+
+def test_shorter_report_removes_stale_pages(tmp_path):
+    output_path = str(tmp_path / "report.html")
+    generate_html_report(_report(["t1", "t2", "t3", "t4", "t5"]), output_path, page_size=2)
+    assert os.path.exists(tmp_path / "report_page_3.html")
+
+    written = generate_html_report(_report(["t1", "t2"]), output_path, page_size=2)
+    assert sorted(os.listdir(tmp_path)) == ["report.html", "report_page_1.html"]
+    assert written == [output_path, str(tmp_path / "report_page_1.html")]
+
+    generate_html_report(_report(["t1"]), output_path)
+    assert os.listdir(tmp_path) == ["report.html"]
@@ -0,0 +1,12 @@
+from utils.qa_facts import AnswerCache, answer_version
+
+
+def test_answers_are_cached_per_model_prompt_and_top_k(tmp_path):
+    path = str(tmp_path / "qa.sqlite3")
+    version = answer_version("llama3", "Facts: {facts}", 20)
+    AnswerCache(path, version=version).set("Which tables differ?", "fp", "employee")
+
+    assert AnswerCache(path, version=version).get("which tables differ", "fp") == "employee"
+    for other in (answer_version("mistral", "Facts: {facts}", 20), answer_version("llama3", "FACTS: {facts}", 20),
+                  answer_version("llama3", "Facts: {facts}", 5)):
+        assert AnswerCache(path, version=other).get("Which tables differ?", "fp") is None
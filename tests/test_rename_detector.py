@@ -0,0 +1,55 @@
+from parsers.schema_ir import parse_schema_text
+from validators.rename_detector import detect_renames, rank_column_renames
+
+
+def _table(ddl):
+    schema = parse_schema_text("s", ddl)
+    return next(iter(schema.tables.values()))
+
+
+def test_true_column_rename_is_suggested():
+    suggestions = rank_column_renames(_table("CREATE TABLE t (id INT, cust_name VARCHAR(50));"),
+                                      _table("CREATE TABLE t (id INT, customer_name VARCHAR(50));"))
+    assert [(s["source_column"], s["destination_column"]) for s in suggestions] == [("cust_name", "customer_name")]
+
+
+def test_unrelated_same_type_columns_are_not_suggested():
+    suggestions = rank_column_renames(_table("CREATE TABLE t (id INT, age INT, notes TEXT);"),
+                                      _table("CREATE TABLE t (id INT, zipcode INT, region_code INT);"))
+    assert suggestions == []
+
+
+def test_type_agreement_only_ranks_candidates():
+    table1 = _table("CREATE TABLE t (id INT, amount INT);")
+    same_type = rank_column_renames(table1, _table("CREATE TABLE t (id INT, amounts INT);"))
+    other_type = rank_column_renames(table1, _table("CREATE TABLE t (id INT, amounts DECIMAL(10, 2));"))
+    assert same_type and other_type
+    assert same_type[0]["score"] > other_type[0]["score"]
+
+
+def test_vector_hit_never_lowers_a_pair():
+    table1 = _table("CREATE TABLE t (id INT, cust_name VARCHAR(50));")
+    table2 = _table("CREATE TABLE t (id INT, customer_name VARCHAR(50));")
+    without = rank_column_renames(table1, table2)
+    weak_hit = rank_column_renames(table1, table2, vector_scores={("cust_name", "customer_name"): 0.1})
+    assert weak_hit == without
+
+
+def test_vector_evidence_can_qualify_a_dissimilar_name():
+    table1 = _table("CREATE TABLE t (id INT, dob DATE);")
+    table2 = _table("CREATE TABLE t (id INT, date_of_birth DATE);")
+    assert rank_column_renames(table1, table2) == []
+    suggestions = rank_column_renames(table1, table2, vector_scores={("dob", "date_of_birth"): 0.9})
+    assert suggestions[0]["destination_column"] == "date_of_birth"
+
+
+def test_detect_renames_without_vector_store():
+    shared = "id INT, email TEXT, phone TEXT, city TEXT"
+    schema1 = parse_schema_text("a", f"CREATE TABLE customers ({shared}, cust_name TEXT);")
+    schema2 = parse_schema_text("b", f"CREATE TABLE clients ({shared}, customer_name TEXT);")
+    renames = detect_renames(schema1, schema2)
+    assert len(renames["tables"]) == 1
+    suggestion = renames["tables"][0]
+    assert suggestion["vector_score"] is None
+    assert [(c["source_column"], c["destination_column"]) for c in suggestion["columns"]] == \
+        [("cust_name", "customer_name")]
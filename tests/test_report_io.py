@@ -0,0 +1,23 @@
+from utils.report_io import JsonlReportWriter, report_passed, write_report
+
+
+def _report(*successes):
+    results = [{"kwargs": {"table": f"t{i}"}, "success": success} for i, success in enumerate(successes)]
+    return {"success": all(successes), "meta": {"source_schema": "a"}, "results": results}
+
+
+def test_report_passed_reads_the_header_flag(tmp_path):
+    for name in ("report.json", "report.jsonl"):
+        write_report(_report(True, True), str(tmp_path / name))
+        assert report_passed(str(tmp_path / name))
+        write_report(_report(True, False), str(tmp_path / name))
+        assert not report_passed(str(tmp_path / name))
+
+
+def test_report_passed_streams_results_without_a_header_flag(tmp_path):
+    path = str(tmp_path / "report.jsonl")
+    with JsonlReportWriter(path) as writer:
+        writer.write_header({"source_schema": "a"})
+        writer.write_result({"kwargs": {"table": "t1"}, "success": True})
+        writer.write_result({"kwargs": {"table": "t2"}, "success": False})
+    assert not report_passed(path)
@@ -0,0 +1,84 @@
+import sqlite3
+import time
+
+from utils.llm_summarizer import summary_version
+from utils.result_store import ResultStore, result_key
+
+
+def _report(n=0):
+    return {"meta": {"source_fingerprint": f"s{n}", "destination_fingerprint": f"d{n}"}, "results": []}
+
+
+def test_result_key_depends_on_every_input():
+    key = result_key("a", "b", "1", {"verbose": False})
+    assert key == result_key("a", "b", "1", {"verbose": False})
+    assert len({key, result_key("a", "c", "1", {"verbose": False}), result_key("a", "b", "2", {"verbose": False}),
+                result_key("a", "b", "1", {"verbose": True})}) == 4
+
+
+def test_put_and_get_round_trip(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite3"))
+    store.put("k", _report(), {"out/report.html": b"<html>"}, "1")
+
+    stored = store.get("k")
+    assert stored["report"] == _report()
+    assert stored["artifacts"] == {"out/report.html": b"<html>"}
+    assert store.get("missing") is None
+
+
+def test_least_recently_used_entries_are_evicted_over_the_size_limit(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite3"), max_bytes=2500, max_age_days=None)
+    for n in range(3):
+        store.put(f"k{n}", _report(n), {"a": b"x" * 1000}, "1")
+        time.sleep(0.01)
+
+    assert store.get("k0") is None
+    assert store.get("k1") is not None and store.get("k2") is not None
+
+
+def test_entries_unused_for_too_long_are_evicted(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite3"), max_age_days=1)
+    store.put("old", _report(), {}, "1")
+    store.put("new", _report(), {}, "1")
+    store._conn.execute("UPDATE results SET accessed = ? WHERE key = 'old'", (time.time() - 2 * 86400,))
+
+    assert store.evict() == 1
+    assert store.stats()["entries"] == 1 and store.get("new") is not None
+
+
+def test_summaries_are_only_reused_for_the_same_version(tmp_path):
+    store = ResultStore(str(tmp_path / "store.sqlite3"))
+    store.put("k", _report(), {}, "1")
+    llama = summary_version("llama3", 3000)
+    mistral = summary_version("mistral", 3000)
+
+    store.set_summary("k", "summary", llama)
+    assert store.get_summary("k", llama) == "summary"
+    assert store.get_summary("k", mistral) is None
+
+    size = store.stats()["bytes"]
+    store.set_summary("k", "other summary", mistral)
+    assert store.get_summary("k", llama) is None
+    assert store.stats()["bytes"] == size + len("other summary") - len("summary")
+
+
+def test_summary_version_tracks_model_and_budget():
+    assert summary_version("llama3", 3000) == summary_version("llama3", 3000)
+    assert summary_version("llama3", 3000) != summary_version("llama3", 2000)
+    assert summary_version("llama3", 3000) != summary_version("mistral", 3000)
+
+
+def test_stores_without_summary_versions_are_upgraded(tmp_path):
+    path = str(tmp_path / "store.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE results (key TEXT PRIMARY KEY, source_fingerprint TEXT NOT NULL, "
+        "destination_fingerprint TEXT NOT NULL, comparator_version TEXT NOT NULL, report TEXT NOT NULL, "
+        "summary TEXT, size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO results VALUES ('k', 's', 'd', '1', '{}', 'old summary', 10, 0, ?)", (time.time(),))
+    conn.commit()
+    conn.close()
+
+    store = ResultStore(path)
+    assert store.get_summary("k", summary_version("llama3", 3000)) is None
@@ -0,0 +1,95 @@
+from parsers.schema_ir import parse_schema_text
+from validators.diff_records import (CONSTRAINT_MISMATCH, DEFINITION_MISMATCH, DIFFERENT, MATCH, MISSING_IN_DESTINATION,
+                                     MISSING_IN_SOURCE, TYPE_MISMATCH, iter_column_diffs)
+from validators.schema_comparator import compare_schemas
+
+SOURCE = """
+CREATE TABLE employee (id INT, name VARCHAR(50), salary INT);
+CREATE TABLE department (id INT, title TEXT);
+CREATE TABLE legacy (id INT);
+"""
+DESTINATION = """
+CREATE TABLE employee (id INT, name VARCHAR(100), bonus INT);
+CREATE TABLE department (id INT, title TEXT);
+CREATE TABLE contractor (id INT);
+"""
+
+
+def _compare(source=SOURCE, destination=DESTINATION, **kwargs):
+    return compare_schemas(parse_schema_text("src", source), parse_schema_text("dst", destination), **kwargs)
+
+
+def _by_table(report):
+    return {result["kwargs"]["table"]: result for result in report["results"]}
+
+
+def test_statistics_and_statuses():
+    report = _compare()
+    assert report["meta"]["statistics"] == {"tables_compared": 4, "identical_tables": 1, "different_tables": 1,
+                                            "missing_in_source": 1, "missing_in_destination": 1}
+    assert report["meta"]["identical_tables"] == ["department"]
+    results = _by_table(report)
+    assert set(results) == {"employee", "legacy", "contractor"}
+    assert results["employee"]["meta"]["status"] == DIFFERENT
+    assert results["legacy"]["meta"]["status"] == MISSING_IN_DESTINATION
+    assert results["contractor"]["meta"]["status"] == MISSING_IN_SOURCE
+    assert not report["success"]
+
+
+def test_column_diff_records():
+    diffs = {record[1]: record for record in iter_column_diffs(_by_table(_compare())["employee"])}
+    assert diffs["name"] == (TYPE_MISMATCH, "name", "VARCHAR(50)", "VARCHAR(100)", "VARCHAR(50)", "VARCHAR(100)")
+    assert diffs["salary"][:3] == (MISSING_IN_DESTINATION, "salary", "INT")
+    assert diffs["bonus"][0] == MISSING_IN_SOURCE and diffs["bonus"][3] == "INT"
+    assert "id" not in diffs
+
+
+def test_verbose_reports_list_matches():
+    results = _by_table(_compare(verbose=True))
+    assert "department" in results
+    kinds = {record[1]: record[0] for record in iter_column_diffs(results["employee"])}
+    assert kinds["id"] == MATCH
+
+
+def test_identical_schemas_short_circuit():
+    report = _compare(SOURCE, SOURCE)
+    assert report["success"] and report["results"] == []
+    assert report["meta"]["statistics"]["identical_tables"] == 3
+
+
+def test_previous_results_are_reused_for_unchanged_tables():
+    source = parse_schema_text("src", SOURCE)
+    destination = parse_schema_text("dst", DESTINATION)
+    first = compare_schemas(source, destination)
+
+    changed = parse_schema_text("dst", DESTINATION.replace("bonus INT", "bonus BIGINT"))
+    incremental = compare_schemas(source, changed, previous=(first, source, destination))
+    full = compare_schemas(source, changed)
+
+    # employee changed; legacy and contractor are reused
+    assert incremental["meta"]["reused_results"] == 2
+    assert incremental["results"] == full["results"]
+    assert incremental["meta"]["statistics"] == full["meta"]["statistics"]
+
+
+def test_previous_results_of_other_schema_names_are_ignored():
+    source = parse_schema_text("src", SOURCE)
+    destination = parse_schema_text("dst", DESTINATION)
+    first = compare_schemas(source, destination)
+    other = compare_schemas(source, parse_schema_text("other", DESTINATION), previous=(first, source, destination))
+    assert other["meta"]["reused_results"] == 0
+
+
+def test_modifier_changes_are_not_type_mismatches():
+    report = _compare("CREATE TABLE t (id INT, n INT NOT NULL DEFAULT 0);", "CREATE TABLE t (id INT, n INT);")
+    (record,) = iter_column_diffs(report["results"][0])
+    assert record == (DEFINITION_MISMATCH, "n", "INT", "INT", "INT NOT NULL DEFAULT 0", "INT")
+
+
+def test_primary_key_changes_are_reported():
+    report = _compare("CREATE TABLE t (id INT, b INT, PRIMARY KEY (id));",
+                      "CREATE TABLE t (id INT, b INT, PRIMARY KEY (b));")
+    assert not report["success"]
+    assert report["meta"]["statistics"]["different_tables"] == 1
+    (record,) = iter_column_diffs(report["results"][0])
+    assert record == (CONSTRAINT_MISMATCH, None, None, None, "PRIMARY KEY(ID)", "PRIMARY KEY(B)")
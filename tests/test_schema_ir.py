@@ -0,0 +1,56 @@
+from parsers.schema_ir import build_schema_ir, has_flattened_comment, parse_schema_text, parse_table_ddl
+
+
+def test_columns_and_primary_key_are_parsed():
+    table = parse_table_ddl(
+        "CREATE TABLE hr.employee (\n    id INT PRIMARY KEY,\n    salary DECIMAL(10, 2) NOT NULL,\n"
+        "    name VARCHAR(50) -- full name\n);")
+    assert table.name == "employee"
+    assert list(table.column_names()) == ["id", "salary", "name"]
+    assert table.column("salary").type == "DECIMAL(10,2)"
+    assert not table.column("salary").nullable
+    assert table.column("id").primary_key
+
+
+def test_build_schema_ir_keys_tables_by_lowercase_name():
+    schema = build_schema_ir("s", [{"ddl": "CREATE TABLE Employee (id INT);"},
+                                   {"ddl": "CREATE TABLE employee (id INT, name TEXT);"}])
+    assert list(schema.tables) == ["employee"]
+    assert list(schema.tables["employee"].column_names()) == ["id", "name"]
+
+
+def test_table_fingerprint_ignores_layout_and_column_order():
+    compact = parse_table_ddl("CREATE TABLE t (a INT, b TEXT);")
+    spread = parse_table_ddl("CREATE TABLE t (\n    b   TEXT, -- note\n    a INT\n);")
+    assert compact.fingerprint == spread.fingerprint
+
+
+def test_table_fingerprint_changes_with_a_column_definition():
+    assert parse_table_ddl("CREATE TABLE t (a INT);").fingerprint != \
+        parse_table_ddl("CREATE TABLE t (a BIGINT);").fingerprint
+
+
+def test_schema_fingerprint_covers_table_names_and_contents():
+    base = parse_schema_text("s", "CREATE TABLE a (id INT);\nCREATE TABLE b (id INT);")
+    same = parse_schema_text("other", "CREATE TABLE b (id INT);\nCREATE TABLE a (id INT);")
+    renamed = parse_schema_text("s", "CREATE TABLE a (id INT);\nCREATE TABLE c (id INT);")
+    changed = parse_schema_text("s", "CREATE TABLE a (id INT);\nCREATE TABLE b (id TEXT);")
+    assert base.fingerprint == same.fingerprint
+    assert base.fingerprint != renamed.fingerprint
+    assert base.fingerprint != changed.fingerprint
+
+
+def test_table_fingerprint_covers_constraints_and_primary_key():
+    by_id = parse_table_ddl("CREATE TABLE t (id INT, b INT, PRIMARY KEY (id));")
+    by_b = parse_table_ddl("CREATE TABLE t (id INT, b INT, PRIMARY KEY (b));")
+    spread = parse_table_ddl('CREATE TABLE t (\n    id INT,\n    b INT,\n    primary key ( "id" )\n);')
+    without = parse_table_ddl("CREATE TABLE t (id INT, b INT);")
+    assert by_id.fingerprint != by_b.fingerprint
+    assert by_id.fingerprint != without.fingerprint
+    assert by_id.fingerprint == spread.fingerprint
+
+
+def test_flattened_comment_is_detected():
+    assert has_flattened_comment("CREATE TABLE t ( id INT, -- note name TEXT );")
+    assert not has_flattened_comment("CREATE TABLE t (\n    id INT, -- note\n    name TEXT\n);")
+    assert not has_flattened_comment("CREATE TABLE t ( id INT DEFAULT '--', name TEXT );")
@@ -0,0 +1,81 @@
+import asyncio
+import json
+from http import HTTPStatus
+
+import pytest
+
+from validation_service import ServiceError, ValidationService, _handle_request, _read_request
+
+SOURCE = "CREATE TABLE employee (id INT, name TEXT);\nCREATE TABLE legacy (id INT);"
+DESTINATION = "CREATE TABLE employee (id INT, name VARCHAR(20));\nCREATE TABLE contractor (id INT);"
+
+
+@pytest.fixture
+def service():
+    service = ValidationService({"service_page_size": 1})
+    for name, ddl in (("src", SOURCE), ("dst", DESTINATION)):
+        _request(service, "PUT", f"/schemas/{name}", ddl.encode("utf-8"))
+    return service
+
+
+def _request(service, method, target, body=b""):
+    status, response = _handle_request(service, method, target, body)
+    return status, json.loads(response)
+
+
+def test_health_and_schema_listing(service):
+    assert _request(service, "GET", "/health") == (HTTPStatus.OK, {"status": "ok", "schemas": 2})
+    status, schemas = _request(service, "GET", "/schemas")
+    assert status == HTTPStatus.OK
+    assert {name: info["tables"] for name, info in schemas.items()} == {"dst": 2, "src": 2}
+
+
+def test_compare_reuses_the_report_of_unchanged_schemas(service):
+    status, report = _request(service, "GET", "/compare?source=src&destination=dst")
+    assert status == HTTPStatus.OK
+    assert report["meta"]["statistics"]["different_tables"] == 1
+    assert service.compare("src", "dst") is service.compare("src", "dst")
+
+    _request(service, "PUT", "/schemas/dst", SOURCE.encode("utf-8"))
+    status, report = _request(service, "GET", "/compare?source=src&destination=dst")
+    assert report["success"] and report["results"] == []
+
+
+def test_report_pages(service):
+    status, page = _request(service, "GET", "/report?source=src&destination=dst&page=2")
+    assert status == HTTPStatus.OK
+    assert (page["page"], page["pages"], page["page_size"], len(page["results"])) == (2, 3, 1, 1)
+    assert _request(service, "GET", "/report?source=src&destination=dst&page=0")[0] == HTTPStatus.BAD_REQUEST
+
+
+def test_errors(service):
+    assert _request(service, "GET", "/compare?source=src")[0] == HTTPStatus.BAD_REQUEST
+    assert _request(service, "GET", "/compare?source=src&destination=nope")[0] == HTTPStatus.NOT_FOUND
+    assert _request(service, "PUT", "/schemas/empty", b"SELECT 1;")[0] == HTTPStatus.BAD_REQUEST
+    assert _request(service, "POST", "/ask", b"not json")[0] == HTTPStatus.BAD_REQUEST
+    assert _request(service, "GET", "/nowhere")[0] == HTTPStatus.NOT_FOUND
+
+
+def test_delete_schema_drops_its_reports(service):
+    service.compare("src", "dst")
+    assert _request(service, "DELETE", "/schemas/dst") == (HTTPStatus.OK, {"schema": "dst", "deleted": True})
+    assert service.reports == {}
+    assert _request(service, "DELETE", "/schemas/dst")[0] == HTTPStatus.NOT_FOUND
+
+
+def _read(data):
+    async def read():
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await _read_request(reader)
+    return asyncio.run(read())
+
+
+def test_read_request():
+    method, target, headers, body = _read(
+        b"put /schemas/s HTTP/1.1\r\nHost: x\r\nContent-Length: 5\r\n\r\nhello")
+    assert (method, target, headers["host"], body) == ("PUT", "/schemas/s", "x", b"hello")
+    assert _read(b"") is None
+    with pytest.raises(ServiceError):
+        _read(b"GET\r\n\r\n")
@@ -1,9 +1,91 @@
-def chunk_tables(schema_list):
+import hashlib
+
+from parsers.schema_ir import parse_table_ddl
+
+
+def content_fingerprint(content):
+    """
+    Compute a stable fingerprint for a chunk's content.
+
+    Args:
+        content: Text content of the chunk
+
+    Returns:
+        str: Hex digest identifying the content
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _render_part(full_name, column_lines):
+    columns = ",\n    ".join(column_lines)
+    return f"CREATE TABLE {full_name} (\n    {columns}\n);"
+
+
+def split_columns(table, chunk_size, chunk_overlap=0):
+    """
+    Split a table into CREATE TABLE statements over overlapping column groups
+
+    Columns are added to a group until the rendered statement would exceed
+    ``chunk_size`` characters; a single column longer than that gets a group of
+    its own. Each new group starts with the trailing columns of the previous
+    one, up to ``chunk_overlap`` characters, so a column's neighbours are
+    embedded along with it. Table constraints go into the last group.
+
+    Args:
+        table (Table): Parsed table
+        chunk_size: Character budget of one part
+        chunk_overlap: Characters of columns repeated from the previous part
+
+    Returns:
+        list: DDL text of every part
+    """
+    lines = [f"{column.name} {column.definition}".rstrip() for column in table.columns]
+    lines += list(table.constraints)
+    header = len(_render_part(table.full_name, []))
+
+    parts = []
+    group = []
+    size = header
+    new_lines = 0  # Lines in the current group that are not overlap
+    for line in lines:
+        added = len(line) + (6 if group else 0)  # ",\n    " separator
+        if new_lines and size + added > chunk_size:
+            parts.append(_render_part(table.full_name, group))
+
+            # Carry the trailing columns over, within the overlap budget
+            overlap = []
+            overlap_size = 0
+            for previous in reversed(group):
+                overlap_size += len(previous) + 6
+                if overlap_size > chunk_overlap:
+                    break
+                overlap.insert(0, previous)
+            group = overlap
+            size = header + sum(len(previous) + 6 for previous in group)
+            new_lines = 0
+            added = len(line) + (6 if group else 0)
+
+        group.append(line)
+        size += added
+        new_lines += 1
+
+    if new_lines or not parts:
+        parts.append(_render_part(table.full_name, group))
+    return parts
+
+
+def chunk_tables(schema_list, chunk_size=None, chunk_overlap=0):
     """
     Process schema DDL statements into chunks with metadata.
 
+    A table whose DDL fits in ``chunk_size`` characters is one chunk. Larger
+    tables are split into overlapping column groups (see split_columns); their
+    chunks carry ``part`` and ``parts`` in the metadata.
+
     Args:
         schema_list: List of dictionaries containing schema information
+        chunk_size: Character budget of one chunk (None keeps whole tables)
+        chunk_overlap: Characters of columns repeated between parts of a table
 
     Returns:
         list: List of dictionaries with content and metadata
@@ -11,13 +93,31 @@ def chunk_tables(schema_list):
     chunks = []
 
     for schema in schema_list:
-        chunks.append({
-            "content": schema["ddl"],
-            "metadata": {
-                "schema": schema["schema_name"],
-                "table": schema["table_name"]
-            }
-        })
+        ddl = schema["ddl"]
+        table = parse_table_ddl(ddl) if chunk_size and len(ddl) > chunk_size else None
+        if table is None or not table.columns:
+            chunks.append({
+                "content": ddl,
+                "metadata": {
+                    "schema": schema["schema_name"],
+                    "table": schema["table_name"],
+                    "content_hash": content_fingerprint(ddl)
+                }
+            })
+            continue
+
+        parts = split_columns(table, chunk_size, chunk_overlap or 0)
+        for number, content in enumerate(parts, start=1):
+            chunks.append({
+                "content": content,
+                "metadata": {
+                    "schema": schema["schema_name"],
+                    "table": schema["table_name"],
+                    "part": number,
+                    "parts": len(parts),
+                    "content_hash": content_fingerprint(content)
+                }
+            })
 
     # Count chunks per schema
     schema_counts = {}
@@ -29,4 +129,44 @@ def chunk_tables(schema_list):
     for schema, count in schema_counts.items():
         print(f"  {schema}: {count} chunks")
 
-    return chunks
\ No newline at end of file
+    return chunks
+
+
+def column_text(table_name, column):
+    """Text embedded for one column: its qualified name and definition"""
+    return f"{table_name}.{column.name} {column.definition}".rstrip()
+
+
+def column_records(schema_list):
+    """
+    Build one record per column for the column-level vector collection
+
+    Args:
+        schema_list: List of dictionaries containing schema information
+
+    Returns:
+        list: Dictionaries with content and metadata (schema, table, column, type)
+    """
+    records = []
+    for schema in schema_list:
+        table = parse_table_ddl(schema["ddl"])
+        if table is None:
+            continue
+        seen = set()
+        for column in table.columns:
+            # A repeated column name is stored once
+            if column.name in seen:
+                continue
+            seen.add(column.name)
+            content = column_text(schema["table_name"], column)
+            records.append({
+                "content": content,
+                "metadata": {
+                    "schema": schema["schema_name"],
+                    "table": schema["table_name"],
+                    "column": column.name,
+                    "type": column.type,
+                    "content_hash": content_fingerprint(content)
+                }
+            })
+    return records
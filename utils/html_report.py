@@ -0,0 +1,411 @@
+import glob
+import os
+import re
+from html import escape
+
+from validators.diff_records import (MATCH, MISSING_IN_DESTINATION, MISSING_IN_SOURCE, describe_column,
+                                     describe_status, iter_column_diffs)
+
+STYLE = """  <style>
+    body {
+      font-family: Arial, sans-serif;
+      background-color: #fafafa;
+      padding: 20px;
+    }
+    h1 {
+      font-size: 24px;
+    }
+    .meta-info {
+      background-color: #f0f0f0;
+      padding: 15px;
+      border-radius: 5px;
+      margin-bottom: 20px;
+    }
+    .meta-row {
+      margin-bottom: 5px;
+    }
+    .meta-label {
+      font-weight: bold;
+    }
+    table {
+      width: 100%;
+      border-collapse: collapse;
+      margin-top: 20px;
+    }
+    th {
+      background-color: #333;
+      color: white;
+      padding: 10px;
+      text-align: left;
+    }
+    td {
+      padding: 10px;
+      vertical-align: top;
+      background-color: #fff;
+    }
+    .table-row td {
+      background-color: #fff7db;
+    }
+    .failed td {
+      background-color: #f8d7da;
+    }
+    .success-details {
+      color: green;
+    }
+    .error-details {
+      color: red;
+    }
+    .details-title {
+      font-weight: bold;
+      margin-top: 8px;
+    }
+    .status-success {
+      color: green;
+    }
+    .status-failed {
+      color: red;
+    }
+    .statistics {
+      margin: 20px 0;
+      padding: 10px;
+      background-color: #e9f7ef;
+      border-radius: 5px;
+    }
+    .pagination {
+      margin: 20px 0;
+    }
+  </style>
+"""
+
+RESULTS_TABLE_START = """
+  <table border="1">
+    <thead>
+      <tr>
+        <th>Table</th>
+        <th>Status</th>
+        <th>Details</th>
+      </tr>
+    </thead>
+    <tbody>
+"""
+
+TABLE_END = """
+    </tbody>
+  </table>
+"""
+
+PAGE_END = """
+</body>
+</html>"""
+
+
+def _page_start(title):
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+  <meta charset="UTF-8">
+  <title>{escape(title)}</title>
+{STYLE}</head>
+<body>
+
+  <h1>{escape(title)}</h1>
+"""
+
+
+def _meta_block(meta_data):
+    return f"""
+  <div class="meta-info">
+    <div class="meta-row"><span class="meta-label">Great Expectations Version:</span> {escape(str(meta_data["great_expectations_version"]))}</div>
+    <div class="meta-row"><span class="meta-label">Source Schema:</span> {escape(meta_data["source_schema"])}</div>
+    <div class="meta-row"><span class="meta-label">Destination Schema:</span> {escape(meta_data["destination_schema"])}</div>
+    <div class="meta-row"><span class="meta-label">Timestamp:</span> {escape(meta_data["timestamp"])}</div>
+  </div>
+"""
+
+
+def _statistics_block(meta_data, statistics, status_counts=None):
+    source_schema = escape(meta_data["source_schema"])
+    destination_schema = escape(meta_data["destination_schema"])
+    rows = [
+        ("Tables Compared", statistics.get("tables_compared", "n/a")),
+        ("Identical Tables", statistics.get("identical_tables", 0)),
+        ("Different Tables", statistics.get("different_tables", 0)),
+        (f"Missing in {source_schema}", statistics.get("missing_in_source", 0)),
+        (f"Missing in {destination_schema}", statistics.get("missing_in_destination", 0)),
+    ]
+    if status_counts is not None:
+        rows += [(f"Listed as {label}", count) for label, count in status_counts.items()]
+
+    lines = "\n".join(
+        f'    <div class="meta-row"><span class="meta-label">{label}:</span> {value}</div>'
+        for label, value in rows
+    )
+    return f"""
+  <div class="statistics">
+{lines}
+  </div>
+"""
+
+
+def _row_status(result):
+    """Classify a result for the per-status summary counts"""
+    status = result.get("meta", {}).get("status")
+    if status in (MISSING_IN_SOURCE, MISSING_IN_DESTINATION):
+        return "missing"
+    return "passed" if result.get("success", False) else "different"
+
+
+def render_result_row(result, source="source", destination="destination"):
+    """
+    Render the table row(s) of one comparison result
+
+    Args:
+        result: One entry of the report's results
+        source: Source schema name, for the "missing in" messages
+        destination: Destination schema name
+
+    Returns:
+        str: HTML for the row
+    """
+    table_name = escape(result["kwargs"]["table"])
+    meta = result.get("meta", {})
+    status = meta.get("status")
+    success = result.get("success", False)
+
+    # Determine the status display
+    status_class = "status-success" if success else "status-failed"
+    status_text = "✅ Success" if success else "❌ Failed"
+
+    # Split the column diff records into matches and differences
+    success_details = []
+    error_details = []
+
+    for record in iter_column_diffs(result):
+        text = escape(describe_column(record, source, destination), quote=False)
+        if record[0] == MATCH:
+            success_details.append(f"✅ {text}")
+        else:
+            error_details.append(f"❌ {text}")
+
+    # Matching columns are only counted unless the report is verbose
+    matching_columns = meta.get("matching_columns", 0)
+    if matching_columns and not success_details:
+        success_details.append(f"✅ {matching_columns} matching columns")
+
+    # If we have both success and error details
+    if success_details and error_details:
+        return f"""
+      <tr class="table-row">
+        <td rowspan="2">{table_name}</td>
+        <td rowspan="2" class="{status_class}">{status_text}</td>
+        <td class="success-details">
+          <div class="details-title">✅ Success:</div>
+          {'<br>'.join(success_details)}
+        </td>
+      </tr>
+      <tr class="failed">
+        <td class="error-details">
+          <div class="details-title">❌ Missing:</div>
+          {'<br>'.join(error_details)}
+        </td>
+      </tr>
+"""
+    # If we only have success details
+    if success_details:
+        return f"""
+      <tr class="table-row">
+        <td>{table_name}</td>
+        <td class="{status_class}">{status_text}</td>
+        <td class="success-details">
+          <div class="details-title">✅ Success:</div>
+          {'<br>'.join(success_details)}
+        </td>
+      </tr>
+"""
+    # If we only have error details
+    if error_details:
+        return f"""
+      <tr class="failed">
+        <td>{table_name}</td>
+        <td class="{status_class}">{status_text}</td>
+        <td class="error-details">
+          <div class="details-title">❌ Missing:</div>
+          {'<br>'.join(error_details)}
+        </td>
+      </tr>
+"""
+    # If we have no details (table missing case)
+    missing_text = f"❌ {escape(describe_status(status, source, destination))}"
+    return f"""
+      <tr class="failed">
+        <td>{table_name}</td>
+        <td class="{status_class}">{status_text}</td>
+        <td class="error-details">{missing_text}</td>
+      </tr>
+"""
+
+
+def _write_rename_suggestions(out, rename_suggestions):
+    if not (rename_suggestions.get("tables") or rename_suggestions.get("columns")):
+        return
+
+    out.write("""
+  <h2>Rename Suggestions</h2>
+  <table border="1">
+    <thead>
+      <tr>
+        <th>Source</th>
+        <th>Destination</th>
+        <th>Score</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+    for suggestion in rename_suggestions.get("tables", []):
+        out.write(f"""
+      <tr class="table-row">
+        <td>{escape(suggestion["source_table"])}</td>
+        <td>{escape(suggestion["destination_table"])}</td>
+        <td>{suggestion["score"]}</td>
+      </tr>
+""")
+        for column in suggestion.get("columns", []):
+            out.write(f"""
+      <tr>
+        <td>{escape(suggestion["source_table"])}.{escape(column["source_column"])}</td>
+        <td>{escape(suggestion["destination_table"])}.{escape(column["destination_column"])}</td>
+        <td>{column["score"]}</td>
+      </tr>
+""")
+    for column in rename_suggestions.get("columns", []):
+        out.write(f"""
+      <tr>
+        <td>{escape(column["table"])}.{escape(column["source_column"])}</td>
+        <td>{escape(column["table"])}.{escape(column["destination_column"])}</td>
+        <td>{column["score"]}</td>
+      </tr>
+""")
+    out.write(TABLE_END)
+
+
+def _page_path(output_path, page):
+    stem, ext = os.path.splitext(output_path)
+    return f"{stem}_page_{page}{ext or '.html'}"
+
+
+def _remove_stale_pages(output_path, page_count):
+    """Delete detail pages of an earlier, longer report beyond the first page_count"""
+    stem, ext = os.path.splitext(output_path)
+    ext = ext or ".html"
+    pattern = re.compile(re.escape(os.path.basename(stem)) + r"_page_(\d+)" + re.escape(ext) + "$")
+    for path in glob.glob(f"{glob.escape(stem)}_page_*{glob.escape(ext)}"):
+        match = pattern.match(os.path.basename(path))
+        if match and int(match.group(1)) > page_count:
+            os.remove(path)
+
+
+def generate_html_report(report_data, output_path, page_size=None):
+    """
+    Generate an HTML report based on the JSON comparison report.
+
+    Rows are written to the file as they are rendered, so ``report_data["results"]``
+    may be any iterable (for example a lazy report reader) and memory use does
+    not depend on the size of the report.
+
+    With ``page_size`` set, results are sharded into detail pages of at most
+    ``page_size`` tables (``<name>_page_<n>.html``) and ``output_path`` becomes
+    an index page with per-status summary counts and links to every page.
+    Detail pages left over from an earlier, longer report are deleted.
+
+    Args:
+        report_data: Dict with meta and results
+        output_path: Path of the HTML file (the index page in paginated mode)
+        page_size: Tables per detail page; None or 0 writes a single page
+
+    Returns:
+        list: Paths of every HTML file written
+    """
+    meta_data = report_data["meta"]
+    source = meta_data["source_schema"]
+    destination = meta_data["destination_schema"]
+    statistics = dict(meta_data.get("statistics", {}))
+    results = report_data["results"]
+    if "tables_compared" not in statistics and hasattr(results, "__len__"):
+        statistics["tables_compared"] = len(results)
+
+    # Create directory if it doesn't exist
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if not page_size:
+        with open(output_path, "w") as out:
+            out.write(_page_start("Schema Validation Report"))
+            out.write(_meta_block(meta_data))
+            out.write(_statistics_block(meta_data, statistics))
+            out.write(RESULTS_TABLE_START)
+            for result in results:
+                out.write(render_result_row(result, source, destination))
+            out.write(TABLE_END)
+            _write_rename_suggestions(out, meta_data.get("rename_suggestions", {}))
+            out.write(PAGE_END)
+        _remove_stale_pages(output_path, 0)
+        return [output_path]
+
+    status_counts = {"passed": 0, "different": 0, "missing": 0}
+    pages = []
+    out = None
+    rows_on_page = 0
+
+    try:
+        for result in results:
+            if out is None or rows_on_page >= page_size:
+                if out is not None:
+                    out.write(TABLE_END + PAGE_END)
+                    out.close()
+                page_path = _page_path(output_path, len(pages) + 1)
+                pages.append((page_path, result["kwargs"]["table"]))
+                out = open(page_path, "w")
+                out.write(_page_start(f"Schema Validation Report - Page {len(pages)}"))
+                out.write(f'\n  <div class="pagination"><a href="{escape(os.path.basename(output_path))}">Index</a></div>\n')
+                out.write(RESULTS_TABLE_START)
+                rows_on_page = 0
+
+            out.write(render_result_row(result, source, destination))
+            status_counts[_row_status(result)] += 1
+            rows_on_page += 1
+
+        if out is not None:
+            out.write(TABLE_END + PAGE_END)
+    finally:
+        if out is not None:
+            out.close()
+
+    # The index is written last, once the per-status counts are known
+    with open(output_path, "w") as index:
+        index.write(_page_start("Schema Validation Report"))
+        index.write(_meta_block(meta_data))
+        index.write(_statistics_block(meta_data, statistics, status_counts))
+        index.write("""
+  <table border="1">
+    <thead>
+      <tr>
+        <th>Page</th>
+        <th>First Table</th>
+      </tr>
+    </thead>
+    <tbody>
+""")
+        for number, (page_path, first_table) in enumerate(pages, start=1):
+            index.write(f"""
+      <tr>
+        <td><a href="{escape(os.path.basename(page_path))}">Page {number}</a></td>
+        <td>{escape(first_table)}</td>
+      </tr>
+""")
+        index.write(TABLE_END)
+        _write_rename_suggestions(index, meta_data.get("rename_suggestions", {}))
+        index.write(PAGE_END)
+
+    _remove_stale_pages(output_path, len(pages))
+    return [output_path] + [page_path for page_path, _ in pages]
@@ -0,0 +1,213 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.metrics import count, span
+from utils.qa_facts import report_fingerprint
+from utils.sqlite_cache import SqliteCache
+from validators.diff_records import DEFINITION_MISMATCH, MATCH, iter_column_diffs
+
+MAP_TEMPLATE = """
+You are a database expert. These are the differing tables from a comparison of
+schema {source} (source) with schema {destination} (destination):
+
+{differences}
+
+Summarize the differences in these tables in a few short bullet points.
+"""
+
+COMBINE_TEMPLATE = """
+You are a database expert. Merge these partial summaries of schema differences
+into one shorter list of bullet points, keeping every distinct issue:
+
+{partials}
+"""
+
+REDUCE_TEMPLATE = """
+You are a database expert. Analyze this schema comparison and provide a concise summary.
+
+Overall statistics:
+{statistics}
+
+Partial summaries of the differing tables:
+{partials}
+
+Provide a clear summary of:
+1. Major differences between the schemas
+2. Key similarities
+3. Potential issues or inconsistencies
+4. Recommendations for schema alignment
+"""
+
+
+def summary_version(model_name, token_budget):
+    """
+    Identity of the summaries produced by a model, the prompts and the token budget
+
+    Stored summaries are only reused under the same version, so changing the
+    model or editing a prompt produces a new summary.
+
+    Returns:
+        str: Hex digest
+    """
+    settings = [model_name, int(token_budget), MAP_TEMPLATE, COMBINE_TEMPLATE, REDUCE_TEMPLATE]
+    return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token)"""
+    return len(text) // 4 + 1
+
+
+def count_llm_tokens(prompt_text, response):
+    """Add one LLM call and its estimated prompt and completion tokens to the run metrics"""
+    count("llm_calls")
+    count("llm_prompt_tokens", estimate_tokens(prompt_text))
+    count("llm_completion_tokens", estimate_tokens(response))
+
+
+def _compact_result(result):
+    """Only the fields of a differing table the LLM needs"""
+    record = {"table": result["kwargs"]["table"], "status": result.get("meta", {}).get("status")}
+    differences = []
+    for kind, column, left_type, right_type, left_definition, right_definition in iter_column_diffs(result):
+        if kind == MATCH:
+            continue
+        difference = {"kind": kind, "column": column, "source_type": left_type, "destination_type": right_type}
+        if kind == DEFINITION_MISMATCH:
+            difference["source_definition"] = left_definition
+            difference["destination_definition"] = right_definition
+        differences.append(difference)
+    if differences:
+        record["differences"] = differences
+    return json.dumps(record, ensure_ascii=False)
+
+
+def group_differences(results, token_budget):
+    """
+    Pack the differing tables of a report into token-budgeted groups
+
+    Matching tables are left out entirely.
+
+    Args:
+        results: Iterable of table results
+        token_budget: Approximate token budget per group
+
+    Returns:
+        list: Groups, each a list of compact JSON records
+    """
+    groups = []
+    current = []
+    current_tokens = 0
+
+    for result in results:
+        if result.get("success", False):
+            continue
+        record = _compact_result(result)
+        tokens = estimate_tokens(record)
+        if current and current_tokens + tokens > token_budget:
+            groups.append(current)
+            current = []
+            current_tokens = 0
+        current.append(record)
+        current_tokens += tokens
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+class MapReduceSummarizer:
+    """
+    Summarize a comparison report with bounded-parallel map and a final reduce
+
+    Differing tables are split into groups of at most ``token_budget`` tokens
+    and summarized concurrently (``max_workers`` at a time); the partial
+    summaries are then reduced, recursively if they exceed the budget
+    themselves. Finished summaries are cached by report fingerprint and
+    summary_version.
+    """
+
+    def __init__(self, llm, token_budget=3000, max_workers=4, cache_path=None, model_name=None):
+        self.llm = llm
+        self.token_budget = max(200, int(token_budget))
+        self.max_workers = max(1, int(max_workers))
+        self.cache = SqliteCache(cache_path, table="summaries") if cache_path else None
+        self.version = summary_version(model_name or getattr(llm, "model", type(llm).__name__), self.token_budget)
+
+    def _run(self, template, **kwargs):
+        from langchain.prompts import PromptTemplate
+        from langchain.chains import LLMChain
+
+        prompt = PromptTemplate(template=template, input_variables=list(kwargs))
+        with span("llm"):
+            response = LLMChain(llm=self.llm, prompt=prompt).run(**kwargs)
+        count_llm_tokens(template.format(**kwargs), response)
+        return response
+
+    def _map_parallel(self, function, groups):
+        """Apply function to every group with at most max_workers LLM calls in flight"""
+        if len(groups) == 1 or self.max_workers == 1:
+            return [function(group) for group in groups]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as executor:
+            return list(executor.map(function, groups))
+
+    def _map(self, groups, source, destination):
+        return self._map_parallel(
+            lambda group: self._run(MAP_TEMPLATE, source=source, destination=destination,
+                                    differences="\n".join(group)),
+            groups
+        )
+
+    def _reduce(self, partials, statistics):
+        # Partials that do not fit one prompt are first condensed in groups
+        while len(partials) > 1 and estimate_tokens("\n\n".join(partials)) > self.token_budget:
+            groups = []
+            current = []
+            current_tokens = 0
+            for partial in partials:
+                tokens = estimate_tokens(partial)
+                if current and current_tokens + tokens > self.token_budget:
+                    groups.append(current)
+                    current = []
+                    current_tokens = 0
+                current.append(partial)
+                current_tokens += tokens
+            groups.append(current)
+            if len(groups) == len(partials):
+                break
+            partials = self._map_parallel(
+                lambda group: self._run(COMBINE_TEMPLATE, partials="\n\n".join(group)), groups)
+
+        return self._run(REDUCE_TEMPLATE, statistics=statistics, partials="\n\n".join(partials) or "No differing tables.")
+
+    def summarize(self, report):
+        """
+        Summarize a comparison report
+
+        Args:
+            report: Dict with meta and results (results may be a lazy iterator)
+
+        Returns:
+            str: Natural language summary
+        """
+        meta = report["meta"]
+        fingerprint = f"{report_fingerprint(meta)}:{self.version}"
+        if self.cache is not None:
+            cached = self.cache.get(fingerprint)
+            if cached is not None:
+                print("✅ Summary loaded from cache")
+                return cached
+
+        source = meta["source_schema"]
+        destination = meta["destination_schema"]
+        statistics = json.dumps(meta.get("statistics", {}), indent=2)
+
+        groups = group_differences(report["results"], self.token_budget)
+        print(f"🧠 Summarizing {sum(len(group) for group in groups)} differing tables in {len(groups)} groups")
+        partials = self._map(groups, source, destination) if groups else []
+        summary = self._reduce(partials, statistics)
+
+        if self.cache is not None:
+            self.cache.set(fingerprint, summary)
+        return summary
@@ -0,0 +1,194 @@
+import contextlib
+import datetime
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource  # Peak RSS; not available on Windows
+except ImportError:
+    resource = None
+
+METRICS_DIR = "validation_reports/metrics"
+
+# Active recorder; None means metrics are disabled and every call is a no-op
+_recorder = None
+
+# Shared, reusable context manager returned by span() when metrics are disabled
+_NO_SPAN = contextlib.nullcontext()
+
+
+def _peak_rss_bytes():
+    """Process peak resident memory so far (a cheap high-water mark)"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class _Span:
+    """Times one stage and records it on exit"""
+
+    __slots__ = ("recorder", "name", "start", "profiler")
+
+    def __init__(self, recorder, name):
+        self.recorder = recorder
+        self.name = name
+        self.profiler = None
+
+    def __enter__(self):
+        if self.name == self.recorder.profile_stage and not self.recorder.profiled:
+            import cProfile
+
+            self.recorder.profiled = True
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        seconds = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.recorder.save_profile(self.profiler)
+        self.recorder.record_span(self.name, seconds)
+        return False
+
+
+class MetricsRecorder:
+    """
+    Collects timing spans, counters and peak-memory samples for one run
+
+    Spans with the same name are aggregated (calls, total and max seconds, peak
+    RSS at their end). When ``profile_stage`` names a span, its first occurrence
+    runs under cProfile and the stats are dumped next to the metrics file.
+    """
+
+    def __init__(self, run_name, output_dir=METRICS_DIR, profile_stage=None):
+        self.run_name = run_name
+        self.output_dir = output_dir
+        self.profile_stage = profile_stage
+        self.profile_path = None
+        self.profiled = False
+        self.started = datetime.datetime.now()
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def record_span(self, name, seconds):
+        peak = _peak_rss_bytes()
+        with self._lock:
+            span = self.spans.get(name)
+            if span is None:
+                span = self.spans[name] = {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "peak_rss_bytes": None}
+            span["calls"] += 1
+            span["seconds"] += seconds
+            span["max_seconds"] = max(span["max_seconds"], seconds)
+            if peak is not None:
+                span["peak_rss_bytes"] = max(span["peak_rss_bytes"] or 0, peak)
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def _file_stem(self):
+        return os.path.join(self.output_dir, f"{self.run_name}_{self.started.strftime('%Y%m%d_%H%M%S')}")
+
+    def save_profile(self, profiler):
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.profile_path = f"{self._file_stem()}_{self.profile_stage}.prof"
+        profiler.dump_stats(self.profile_path)
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "run": self.run_name,
+                "started": self.started.isoformat(),
+                "seconds": round(time.perf_counter() - self._start, 6),
+                "peak_rss_bytes": _peak_rss_bytes(),
+                "spans": {name: dict(span, seconds=round(span["seconds"], 6), max_seconds=round(span["max_seconds"], 6))
+                          for name, span in self.spans.items()},
+                "counters": dict(self.counters),
+                "profile": self.profile_path
+            }
+
+    def write(self):
+        """
+        Write the metrics file of this run
+
+        Returns:
+            str: Path of the JSON metrics file
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = f"{self._file_stem()}.json"
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        return path
+
+
+def span(name):
+    """
+    Time a pipeline stage
+
+    Usage:
+        with span("compare"):
+            ...
+
+    Returns a shared no-op context manager while metrics are disabled.
+    """
+    recorder = _recorder
+    if recorder is None:
+        return _NO_SPAN
+    return _Span(recorder, name)
+
+
+def count(name, value=1):
+    """Add value to a run counter (no-op while metrics are disabled)"""
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, value)
+
+
+@contextlib.contextmanager
+def metrics_run(config, run_name):
+    """
+    Collect metrics for one run when ``metrics_enabled`` is set in config
+
+    The metrics file is written to ``metrics_dir`` when the run ends, even if
+    it fails. ``metrics_profile_stage`` names a span to run under cProfile.
+
+    Args:
+        config: Configuration dictionary
+        run_name: Name of the run (ingest, compare, report, ask)
+
+    Yields:
+        MetricsRecorder or None when metrics are disabled
+    """
+    global _recorder
+
+    if not config.get("metrics_enabled", False) or _recorder is not None:
+        # Disabled, or already inside a run (nested runs share the outer one)
+        yield _recorder
+        return
+
+    recorder = MetricsRecorder(
+        run_name,
+        output_dir=config.get("metrics_dir", METRICS_DIR),
+        profile_stage=config.get("metrics_profile_stage")
+    )
+    _recorder = recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = None
+        path = recorder.write()
+        print(f"📈 Metrics saved to {path}")
+        if recorder.profile_path:
+            print(f"📈 Profile of stage '{recorder.profile_stage}' saved to {recorder.profile_path}")
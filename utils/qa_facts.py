@@ -0,0 +1,228 @@
+import hashlib
+import json
+import math
+import re
+from collections import Counter, defaultdict
+
+from utils.sqlite_cache import SqliteCache
+from validators.diff_records import MATCH, MISSING_IN_DESTINATION, MISSING_IN_SOURCE, describe_column, iter_column_diffs
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+# Words that carry no signal for matching questions to facts
+_STOPWORDS = frozenset(
+    "a an and are as at be by do does for from has have how i in is it its me of on or "
+    "show tell that the there these this to was what which with".split()
+)
+
+
+def _tokens(text):
+    """Lowercase word tokens; snake_case names also yield their parts"""
+    words = []
+    for word in _WORD.findall(text.lower().replace("_", " _ ")):
+        if word not in _STOPWORDS:
+            words.append(word)
+    for name in re.findall(r"[a-z0-9]+(?:_[a-z0-9]+)+", text.lower()):
+        words.append(name)
+    return words
+
+
+def normalize_question(question):
+    """Canonical form of a question for the answer cache"""
+    return " ".join(question.lower().split()).rstrip("?!. ")
+
+
+def report_fingerprint(meta):
+    """
+    Fingerprint of a comparison report's content
+
+    Args:
+        meta: Report meta (schema names and fingerprints)
+
+    Returns:
+        str: Hex digest that changes whenever the compared schemas change
+    """
+    key = {
+        "source_schema": meta.get("source_schema"),
+        "destination_schema": meta.get("destination_schema"),
+        "source_fingerprint": meta.get("source_fingerprint"),
+        "destination_fingerprint": meta.get("destination_fingerprint"),
+        "statistics": meta.get("statistics"),
+        "rename_suggestions": meta.get("rename_suggestions")
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def answer_version(model_name, prompt_template, top_k):
+    """
+    Identity of the answers produced by a model, a prompt and a fact count
+
+    Cached answers are only reused under the same version, so changing the
+    model, editing the prompt or retrieving more facts produces new answers.
+
+    Returns:
+        str: Hex digest
+    """
+    settings = [model_name, prompt_template, int(top_k)]
+    return hashlib.sha256(json.dumps(settings).encode("utf-8")).hexdigest()
+
+
+def build_facts(meta, results):
+    """
+    Turn a comparison report into short, self-contained fact sentences
+
+    Args:
+        meta: Report meta
+        results: Iterable of table results (may be a lazy reader)
+
+    Returns:
+        list: Fact strings (per table, per column difference, plus summary facts)
+    """
+    source = meta["source_schema"]
+    destination = meta["destination_schema"]
+    facts = []
+    source_count = destination_count = 0
+
+    for table in meta.get("identical_tables", []):
+        facts.append(f"Table '{table}' exists in both {source} and {destination} and is identical.")
+        source_count += 1
+        destination_count += 1
+
+    for result in results:
+        table = result["kwargs"]["table"]
+        status = result.get("meta", {}).get("status")
+
+        if status == MISSING_IN_DESTINATION:
+            facts.append(f"Table '{table}' exists only in {source}; it is missing in {destination}.")
+            source_count += 1
+            continue
+        if status == MISSING_IN_SOURCE:
+            facts.append(f"Table '{table}' exists only in {destination}; it is missing in {source}.")
+            destination_count += 1
+            continue
+
+        source_count += 1
+        destination_count += 1
+        differences = [record for record in iter_column_diffs(result) if record[0] != MATCH]
+        if differences:
+            facts.append(f"Table '{table}' exists in both {source} and {destination} "
+                         f"with {len(differences)} column differences.")
+        else:
+            facts.append(f"Table '{table}' exists in both {source} and {destination} and matches.")
+        for record in differences:
+            facts.append(f"Table '{table}': {describe_column(record, source, destination)}")
+
+    for suggestion in meta.get("rename_suggestions", {}).get("tables", []):
+        facts.append(f"Table '{suggestion['source_table']}' in {source} was probably renamed to "
+                     f"'{suggestion['destination_table']}' in {destination} (score {suggestion['score']}).")
+    for suggestion in meta.get("rename_suggestions", {}).get("columns", []):
+        facts.append(f"Table '{suggestion['table']}': column '{suggestion['source_column']}' in {source} was "
+                     f"probably renamed to '{suggestion['destination_column']}' in {destination} "
+                     f"(score {suggestion['score']}).")
+
+    statistics = meta.get("statistics", {})
+    facts.append(f"Schema {source} has {source_count} tables and schema {destination} has {destination_count} tables.")
+    if statistics:
+        facts.append(
+            f"Comparing {source} with {destination}: {statistics.get('identical_tables', 0)} identical tables, "
+            f"{statistics.get('different_tables', 0)} tables with differences, "
+            f"{statistics.get('missing_in_destination', 0)} tables missing in {destination}, "
+            f"{statistics.get('missing_in_source', 0)} tables missing in {source}."
+        )
+    return facts
+
+
+class FactIndex:
+    """
+    Keyword (BM25) index over report facts, optionally blended with vector similarity
+
+    Built once per report; each question then only pays for a lookup and
+    receives the ``top_k`` most relevant facts.
+    """
+
+    def __init__(self, facts, embedding_function=None):
+        self.facts = list(facts)
+        self.embedding_function = embedding_function
+        self._postings = defaultdict(list)
+        self._lengths = []
+
+        for i, fact in enumerate(self.facts):
+            counts = Counter(_tokens(fact))
+            self._lengths.append(sum(counts.values()))
+            for token, count in counts.items():
+                self._postings[token].append((i, count))
+
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        self._vectors = None
+        if embedding_function is not None and self.facts:
+            import numpy as np  # Installed with chromadb; only needed for vector lookup
+
+            vectors = np.asarray(embedding_function(self.facts), dtype=np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            self._vectors = vectors / np.where(norms == 0, 1.0, norms)
+
+    def _keyword_scores(self, question):
+        scores = defaultdict(float)
+        total = len(self.facts)
+        for token in set(_tokens(question)):
+            postings = self._postings.get(token)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for i, count in postings:
+                length_norm = 1 - 0.75 + 0.75 * self._lengths[i] / (self._average_length or 1.0)
+                scores[i] += idf * count * 2.2 / (count + 1.2 * length_norm)
+        return scores
+
+    def search(self, question, top_k=20):
+        """
+        Return the facts most relevant to a question
+
+        Args:
+            question: User question
+            top_k: Maximum number of facts
+
+        Returns:
+            list: Fact strings, most relevant first (in report order on ties)
+        """
+        scores = self._keyword_scores(question)
+        best = max(scores.values(), default=0.0)
+        combined = {i: score / best for i, score in scores.items()} if best else {}
+
+        if self._vectors is not None:
+            import numpy as np
+
+            query = np.asarray(self.embedding_function([question])[0], dtype=np.float32)
+            query /= (np.linalg.norm(query) or 1.0)
+            similarities = self._vectors @ query
+            # Only the best vector matches are blended in
+            for i in np.argsort(-similarities)[:top_k]:
+                combined[int(i)] = combined.get(int(i), 0.0) + max(float(similarities[i]), 0.0)
+
+        ranked = sorted(combined, key=lambda i: (-combined[i], i))[:top_k]
+        if not ranked:
+            # Nothing matched: fall back to the summary facts at the end
+            ranked = list(range(max(0, len(self.facts) - 2), len(self.facts)))
+        return [self.facts[i] for i in ranked]
+
+
+class AnswerCache:
+    """
+    Persistent cache of Q&A answers
+
+    Keyed by normalized question, report fingerprint and answer_version.
+    """
+
+    def __init__(self, path, version=""):
+        self._store = SqliteCache(path, table="answers")
+        self.version = version
+
+    @staticmethod
+    def make_key(question, fingerprint, version=""):
+        return hashlib.sha256(f"{version}\0{fingerprint}\0{normalize_question(question)}".encode("utf-8")).hexdigest()
+
+    def get(self, question, fingerprint):
+        return self._store.get(self.make_key(question, fingerprint, self.version))
+
+    def set(self, question, fingerprint, answer):
+        self._store.set(self.make_key(question, fingerprint, self.version), answer)
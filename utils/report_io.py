@@ -0,0 +1,160 @@
+import gzip
+import json
+import os
+
+REPORT_BASE_PATH = "validation_reports/validation_reports"
+
+
+def _open_text(path, mode):
+    """Open a report file as text, transparently (de)compressing .gz paths"""
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def report_file_path(config):
+    """
+    Path of the comparison report for the configured format
+
+    Args:
+        config: Configuration dictionary (report_format, report_compress)
+
+    Returns:
+        str: validation_reports/validation_reports.json, .jsonl or .jsonl.gz
+    """
+    if config.get("report_format", "json") == "jsonl":
+        return REPORT_BASE_PATH + (".jsonl.gz" if config.get("report_compress", False) else ".jsonl")
+    return REPORT_BASE_PATH + ".json"
+
+
+class JsonlReportWriter:
+    """
+    Write a comparison report as JSON Lines
+
+    The first line is a header record ``{"meta": ..., "success": ...}``; every
+    following line is one table result. Paths ending in .gz are gzip-compressed.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._file = _open_text(path, "w")
+
+    def write_header(self, meta, success=None):
+        header = {"meta": meta}
+        if success is not None:
+            header["success"] = success
+        self._file.write(json.dumps(header) + "\n")
+
+    def write_result(self, result):
+        self._file.write(json.dumps(result) + "\n")
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def write_report(report, path):
+    """
+    Save a comparison report, as JSON Lines when the path ends in .jsonl(.gz)
+
+    Args:
+        report: Report dict with success, meta and results
+        path: Output path
+    """
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        with JsonlReportWriter(path) as writer:
+            writer.write_header(report["meta"], report.get("success"))
+            for result in report["results"]:
+                writer.write_result(result)
+        return
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with _open_text(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def read_report_header(path):
+    """
+    Read only the header of a report
+
+    Args:
+        path: Report path (.json, .jsonl or .jsonl.gz)
+
+    Returns:
+        dict: meta and, when known, success
+    """
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        with _open_text(path, "r") as f:
+            return json.loads(f.readline())
+
+    with _open_text(path, "r") as f:
+        report = json.load(f)
+    return {"meta": report["meta"], "success": report.get("success")}
+
+
+def iter_report_results(path):
+    """
+    Iterate over the table results of a report one record at a time
+
+    JSON Lines reports are streamed; plain JSON reports are loaded once.
+
+    Args:
+        path: Report path (.json, .jsonl or .jsonl.gz)
+
+    Yields:
+        dict: One table result
+    """
+    if path.endswith((".jsonl", ".jsonl.gz")):
+        with _open_text(path, "r") as f:
+            f.readline()  # Skip the header
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    with _open_text(path, "r") as f:
+        report = json.load(f)
+    yield from report["results"]
+
+
+def open_report(path):
+    """
+    Open a report lazily, in the shape generate_html_report expects
+
+    Args:
+        path: Report path
+
+    Returns:
+        dict: success, meta and a results iterator
+    """
+    header = read_report_header(path)
+    return {"success": header.get("success"), "meta": header["meta"], "results": iter_report_results(path)}
+
+
+def report_passed(path):
+    """
+    CI gate: True when every table result of the report succeeded
+
+    Uses the header's success flag when present and otherwise streams the
+    results, stopping at the first failure.
+
+    Args:
+        path: Report path
+
+    Returns:
+        bool
+    """
+    success = read_report_header(path).get("success")
+    if success is not None:
+        return success
+    return all(result.get("success", False) for result in iter_report_results(path))
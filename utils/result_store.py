@@ -0,0 +1,179 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+RESULT_STORE_PATH = "validation_reports/result_store.sqlite3"
+
+
+def result_key(source_fingerprint, destination_fingerprint, comparator_version, options=None):
+    """
+    Key of a stored comparison
+
+    Args:
+        source_fingerprint: Hex fingerprint of the source schema
+        destination_fingerprint: Hex fingerprint of the destination schema
+        comparator_version: Version of the comparison logic that produced the result
+        options: Settings that change the result or its artifacts
+
+    Returns:
+        str: Hex digest
+    """
+    key = [source_fingerprint, destination_fingerprint, comparator_version, options or {}]
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """
+    Persistent store of comparison reports, their rendered artifacts and summaries
+
+    Entries are keyed by result_key, so a rerun on unchanged schemas can restore
+    every output instead of recomputing it. Entries older than ``max_age_days``
+    (by last use) are dropped, and the least recently used entries are dropped
+    while the store is larger than ``max_bytes``.
+    """
+
+    def __init__(self, path=RESULT_STORE_PATH, max_bytes=512 * 1024 * 1024, max_age_days=30):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, source_fingerprint TEXT NOT NULL, "
+            "destination_fingerprint TEXT NOT NULL, comparator_version TEXT NOT NULL, report TEXT NOT NULL, "
+            "summary TEXT, size INTEGER NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS artifacts (key TEXT NOT NULL, path TEXT NOT NULL, content BLOB NOT NULL, "
+            "PRIMARY KEY (key, path))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(results)")}
+        if "summary_version" not in columns:
+            # Stores created before summaries were versioned; their summaries are never reused
+            self._conn.execute("ALTER TABLE results ADD COLUMN summary_version TEXT")
+        self._conn.commit()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the store from the ``result_store_*`` settings, or return None when disabled"""
+        if not config.get("result_store_enabled", True):
+            return None
+        return cls(
+            config.get("result_store_path", RESULT_STORE_PATH),
+            max_bytes=int(config.get("result_store_max_mb", 512) * 1024 * 1024),
+            max_age_days=config.get("result_store_max_age_days", 30)
+        )
+
+    def get(self, key):
+        """
+        Look up a stored comparison
+
+        Returns:
+            dict: report, summary (or None) and artifacts (path -> bytes), or None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT report, summary FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            artifacts = self._conn.execute("SELECT path, content FROM artifacts WHERE key = ?", (key,)).fetchall()
+            self._conn.execute("UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        return {"report": json.loads(row[0]), "summary": row[1], "artifacts": dict(artifacts)}
+
+    def put(self, key, report, artifacts, comparator_version):
+        """
+        Store a comparison report and its artifacts, replacing any earlier entry
+
+        Args:
+            key: result_key of the comparison
+            report: Report dict
+            artifacts: Dict of file path -> file content (bytes)
+            comparator_version: Version of the comparison logic
+        """
+        report_text = json.dumps(report)
+        size = len(report_text) + sum(len(content) for content in artifacts.values())
+        now = time.time()
+        with self._lock:
+            self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, source_fingerprint, destination_fingerprint, "
+                "comparator_version, report, summary, size, created, accessed) VALUES (?, ?, ?, ?, ?, NULL, ?, ?, ?)",
+                (key, report["meta"]["source_fingerprint"], report["meta"]["destination_fingerprint"],
+                 comparator_version, report_text, size, now, now)
+            )
+            self._conn.executemany(
+                "INSERT INTO artifacts (key, path, content) VALUES (?, ?, ?)",
+                [(key, path, content) for path, content in artifacts.items()]
+            )
+            self._conn.commit()
+        self.evict()
+
+    def get_summary(self, key, version):
+        """Return the summary stored with a comparison, or None when there is none of this version"""
+        with self._lock:
+            row = self._conn.execute("SELECT summary FROM results WHERE key = ? AND summary_version = ?",
+                                     (key, version)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_summary(self, key, summary, version):
+        """
+        Attach the LLM summary to a stored comparison, replacing a summary of another version
+
+        Args:
+            key: result_key of the comparison
+            summary: Summary text
+            version: Identity of the summarizer settings (see utils.llm_summarizer.summary_version)
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE results SET size = size - COALESCE(LENGTH(summary), 0) + ?, summary = ?, "
+                "summary_version = ? WHERE key = ?",
+                (len(summary), summary, version, key)
+            )
+            self._conn.commit()
+
+    def evict(self):
+        """
+        Drop expired entries, then the least recently used ones while over the size limit
+
+        Returns:
+            int: Number of entries removed
+        """
+        removed = set()
+        with self._lock:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed.update(row[0] for row in self._conn.execute(
+                    "SELECT key FROM results WHERE accessed < ?", (cutoff,)))
+
+            if self.max_bytes:
+                total = 0
+                for key, size in self._conn.execute("SELECT key, size FROM results ORDER BY accessed DESC"):
+                    if key in removed:
+                        continue
+                    total += size
+                    if total > self.max_bytes:
+                        removed.add(key)
+
+            for key in removed:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            self._conn.commit()
+        return len(removed)
+
+    def stats(self):
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        return {"entries": entries, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -1,6 +1,203 @@
 # utils/schema_retriever.py
+import threading
+
 from chromadb import PersistentClient
-from langchain_ollama import OllamaEmbeddings
+from database.chroma_store import LangchainEmbeddingFunction
+
+# Chroma rejects very large requests, so long query lists are sent in slices
+QUERY_BATCH_SIZE = 1000
+
+_retrievers = {}
+_retrievers_lock = threading.Lock()
+
+
+class SchemaRetriever:
+    """
+    Long-lived handle on the schema vector store
+
+    Holds the Chroma client, the collection and the (cached) embedding function
+    so repeated lookups do not reconnect or rebuild the embedder.
+    """
+
+    def __init__(self, config, collection_name="schemas"):
+        self.config = config
+        self.embedding_function = LangchainEmbeddingFunction.from_config(config)
+        self.client = PersistentClient(path=config["chromadb_path"])
+        self.collection = self.client.get_collection(collection_name)
+
+    def retrieve(self, schema_ddl, schema_name=None, top_k=5):
+        """
+        Retrieve schemas similar to one DDL statement
+
+        Args:
+            schema_ddl: DDL statement to compare
+            schema_name: Schema whose own records are excluded from the results
+            top_k: Number of results to retrieve
+
+        Returns:
+            list: Similar schemas with content, metadata and distance
+        """
+        return self.retrieve_many([schema_ddl], exclude_schema=schema_name, top_k=top_k)[0]
+
+    def retrieve_many(self, schema_ddls, exclude_schema=None, top_k=5, where=None):
+        """
+        Retrieve similar schemas for a list of DDL statements in batched calls
+
+        All texts are embedded in one call and queried together. The schema
+        exclusion is applied inside Chroma, so every query gets up to ``top_k``
+        results from other schemas.
+
+        Args:
+            schema_ddls: List of DDL statements
+            exclude_schema: Schema whose own records are excluded from the results
+            top_k: Number of results per statement
+            where: Additional Chroma metadata filter
+
+        Returns:
+            list: One list of similar schemas per input statement, in input order
+        """
+        schema_ddls = list(schema_ddls)
+        if not schema_ddls:
+            return []
+
+        filters = []
+        if exclude_schema is not None:
+            filters.append({"schema": {"$ne": exclude_schema}})
+        if where:
+            filters.append(where)
+        query_filter = None if not filters else filters[0] if len(filters) == 1 else {"$and": filters}
+
+        return self.query_by_vectors(self.embedding_function(schema_ddls), top_k=top_k, where=query_filter)
+
+    def query_by_vectors(self, query_vectors, top_k=5, where=None):
+        """
+        Run nearest-neighbour queries for precomputed embeddings
+
+        Args:
+            query_vectors: List of embeddings
+            top_k: Number of results per embedding
+            where: Chroma metadata filter
+
+        Returns:
+            list: One list of matches (content, metadata, distance) per embedding
+        """
+        similar = []
+        for start in range(0, len(query_vectors), QUERY_BATCH_SIZE):
+            results = self.collection.query(
+                query_embeddings=query_vectors[start:start + QUERY_BATCH_SIZE],
+                n_results=top_k,
+                where=where,
+                include=["documents", "metadatas", "distances"]
+            )
+            for documents, metadatas, distances in zip(
+                    results["documents"], results["metadatas"], results["distances"]):
+                similar.append([
+                    {"content": document, "metadata": metadata, "distance": distance}
+                    for document, metadata, distance in zip(documents, metadatas, distances)
+                ])
+
+        return similar
+
+    def stored_embeddings(self, schema_name, table_names):
+        """
+        Fetch the embeddings already stored for some tables of a schema
+
+        Args:
+            schema_name: Schema the tables belong to
+            table_names: Table names as stored in the chunk metadata
+
+        Returns:
+            dict: Table name to (embedding, document) for every table found
+        """
+        table_names = list(table_names)
+        if not table_names:
+            return {}
+
+        records = self.collection.get(
+            where={"$and": [{"schema": schema_name}, {"table": {"$in": table_names}}]},
+            include=["embeddings", "metadatas", "documents"]
+        )
+
+        stored = {}
+        first_part = {}
+        for embedding, metadata, document in zip(records["embeddings"], records["metadatas"], records["documents"]):
+            # Keep the first chunk of each table (part 1 of a split table)
+            part = metadata.get("part", 1)
+            if metadata["table"] not in stored or part < first_part[metadata["table"]]:
+                stored[metadata["table"]] = (embedding, document)
+                first_part[metadata["table"]] = part
+        return stored
+
+    def match_columns(self, source_schema, destination_schema, source_tables=None,
+                      destination_tables=None, top_k=3):
+        """
+        Find the nearest destination columns for every source column in one batched query
+
+        Works on the ``schema_columns`` collection: the stored embeddings of the
+        source columns are fetched in one call and queried together against the
+        destination schema's columns.
+
+        Args:
+            source_schema: Schema whose columns are matched
+            destination_schema: Schema searched for matches
+            source_tables: Restrict the source columns to these tables
+            destination_tables: Restrict the matches to these tables
+            top_k: Matches per source column
+
+        Returns:
+            list: Dicts with table, column and matches (table, column, type, distance)
+        """
+        source_filter = {"schema": source_schema}
+        if source_tables is not None:
+            source_tables = list(source_tables)
+            if not source_tables:
+                return []
+            source_filter = {"$and": [source_filter, {"table": {"$in": source_tables}}]}
+
+        destination_filter = {"schema": destination_schema}
+        if destination_tables is not None:
+            destination_tables = list(destination_tables)
+            if not destination_tables:
+                return []
+            destination_filter = {"$and": [destination_filter, {"table": {"$in": destination_tables}}]}
+
+        records = self.collection.get(where=source_filter, include=["embeddings", "metadatas"])
+        if not len(records["ids"]):
+            return []
+
+        hits = self.query_by_vectors(list(records["embeddings"]), top_k=top_k, where=destination_filter)
+        return [
+            {
+                "table": metadata["table"],
+                "column": metadata["column"],
+                "matches": [
+                    {"table": hit["metadata"]["table"], "column": hit["metadata"]["column"],
+                     "type": hit["metadata"].get("type"), "distance": hit["distance"]}
+                    for hit in column_hits
+                ]
+            }
+            for metadata, column_hits in zip(records["metadatas"], hits)
+        ]
+
+
+def get_retriever(config, collection_name="schemas"):
+    """
+    Return a shared SchemaRetriever for the configured store and model
+
+    Args:
+        config: Configuration dictionary
+        collection_name: Name of the Chroma collection
+
+    Returns:
+        SchemaRetriever
+    """
+    key = (config["chromadb_path"], config["embedding_model"], collection_name)
+    with _retrievers_lock:
+        retriever = _retrievers.get(key)
+        if retriever is None:
+            retriever = SchemaRetriever(config, collection_name)
+            _retrievers[key] = retriever
+    return retriever
 
 
 def retrieve_similar(schema_ddl, schema_name, top_k=5, config=None):
@@ -16,22 +213,4 @@ def retrieve_similar(schema_ddl, schema_name, top_k=5, config=None):
     Returns:
         list: List of similar schemas with content and metadata
     """
-    embedding = OllamaEmbeddings(model=config["embedding_model"])
-    client = PersistentClient(path=config["chromadb_path"])
-    collection = client.get_collection("schemas")
-
-    query_vector = embedding.embed_query(schema_ddl)
-    results = collection.query(query_embeddings=[query_vector], n_results=top_k)
-
-    similar_schemas = []
-    for i in range(len(results["documents"][0])):
-        # Skip if the retrieved schema is the same as the query schema
-        if results["metadatas"][0][i]["schema"] == schema_name:
-            continue
-
-        similar_schemas.append({
-            "content": results["documents"][0][i],
-            "metadata": results["metadatas"][0][i]
-        })
-
-    return similar_schemas
\ No newline at end of file
+    return get_retriever(config).retrieve(schema_ddl, schema_name, top_k)
@@ -0,0 +1,53 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class SqliteCache:
+    """
+    Small persistent key/value store for JSON-serializable values
+
+    Used for LLM answers and summaries, which are expensive to recompute and
+    keyed by content fingerprints rather than by time.
+    """
+
+    def __init__(self, path, table="cache"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        """Return the cached value for key, or None"""
+        with self._lock:
+            row = self._conn.execute(f"SELECT value FROM {self.table} WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value):
+        """Store a value under key"""
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,421 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from generate_report import build_answerer, load_config, load_schemas
+from parsers.docx_schema_parser import iter_block_schemas
+from parsers.schema_ir import build_schema_ir
+from validators.schema_comparator import compare_schemas
+from utils.metrics import count, metrics_run, span
+
+# Requests larger than this are rejected before their body is read
+MAX_BODY_BYTES = 64 * 1024 * 1024
+MAX_HEADERS = 100
+
+
+class ServiceError(Exception):
+    """Error returned to the client as a JSON body with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ValidationService:
+    """
+    Warm, in-memory state behind the HTTP endpoints
+
+    Parsed tables and the table IR of every schema, the last report of every
+    compared pair and the Q&A index of every report stay in memory, so a
+    comparison of unchanged schemas is a dictionary lookup and a changed
+    schema only recompares the tables whose fingerprints changed. The
+    embedding function (with its embedding cache) and the Chroma collections
+    are created once and reused by every request.
+    """
+
+    def __init__(self, config, use_vector_store=False):
+        self.config = config
+        self.use_vector_store = use_vector_store
+        self.tables = {}      # schema name -> parsed table dicts
+        self.schemas = {}     # schema name -> SchemaIR
+        self.reports = {}     # (source, destination, verbose) -> (report, source IR, destination IR)
+        self.answerers = {}   # report fingerprint -> answer function
+        self._lock = threading.Lock()
+        self._embedding_function = None
+
+    @property
+    def embedding_function(self):
+        """Shared embedding function, created on first use"""
+        with self._lock:
+            if self._embedding_function is None:
+                from database.chroma_store import LangchainEmbeddingFunction
+
+                self._embedding_function = LangchainEmbeddingFunction.from_config(self.config)
+            return self._embedding_function
+
+    def load(self):
+        """Parse the data directory into memory (and sync it into ChromaDB when enabled)"""
+        all_schemas, schemas_by_file = load_schemas(self.config)
+        for name, tables in schemas_by_file.items():
+            self._set_schema(name, tables)
+        if self.use_vector_store and all_schemas:
+            self._store(all_schemas)
+
+    def _set_schema(self, name, tables):
+        schema = build_schema_ir(name, tables)
+        with self._lock:
+            self.tables[name] = tables
+            self.schemas[name] = schema
+        return schema
+
+    def _store(self, tables):
+        from database.chroma_store import store_schemas
+        from utils.chunk_utils import chunk_tables, column_records
+
+        chunks = chunk_tables(tables, self.config.get("chunk_size"), self.config.get("chunk_overlap", 0))
+        columns = column_records(tables) if self.config.get("column_index", True) else None
+        with span("store"):
+            store_schemas(chunks, self.config, embedding_function=self.embedding_function, column_records=columns)
+
+    def _schema(self, name):
+        schema = self.schemas.get(name)
+        if schema is None:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"Unknown schema: {name}")
+        return schema
+
+    def list_schemas(self):
+        return {
+            name: {"tables": len(schema.tables), "fingerprint": schema.fingerprint.hex()}
+            for name, schema in sorted(self.schemas.items())
+        }
+
+    def submit_schema(self, name, ddl_text):
+        """
+        Replace a schema with the tables of a DDL text
+
+        Args:
+            name: Schema name
+            ddl_text: Any number of CREATE TABLE statements
+
+        Returns:
+            dict: Table count and fingerprint of the new schema
+        """
+        tables = [dict(table, schema_name=name) for table in iter_block_schemas([ddl_text], name)]
+        if not tables:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "No CREATE TABLE statements found")
+        with span("parse"):
+            schema = self._set_schema(name, tables)
+        count("schemas_submitted")
+        if self.use_vector_store:
+            self._store(tables)
+        return {"schema": name, "tables": len(schema.tables), "fingerprint": schema.fingerprint.hex()}
+
+    def delete_schema(self, name):
+        self._schema(name)
+        with self._lock:
+            self.schemas.pop(name, None)
+            self.tables.pop(name, None)
+            for key in [key for key in self.reports if name in key[:2]]:
+                del self.reports[key]
+        if self.use_vector_store:
+            from database.chroma_store import delete_schemas
+
+            with span("store"):
+                delete_schemas([name], self.config)
+        return {"schema": name, "deleted": True}
+
+    def compare(self, source, destination, verbose=False, renames=False):
+        """
+        Compare two loaded schemas, reusing the previous report of the pair
+
+        Returns:
+            dict: The comparison report
+        """
+        schema1 = self._schema(source)
+        schema2 = self._schema(destination)
+        key = (source, destination, verbose)
+
+        previous = self.reports.get(key)
+        if previous is not None and previous[1].fingerprint == schema1.fingerprint \
+                and previous[2].fingerprint == schema2.fingerprint \
+                and (not renames or "rename_suggestions" in previous[0]["meta"]):
+            count("compare_cache_hits")
+            return previous[0]
+
+        with span("compare"):
+            report = compare_schemas(schema1, schema2, schema1_name=source, schema2_name=destination,
+                                     verbose=verbose, previous=previous)
+        if renames:
+            if not self.use_vector_store:
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "Rename suggestions need the service started with --store")
+            from database.chroma_store import COLUMNS_COLLECTION
+            from utils.schema_retriever import get_retriever
+            from validators.rename_detector import detect_renames
+
+            with span("rename_detection"):
+                column_retriever = None
+                if self.config.get("column_index", True):
+                    column_retriever = get_retriever(self.config, COLUMNS_COLLECTION)
+                report["meta"]["rename_suggestions"] = detect_renames(
+                    schema1, schema2,
+                    retriever=get_retriever(self.config),
+                    min_score=self.config.get("rename_min_score", 0.5),
+                    column_retriever=column_retriever
+                )
+
+        with self._lock:
+            self.reports[key] = (report, schema1, schema2)
+        return report
+
+    def report_page(self, source, destination, page=1, page_size=50, verbose=False):
+        """
+        One page of a comparison report's table results
+
+        Returns:
+            dict: meta, page, pages, page_size and the results of the page
+        """
+        if page < 1 or page_size < 1:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "page and page_size must be positive")
+        report = self.compare(source, destination, verbose=verbose)
+        results = report["results"]
+        pages = max(1, -(-len(results) // page_size))
+        start = (page - 1) * page_size
+        return {
+            "success": report["success"],
+            "meta": report["meta"],
+            "page": page,
+            "pages": pages,
+            "page_size": page_size,
+            "results": results[start:start + page_size]
+        }
+
+    def ask(self, source, destination, question):
+        """
+        Answer a question about the comparison of two schemas
+
+        Returns:
+            dict: The question and its answer
+        """
+        from utils.qa_facts import report_fingerprint
+
+        if not question or not question.strip():
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "Missing question")
+        report = self.compare(source, destination)
+        fingerprint = report_fingerprint(report["meta"])
+        answer = self.answerers.get(fingerprint)
+        if answer is None:
+            embedding_function = self.embedding_function if self.config.get("qa_vector_search", True) else None
+            answer = build_answerer(self.config, report, embedding_function=embedding_function)
+            with self._lock:
+                self.answerers[fingerprint] = answer
+        return {"question": question, "answer": answer(question)}
+
+
+def _query_value(query, name, default=None, required=False):
+    values = query.get(name)
+    if not values:
+        if required:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"Missing query parameter: {name}")
+        return default
+    return values[0]
+
+
+def _query_int(query, name, default):
+    value = _query_value(query, name)
+    try:
+        return default if value is None else int(value)
+    except ValueError:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, f"{name} must be an integer")
+
+
+def _query_flag(query, name):
+    return _query_value(query, name, "0").lower() in ("1", "true", "yes")
+
+
+def _json_body(body):
+    try:
+        return json.loads(body or b"{}")
+    except ValueError:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "Body must be JSON")
+
+
+def route(service, method, path, query, body):
+    """
+    Dispatch one request to the service
+
+    Runs in a worker thread, so it may block on parsing, comparing or the LLM.
+
+    Returns:
+        tuple: (HTTP status, JSON-serializable response)
+    """
+    parts = [unquote(part) for part in path.strip("/").split("/") if part]
+
+    if parts == ["health"] and method == "GET":
+        return HTTPStatus.OK, {"status": "ok", "schemas": len(service.schemas)}
+
+    if parts == ["schemas"] and method == "GET":
+        return HTTPStatus.OK, service.list_schemas()
+
+    if len(parts) == 2 and parts[0] == "schemas":
+        if method in ("PUT", "POST"):
+            try:
+                ddl_text = body.decode("utf-8")
+            except UnicodeDecodeError:
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "DDL must be UTF-8 text")
+            return HTTPStatus.OK, service.submit_schema(parts[1], ddl_text)
+        if method == "DELETE":
+            return HTTPStatus.OK, service.delete_schema(parts[1])
+
+    if parts == ["compare"] and method == "GET":
+        return HTTPStatus.OK, service.compare(
+            _query_value(query, "source", required=True),
+            _query_value(query, "destination", required=True),
+            verbose=_query_flag(query, "verbose"),
+            renames=_query_flag(query, "renames")
+        )
+
+    if parts == ["report"] and method == "GET":
+        return HTTPStatus.OK, service.report_page(
+            _query_value(query, "source", required=True),
+            _query_value(query, "destination", required=True),
+            page=_query_int(query, "page", 1),
+            page_size=_query_int(query, "page_size", service.config.get("service_page_size", 50)),
+            verbose=_query_flag(query, "verbose")
+        )
+
+    if parts == ["ask"] and method == "POST":
+        request = _json_body(body)
+        for name in ("source", "destination", "question"):
+            if not isinstance(request.get(name), str):
+                raise ServiceError(HTTPStatus.BAD_REQUEST, f"Missing field: {name}")
+        return HTTPStatus.OK, service.ask(request["source"], request["destination"], request["question"])
+
+    raise ServiceError(HTTPStatus.NOT_FOUND, f"No endpoint for {method} {path}")
+
+
+def _handle_request(service, method, target, body):
+    """Route a request and serialize the response (in a worker thread)"""
+    url = urlsplit(target)
+    try:
+        with span("request"):
+            status, response = route(service, method, url.path, parse_qs(url.query), body)
+    except ServiceError as e:
+        status, response = e.status, {"error": e.message}
+    except Exception as e:
+        print(f"⚠️ Error handling {method} {url.path}: {e}")
+        status, response = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(e).__name__}: {e}"}
+    count("requests")
+    return status, json.dumps(response).encode("utf-8")
+
+
+async def _read_request(reader):
+    """
+    Read one HTTP/1.1 request
+
+    Returns:
+        tuple: (method, target, headers, body), or None when the client closed the connection
+    """
+    request_line = await reader.readline()
+    if not request_line.strip():
+        return None
+    try:
+        method, target, _ = request_line.decode("latin-1").split()
+    except ValueError:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise ServiceError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length", 0))
+    except ValueError:
+        raise ServiceError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, headers, body
+
+
+def _write_response(writer, status, body, keep_alive):
+    status = HTTPStatus(status)
+    writer.write(
+        f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+        f"Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+    )
+
+
+async def serve(service, host="127.0.0.1", port=8765, max_workers=4):
+    """
+    Serve the service over HTTP until cancelled
+
+    Connections are handled by the event loop and kept alive between requests;
+    the work of each request runs in a thread pool of ``max_workers`` threads,
+    so slow requests (LLM answers, large submissions) do not block others.
+    """
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except ServiceError as e:
+                    _write_response(writer, e.status, json.dumps({"error": e.message}).encode("utf-8"), False)
+                    break
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if request is None:
+                    break
+
+                method, target, headers, body = request
+                status, response = await loop.run_in_executor(
+                    executor, _handle_request, service, method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                _write_response(writer, status, response, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port)
+    print(f"✅ Validation service listening on http://{host}:{port} ({len(service.schemas)} schemas loaded)")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        executor.shutdown(wait=False)
+
+
+def main(config_path="config.yaml", host=None, port=None, use_vector_store=False):
+    config = load_config(config_path)
+    with metrics_run(config, "serve"):
+        service = ValidationService(config, use_vector_store=use_vector_store)
+        service.load()
+        try:
+            asyncio.run(serve(
+                service,
+                host=host or config.get("service_host", "127.0.0.1"),
+                port=port or config.get("service_port", 8765),
+                max_workers=config.get("service_workers", 4)
+            ))
+        except KeyboardInterrupt:
+            print("Validation service stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+import csv
+import os
+from collections import Counter
+
+# Outcome of one column, or of a whole table (kind of its diff record / result status)
+MATCH = "match"
+TYPE_MISMATCH = "type_mismatch"
+DEFINITION_MISMATCH = "definition_mismatch"  # Same type, different modifiers (NULL, DEFAULT, ...)
+CONSTRAINT_MISMATCH = "constraint_mismatch"  # Table-level constraints (keys, checks) differ; no column
+MISSING_IN_SOURCE = "missing_in_source"
+MISSING_IN_DESTINATION = "missing_in_destination"
+DIFFERENT = "different"  # Table status only: the table exists on both sides but differs
+
+# Fields of a diff record, in export order
+FIELDS = ("kind", "table", "column", "left_type", "right_type", "left_definition", "right_definition")
+
+# Per-table column diffs are stored as rows of these fields; the table is the
+# result's kwargs.table
+COLUMN_FIELDS = ("kind", "column", "left_type", "right_type", "left_definition", "right_definition")
+
+
+def add_column_diff(column_diffs, kind, column, left=None, right=None):
+    """
+    Append one column outcome to a table's diff rows
+
+    Args:
+        column_diffs: List of rows of the table result
+        kind: MATCH, TYPE_MISMATCH, DEFINITION_MISMATCH, MISSING_IN_SOURCE or MISSING_IN_DESTINATION
+        column: Column name
+        left: Column in the source schema (None when missing there)
+        right: Column in the destination schema (None when missing there)
+    """
+    column_diffs.append([
+        kind, column,
+        None if left is None else left.type, None if right is None else right.type,
+        None if left is None else left.definition, None if right is None else right.definition
+    ])
+
+
+def add_constraint_diff(column_diffs, left_constraints, right_constraints):
+    """
+    Append a CONSTRAINT_MISMATCH row; the definitions hold each side's table constraints
+
+    Args:
+        column_diffs: List of rows of the table result
+        left_constraints: Normalized constraints of the table in the source schema
+        right_constraints: Normalized constraints of the table in the destination schema
+    """
+    column_diffs.append([CONSTRAINT_MISMATCH, None, None, None,
+                         "; ".join(left_constraints), "; ".join(right_constraints)])
+
+
+def iter_column_diffs(result):
+    """
+    Yield the column diff records of one table result
+
+    Yields:
+        tuple: (kind, column, left_type, right_type, left_definition, right_definition)
+    """
+    width = len(COLUMN_FIELDS)
+    for row in result.get("meta", {}).get("column_diffs", ()):
+        # Rows of older reports lack the trailing fields
+        yield tuple(row) + (None,) * (width - len(row))
+
+
+def describe_column(record, source, destination):
+    """
+    Human-readable sentence for one column diff record
+
+    Args:
+        record: (kind, column, left_type, right_type, left_definition, right_definition)
+        source: Source schema name
+        destination: Destination schema name
+
+    Returns:
+        str
+    """
+    kind, column, left_type, right_type, left_definition, right_definition = record
+    if kind == MATCH:
+        return f"Column '{column}' matches with datatype: {left_definition or left_type}"
+    if kind == TYPE_MISMATCH:
+        return f"Column '{column}' has different datatypes: {left_type} vs {right_type}"
+    if kind == DEFINITION_MISMATCH:
+        return f"Column '{column}' has different definitions: {left_definition} vs {right_definition}"
+    if kind == CONSTRAINT_MISMATCH:
+        return f"Table constraints differ: {left_definition or 'none'} vs {right_definition or 'none'}"
+    if kind == MISSING_IN_DESTINATION:
+        return f"Column '{column}' is missing in {destination}"
+    return f"Column '{column}' is missing in {source}"
+
+
+def describe_status(status, source, destination):
+    """Human-readable sentence for a table result status"""
+    if status == MISSING_IN_DESTINATION:
+        return f"Table missing in {destination}"
+    if status == MISSING_IN_SOURCE:
+        return f"Table missing in {source}"
+    return "Table differs" if status == DIFFERENT else "Table matches"
+
+
+class DiffRecords:
+    """
+    Every diff record of a report in columnar form
+
+    One list per field (see FIELDS), so filtering and aggregating a large diff
+    only touches the fields involved. Tables missing on one side contribute a
+    single record with an empty column.
+    """
+
+    def __init__(self, columns=None):
+        self.columns = columns or {field: [] for field in FIELDS}
+
+    @classmethod
+    def from_results(cls, results, include_matches=False):
+        """
+        Collect the diff records of table results
+
+        Args:
+            results: Iterable of table results (may be a lazy reader)
+            include_matches: Keep MATCH records of verbose reports
+
+        Returns:
+            DiffRecords
+        """
+        columns = {field: [] for field in FIELDS}
+        kinds, tables = columns["kind"], columns["table"]
+        record_columns = [columns[field] for field in COLUMN_FIELDS[1:]]
+
+        for result in results:
+            table = result["kwargs"]["table"]
+            status = result.get("meta", {}).get("status")
+            if status in (MISSING_IN_SOURCE, MISSING_IN_DESTINATION):
+                kinds.append(status)
+                tables.append(table)
+                for values in record_columns:
+                    values.append(None)
+                continue
+            for record in iter_column_diffs(result):
+                if record[0] == MATCH and not include_matches:
+                    continue
+                kinds.append(record[0])
+                tables.append(table)
+                for values, value in zip(record_columns, record[1:]):
+                    values.append(value)
+        return cls(columns)
+
+    def __len__(self):
+        return len(self.columns["kind"])
+
+    def __iter__(self):
+        """Yield every record as a tuple in FIELDS order"""
+        return zip(*(self.columns[field] for field in FIELDS))
+
+    def filter(self, kind=None, table=None, column=None):
+        """
+        Records matching every given field value
+
+        Args:
+            kind: Kind, or a collection of kinds
+            table: Table name
+            column: Column name
+
+        Returns:
+            DiffRecords
+        """
+        kinds = None if kind is None else ({kind} if isinstance(kind, str) else set(kind))
+        indexes = range(len(self))
+        if kinds is not None:
+            indexes = [i for i in indexes if self.columns["kind"][i] in kinds]
+        if table is not None:
+            indexes = [i for i in indexes if self.columns["table"][i] == table]
+        if column is not None:
+            indexes = [i for i in indexes if self.columns["column"][i] == column]
+        return DiffRecords({field: [values[i] for i in indexes] for field, values in self.columns.items()})
+
+    def count_by(self, field="kind"):
+        """Number of records per value of a field"""
+        return dict(Counter(self.columns[field]))
+
+    def to_csv(self, path):
+        """Write the records as CSV with a header row"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(self)
+
+    def to_arrow(self):
+        """Return the records as a pyarrow Table (requires pyarrow)"""
+        import pyarrow as pa
+
+        return pa.table({field: pa.array(self.columns[field], type=pa.string()) for field in FIELDS})
+
+    def to_parquet(self, path):
+        """Write the records as Parquet (requires pyarrow)"""
+        import pyarrow.parquet as pq
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        pq.write_table(self.to_arrow(), path)
+
+
+def export_diffs(results, path, include_matches=False):
+    """
+    Export the diff records of a report; .parquet paths are written as Parquet, others as CSV
+
+    Args:
+        results: Iterable of table results
+        path: Output path
+        include_matches: Keep MATCH records of verbose reports
+
+    Returns:
+        DiffRecords: The exported records
+    """
+    records = DiffRecords.from_results(results, include_matches=include_matches)
+    if path.endswith(".parquet"):
+        records.to_parquet(path)
+    else:
+        records.to_csv(path)
+    return records
@@ -1,8 +1,38 @@
+import hashlib
+import json
+import re
 import great_expectations as ge
 import pandas as pd
+from great_expectations.core import ExpectationSuite
 from great_expectations.core.expectation_configuration import ExpectationConfiguration
 from great_expectations.validator.validator import Validator
 
+# Suite used by the single-pass validation of all schemas
+COMBINED_SUITE_NAME = "schema_validation_combined_suite"
+
+# Structural DDL check, evaluated once per column with pandas string methods
+# (DOTALL so that multi-line statements from .sql files match as well)
+DDL_PATTERN = r"^\s*CREATE\s+(?:\w+\s+)*?TABLE\b.*\(.*\)\s*;?\s*$"
+
+# Expectations of the combined suite; the boolean columns are computed by add_structural_checks
+COMBINED_SUITE_DEFINITION = [
+    {"expectation_type": "expect_column_to_exist", "kwargs": {"column": "schema_name"}},
+    {"expectation_type": "expect_column_to_exist", "kwargs": {"column": "table_name"}},
+    {"expectation_type": "expect_column_to_exist", "kwargs": {"column": "ddl"}},
+    {"expectation_type": "expect_column_values_to_not_be_null", "kwargs": {"column": "ddl"}},
+    {"expectation_type": "expect_column_values_to_be_in_set",
+     "kwargs": {"column": "ddl_is_create_table", "value_set": [True]}},
+    {"expectation_type": "expect_column_values_to_be_in_set",
+     "kwargs": {"column": "table_name_present", "value_set": [True]}},
+]
+
+# Row-level checks and the boolean column each one reads
+_ROW_CHECKS = {
+    "ddl_not_null": "ddl_not_null",
+    "ddl_is_create_table": "ddl_is_create_table",
+    "table_name_present": "table_name_present",
+}
+
 
 def create_schema_expectations(df, context):
     """
@@ -81,4 +111,146 @@ def validate_schemas(df1, df2, context):
         "success": result1.success and result2.success
     }
 
-    return combined_result
\ No newline at end of file
+    return combined_result
+
+
+def suite_definition_hash(definition=None):
+    """Hash of an expectation suite definition, stored in the suite's meta"""
+    definition = COMBINED_SUITE_DEFINITION if definition is None else definition
+    return hashlib.sha256(json.dumps(definition, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def get_or_create_combined_suite(context):
+    """
+    Return the persisted combined suite, rebuilding it only when its definition changed
+
+    Args:
+        context: Great Expectations context
+
+    Returns:
+        tuple: (suite, True when the persisted suite was reused)
+    """
+    definition_hash = suite_definition_hash()
+    try:
+        suite = context.get_expectation_suite(COMBINED_SUITE_NAME)
+        if suite.meta.get("definition_hash") == definition_hash:
+            return suite, True
+    except Exception:
+        pass  # Not persisted yet
+
+    suite = ExpectationSuite(
+        expectation_suite_name=COMBINED_SUITE_NAME,
+        expectations=[ExpectationConfiguration(**expectation) for expectation in COMBINED_SUITE_DEFINITION],
+        meta={"definition_hash": definition_hash},
+        data_context=context
+    )
+    context.add_or_update_expectation_suite(expectation_suite=suite)
+    return suite, False
+
+
+def add_structural_checks(df):
+    """
+    Add the boolean check columns used by the combined suite
+
+    Every check is a single vectorized pandas operation over the whole column.
+
+    Args:
+        df: DataFrame with schema_name, table_name and ddl columns
+
+    Returns:
+        DataFrame: The same frame with the check columns added
+    """
+    ddl = df["ddl"]
+    df["ddl_not_null"] = ddl.notna()
+    df["ddl_is_create_table"] = ddl.str.contains(DDL_PATTERN, case=False, regex=True, flags=re.DOTALL, na=False)
+    df["table_name_present"] = df["table_name"].fillna("").astype(str).str.len() > 0
+    return df
+
+
+def combine_schema_frames(dataframes):
+    """
+    Concatenate the DataFrames of every schema once, tagged with their schema key
+
+    Args:
+        dataframes: Dict of schema name -> DataFrame (schema_name, table_name, ddl)
+
+    Returns:
+        DataFrame: One frame with a ``schema`` column and a fresh index
+    """
+    frames = [df.assign(schema=name) for name, df in dataframes.items()]
+    if not frames:
+        return pd.DataFrame(columns=["schema", "schema_name", "table_name", "ddl"])
+    return pd.concat(frames, ignore_index=True)
+
+
+def validate_all_schemas(dataframes, context):
+    """
+    Validate every schema in one Great Expectations run
+
+    The schema DataFrames are concatenated once, the structural checks are
+    computed with vectorized pandas operations, and the combined frame is
+    validated as a single batch against the persisted combined suite (reused
+    as long as its definition is unchanged). Per-schema results are then split
+    out of the row-level checks with one groupby.
+
+    Args:
+        dataframes: Dict of schema name -> DataFrame (schema_name, table_name, ddl)
+        context: Great Expectations context
+
+    Returns:
+        dict: success, suite_reused, the expectation results of the run and
+        per-schema results (tables, failed checks, failing tables)
+    """
+    combined = add_structural_checks(combine_schema_frames(dataframes))
+    suite, suite_reused = get_or_create_combined_suite(context)
+
+    # One batch for all schemas
+    datasource = context.sources.add_or_update_pandas("schema_validation")
+    try:
+        asset = datasource.get_asset("all_schemas")
+    except Exception:
+        asset = datasource.add_dataframe_asset(name="all_schemas")
+    validator = context.get_validator(
+        batch_request=asset.build_batch_request(dataframe=combined),
+        expectation_suite=suite
+    )
+    validation = validator.validate(result_format="SUMMARY")
+
+    expectations = [
+        {
+            "expectation_type": result.expectation_config.expectation_type,
+            "column": result.expectation_config.kwargs.get("column"),
+            "success": result.success,
+            "unexpected_count": (result.result or {}).get("unexpected_count", 0)
+        }
+        for result in validation.results
+    ]
+
+    # Split the row-level checks out per schema in one pass
+    checks = combined[["schema"] + list(_ROW_CHECKS.values())]
+    failed_counts = (~checks.set_index("schema")).groupby(level=0, sort=False).sum()
+    table_counts = combined.groupby("schema", sort=False).size()
+    failing_rows = combined.loc[~combined[list(_ROW_CHECKS.values())].all(axis=1), ["schema", "table_name"]]
+    failing_tables = failing_rows.groupby("schema", sort=False)["table_name"].apply(list)
+
+    # Column-existence expectations apply to every schema alike
+    global_success = all(e["success"] for e in expectations if e["expectation_type"] == "expect_column_to_exist")
+
+    schemas = {}
+    for name in dataframes:
+        failed = {check: int(failed_counts.at[name, column]) for check, column in _ROW_CHECKS.items()
+                  if name in failed_counts.index and failed_counts.at[name, column]}
+        schemas[name] = {
+            "success": global_success and not failed,
+            "tables": int(table_counts.get(name, 0)),
+            "failed_checks": failed,
+            "failing_tables": failing_tables.get(name, [])
+        }
+
+    return {
+        "success": bool(validation.success),
+        "suite": COMBINED_SUITE_NAME,
+        "suite_reused": suite_reused,
+        "expectations": expectations,
+        "schemas": schemas
+    }
@@ -0,0 +1,111 @@
+import datetime
+from itertools import combinations
+
+
+def compare_many(schema_irs, verbose=False):
+    """
+    Compare any number of schemas in one pass over their tables.
+
+    Every table is looked up once in each schema. Tables whose fingerprint is the
+    same everywhere are only marked as identical; for the rest a column matrix
+    holding each schema's column definition (or None when absent) is built. The
+    per-pair drift counts are derived from that matrix, so no schema is parsed
+    or walked more than once regardless of the number of pairs.
+
+    Args:
+        schema_irs (list): SchemaIR objects, in the order they should appear in the report
+        verbose (bool): Keep matching columns in the column matrix of differing tables
+
+    Returns:
+        dict: Report with meta, the table matrix and pairwise drift summaries
+    """
+    names = [schema.name for schema in schema_irs]
+    pairs = list(combinations(range(len(schema_irs)), 2))
+    pair_stats = {
+        pair: {
+            "identical_tables": 0,
+            "different_tables": 0,
+            "only_in_source": 0,
+            "only_in_destination": 0,
+            "type_mismatches": 0,
+            "missing_columns": 0
+        }
+        for pair in pairs
+    }
+
+    all_tables = sorted(set().union(*(schema.tables for schema in schema_irs)))
+    matrix = {}
+    uniform_tables = 0
+
+    for table in all_tables:
+        tables = [schema.tables.get(table) for schema in schema_irs]
+        fingerprints = [t.fingerprint if t is not None else None for t in tables]
+        entry = {"presence": [t is not None for t in tables]}
+
+        # Same fingerprint in every schema: nothing to expand
+        if None not in fingerprints and len(set(fingerprints)) == 1:
+            entry["identical"] = True
+            matrix[table] = entry
+            uniform_tables += 1
+            for pair in pairs:
+                pair_stats[pair]["identical_tables"] += 1
+            continue
+
+        entry["identical"] = False
+        present = [t for t in tables if t is not None]
+        column_names = sorted(set().union(*(t.column_names() for t in present)))
+        columns = {}
+        for col in column_names:
+            definitions = [
+                (t.column(col).definition if t.column(col) is not None else None) if t is not None else None
+                for t in tables
+            ]
+            present_definitions = [d for d, t in zip(definitions, tables) if t is not None]
+            if verbose or None in present_definitions or len(set(present_definitions)) > 1:
+                columns[col] = definitions
+        entry["columns"] = columns
+        matrix[table] = entry
+
+        for i, j in pairs:
+            stats = pair_stats[(i, j)]
+            if fingerprints[i] is None and fingerprints[j] is None:
+                continue
+            if fingerprints[i] is None:
+                stats["only_in_destination"] += 1
+            elif fingerprints[j] is None:
+                stats["only_in_source"] += 1
+            elif fingerprints[i] == fingerprints[j]:
+                stats["identical_tables"] += 1
+            else:
+                stats["different_tables"] += 1
+                for definitions in columns.values():
+                    left, right = definitions[i], definitions[j]
+                    if left is not None and right is not None:
+                        if left != right:
+                            stats["type_mismatches"] += 1
+                    elif left is not None or right is not None:
+                        stats["missing_columns"] += 1
+
+    pairwise = []
+    for i, j in pairs:
+        summary = {"source_schema": names[i], "destination_schema": names[j]}
+        summary.update(pair_stats[(i, j)])
+        summary["success"] = (
+            summary["different_tables"] == 0
+            and summary["only_in_source"] == 0
+            and summary["only_in_destination"] == 0
+        )
+        pairwise.append(summary)
+
+    return {
+        "meta": {
+            "schemas": names,
+            "fingerprints": {schema.name: schema.fingerprint.hex() for schema in schema_irs},
+            "table_counts": {schema.name: len(schema.tables) for schema in schema_irs},
+            "tables_total": len(all_tables),
+            "identical_tables": uniform_tables,
+            "timestamp": datetime.datetime.now().isoformat()
+        },
+        "tables": matrix,
+        "pairwise": pairwise
+    }
@@ -0,0 +1,208 @@
+from difflib import SequenceMatcher
+
+
+def _name_similarity(name1, name2):
+    return SequenceMatcher(None, name1.lower(), name2.lower()).ratio()
+
+
+def _structural_similarity(table1, table2):
+    """Blend of column-name overlap and table-name similarity"""
+    columns1 = {name.lower() for name in table1.column_names()}
+    columns2 = {name.lower() for name in table2.column_names()}
+    union = columns1 | columns2
+    overlap = len(columns1 & columns2) / len(union) if union else 0.0
+    return 0.7 * overlap + 0.3 * _name_similarity(table1.name, table2.name)
+
+
+def _render_ddl(table):
+    """Rebuild a CREATE TABLE statement for tables that have no stored embedding"""
+    columns = ",\n    ".join(f"{column.name} {column.definition}" for column in table.columns)
+    return f"CREATE TABLE {table.full_name} (\n    {columns}\n);"
+
+
+def _assign(candidates, min_score):
+    """Greedy one-to-one assignment of (score, left, right, extra) candidates"""
+    used_left = set()
+    used_right = set()
+    assigned = []
+    for candidate in sorted(candidates, key=lambda c: (-c[0], c[1], c[2])):
+        score, left, right = candidate[:3]
+        if score < min_score or left in used_left or right in used_right:
+            continue
+        used_left.add(left)
+        used_right.add(right)
+        assigned.append(candidate)
+    return assigned
+
+
+# Added to the score of a pair whose columns have the same type; it only breaks ties
+# between candidates, a shared type is never evidence of a rename on its own
+TYPE_BONUS = 0.1
+
+
+def rank_column_renames(table1, table2, min_score=0.5, vector_scores=None):
+    """
+    Rank rename candidates among the columns that only exist on one side
+
+    The evidence for a pair is its name similarity, or the mean of name and
+    vector similarity when that is higher, so a vector hit can only raise a
+    pair and a pair without one counts as vector similarity 0. Pairs whose
+    evidence is below ``min_score`` are dropped; the rest are ranked by their
+    evidence plus TYPE_BONUS when the types agree.
+
+    Args:
+        table1: Table in the first schema
+        table2: Table in the second schema
+        min_score: Minimum evidence for a suggestion
+        vector_scores: Optional (column1, column2) to vector similarity
+
+    Returns:
+        list: Suggestions with source_column, destination_column and score
+    """
+    only1 = [table1.column(name) for name in table1.column_names() if table2.column(name) is None]
+    only2 = [table2.column(name) for name in table2.column_names() if table1.column(name) is None]
+
+    candidates = []
+    for column1 in only1:
+        for column2 in only2:
+            name_score = _name_similarity(column1.name, column2.name)
+            vector = (vector_scores or {}).get((column1.name, column2.name), 0.0)
+            evidence = max(name_score, 0.5 * name_score + 0.5 * vector)
+            if evidence < min_score:
+                continue
+            score = min(1.0, evidence + (TYPE_BONUS if column1.type == column2.type else 0.0))
+            candidates.append((score, column1.name, column2.name))
+
+    return [
+        {"source_column": left, "destination_column": right, "score": round(score, 3)}
+        for score, left, right in _assign(candidates, min_score)
+    ]
+
+
+def _column_vector_scores(schema1, schema2, column_retriever, source_keys, destination_keys, top_k):
+    """
+    Vector similarity of column pairs between two sets of tables, from one batched query
+
+    Returns:
+        dict: (source table key, destination table key) to {(column1, column2): score}
+    """
+    source_keys = {schema1.tables[key].name: key for key in source_keys}
+    destination_keys = {schema2.tables[key].name: key for key in destination_keys}
+    if not source_keys or not destination_keys:
+        return {}
+
+    scores = {}
+    for match in column_retriever.match_columns(schema1.name, schema2.name, source_tables=list(source_keys),
+                                                destination_tables=list(destination_keys), top_k=top_k):
+        key1 = source_keys.get(match["table"])
+        for hit in match["matches"]:
+            key2 = destination_keys.get(hit["table"])
+            if key1 is None or key2 is None:
+                continue
+            pair_scores = scores.setdefault((key1, key2), {})
+            columns = (match["column"], hit["column"])
+            pair_scores[columns] = max(1.0 / (1.0 + hit["distance"]), pair_scores.get(columns, 0.0))
+    return scores
+
+
+def detect_renames(schema1, schema2, retriever=None, top_k=3, min_score=0.5, column_retriever=None):
+    """
+    Suggest renamed tables and columns between two schemas
+
+    Only tables that exist on one side are considered. When a retriever is
+    given, the embeddings already stored for the source-only tables are used
+    in one batched nearest-neighbour query restricted to the destination-only
+    tables; vector and structural similarity are then blended into one score.
+    Without a retriever the structural score is used alone. Work is therefore
+    proportional to the size of the diff, not the size of the schemas.
+
+    With a ``column_retriever`` (on the ``schema_columns`` collection), the
+    columns of every unmatched or changed table are matched against the other
+    schema in one batched query, and the vector scores feed the column
+    suggestions.
+
+    Args:
+        schema1 (SchemaIR): Source schema
+        schema2 (SchemaIR): Destination schema
+        retriever (SchemaRetriever, optional): Handle on the schemas collection
+        column_retriever (SchemaRetriever, optional): Handle on the schema_columns collection
+        top_k (int): Vector candidates per unmatched table
+        min_score (float): Minimum score for a suggestion
+
+    Returns:
+        dict: ``tables`` and ``columns`` lists of scored rename suggestions
+    """
+    tables1 = schema1.tables
+    tables2 = schema2.tables
+    source_only = sorted(set(tables1) - set(tables2))
+    destination_only = sorted(set(tables2) - set(tables1))
+
+    candidates = []
+    if source_only and destination_only:
+        vector_scores = {}
+
+        if retriever is not None:
+            destination_names = {tables2[key].name: key for key in destination_only}
+            source_names = [tables1[key].name for key in source_only]
+            stored = retriever.stored_embeddings(schema1.name, source_names)
+
+            # Tables not in the vector store are embedded from their IR
+            missing = [key for key in source_only if tables1[key].name not in stored]
+            vectors = [stored[tables1[key].name][0] for key in source_only if tables1[key].name in stored]
+            queried = [key for key in source_only if tables1[key].name in stored]
+            if missing:
+                vectors += list(retriever.embedding_function([_render_ddl(tables1[key]) for key in missing]))
+                queried += missing
+
+            matches = retriever.query_by_vectors(
+                vectors,
+                top_k=min(top_k, len(destination_only)),
+                where={"$and": [
+                    {"schema": schema2.name},
+                    {"table": {"$in": list(destination_names)}}
+                ]}
+            )
+            for key, hits in zip(queried, matches):
+                for hit in hits:
+                    destination = destination_names.get(hit["metadata"]["table"])
+                    if destination is not None:
+                        score = 1.0 / (1.0 + hit["distance"])
+                        vector_scores[(key, destination)] = max(score, vector_scores.get((key, destination), 0.0))
+
+            pairs = list(vector_scores)
+        else:
+            pairs = [(key1, key2) for key1 in source_only for key2 in destination_only]
+
+        for key1, key2 in pairs:
+            structural = _structural_similarity(tables1[key1], tables2[key2])
+            vector = vector_scores.get((key1, key2))
+            score = structural if vector is None else 0.5 * vector + 0.5 * structural
+            candidates.append((score, key1, key2, vector, structural))
+
+    changed = [key for key in sorted(set(tables1) & set(tables2))
+               if tables1[key].fingerprint != tables2[key].fingerprint]
+    column_scores = {}
+    if column_retriever is not None:
+        column_scores = _column_vector_scores(schema1, schema2, column_retriever,
+                                              source_only + changed, destination_only + changed, top_k)
+
+    table_suggestions = []
+    for score, key1, key2, vector, structural in _assign(candidates, min_score):
+        table_suggestions.append({
+            "source_table": key1,
+            "destination_table": key2,
+            "score": round(score, 3),
+            "vector_score": None if vector is None else round(vector, 3),
+            "structural_score": round(structural, 3),
+            "columns": rank_column_renames(tables1[key1], tables2[key2], min_score,
+                                           column_scores.get((key1, key2)))
+        })
+
+    # Columns renamed inside tables that exist on both sides
+    column_suggestions = []
+    for key in changed:
+        for suggestion in rank_column_renames(tables1[key], tables2[key], min_score, column_scores.get((key, key))):
+            suggestion["table"] = key
+            column_suggestions.append(suggestion)
+
+    return {"tables": table_suggestions, "columns": column_suggestions}
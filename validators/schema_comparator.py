@@ -1,62 +1,74 @@
-import re
-import json
 import datetime
-import pkg_resources  # For getting the installed package version
+from functools import lru_cache
+from parsers.schema_ir import SchemaIR, parse_schema_text
+from validators.diff_records import (COLUMN_FIELDS, DEFINITION_MISMATCH, DIFFERENT, MATCH, MISSING_IN_DESTINATION,
+                                     MISSING_IN_SOURCE, TYPE_MISMATCH, add_column_diff, add_constraint_diff)
 
+# Stored comparison results are keyed by this; bump it whenever the report format
+# or the comparison rules change, so results of older versions are not reused
+COMPARATOR_VERSION = "5"
 
-def compare_schemas(schema1, schema2, schema1_name=None, schema2_name=None):
+
+@lru_cache(maxsize=None)
+def _ge_version():
+    """Installed Great Expectations version, read from package metadata without importing it"""
+    from importlib import metadata
+
+    try:
+        return metadata.version("great-expectations")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def compare_schemas(schema1, schema2, schema1_name=None, schema2_name=None, verbose=False, previous=None):
     """
     Compare two SQL schemas and generate a detailed comparison report in Great Expectations style.
 
     Args:
-        schema1 (str): First schema DDL statements
-        schema2 (str): Second schema DDL statements
+        schema1 (str or SchemaIR): First schema, as DDL statements or a prebuilt SchemaIR
+        schema2 (str or SchemaIR): Second schema, as DDL statements or a prebuilt SchemaIR
         schema1_name (str, optional): Name of the first schema
         schema2_name (str, optional): Name of the second schema
+        verbose (bool): List identical tables and matching columns individually
+        previous (tuple, optional): (report, schema1, schema2) of an earlier call;
+            results of tables whose fingerprints did not change on either side
+            are reused instead of being compared again (the earlier call must
+            have used the same ``verbose`` setting)
 
     Returns:
         dict: Report of schema comparison
+
+    Schemas and tables are compared by their Merkle fingerprints first: identical
+    schemas produce an empty result list straight away, identical tables are only
+    counted (and named in ``meta["identical_tables"]``), and only the columns of
+    differing tables are expanded. ``verbose=True`` restores the full listing.
     """
     # Get the installed Great Expectations version
-    try:
-        ge_version = pkg_resources.get_distribution("great-expectations").version
-    except:
-        ge_version = "unknown"
-
-    # Parse tables from each schema
-    def parse_tables(schema):
-        tables = {}
-        table_matches = re.findall(r"CREATE TABLE ([^\s(]+)\s*\((.*?)\);", schema, re.DOTALL)
-
-        for table_name, columns_str in table_matches:
-            # Clean table name (remove schema prefix if exists)
-            full_name = table_name
-            clean_name = table_name.split('.')[-1]
-
-            # Parse columns
-            columns = {}
-            column_defs = re.findall(r"([^,]+)", columns_str)
-            for col_def in column_defs:
-                col_def = col_def.strip()
-                if col_def:
-                    parts = col_def.split(None, 1)
-                    if len(parts) >= 2:
-                        col_name, col_type = parts
-                        columns[col_name] = col_type
-
-            tables[clean_name.lower()] = {
-                "full_name": full_name,
-                "columns": columns
-            }
-
-        return tables
-
-    tables1 = parse_tables(schema1)
-    tables2 = parse_tables(schema2)
-
-    # If schema names aren't provided, default to schema1 and schema2
-    schema1_name = schema1 if schema1_name is None else schema1_name
-    schema2_name = schema2 if schema2_name is None else schema2_name
+    ge_version = _ge_version()
+
+    # Raw DDL is parsed into the shared intermediate representation once;
+    # callers that already hold a SchemaIR skip parsing entirely
+    if isinstance(schema1, SchemaIR):
+        schema1_name = schema1.name if schema1_name is None else schema1_name
+    else:
+        schema1 = parse_schema_text(schema1_name, schema1)
+    if isinstance(schema2, SchemaIR):
+        schema2_name = schema2.name if schema2_name is None else schema2_name
+    else:
+        schema2 = parse_schema_text(schema2_name, schema2)
+
+    tables1 = schema1.tables
+    tables2 = schema2.tables
+
+    # Earlier results are only valid for the same pair of schema names
+    previous_results = {}
+    if previous is not None:
+        previous_report, previous1, previous2 = previous
+        previous_meta = previous_report["meta"]
+        if previous_meta["source_schema"] == schema1_name and previous_meta["destination_schema"] == schema2_name:
+            previous_tables1 = previous1.tables
+            previous_tables2 = previous2.tables
+            previous_results = {result["kwargs"]["table"]: result for result in previous_report["results"]}
 
     # Build GE-style report
     report = {
@@ -65,52 +77,146 @@ def compare_schemas(schema1, schema2, schema1_name=None, schema2_name=None):
             "great_expectations_version": ge_version,
             "source_schema": schema1_name,
             "destination_schema": schema2_name,
+            "source_fingerprint": schema1.fingerprint.hex(),
+            "destination_fingerprint": schema2.fingerprint.hex(),
+            "column_diff_fields": list(COLUMN_FIELDS),
             "timestamp": datetime.datetime.now().isoformat()
         },
         "results": []
     }
 
+    statistics = {
+        "tables_compared": 0,
+        "identical_tables": 0,
+        "different_tables": 0,
+        "missing_in_source": 0,
+        "missing_in_destination": 0
+    }
+    identical_tables = []
+    reused = 0
+
+    # Identical schemas: nothing to expand
+    if schema1.fingerprint == schema2.fingerprint and not verbose:
+        identical_tables = sorted(tables1)
+        statistics["tables_compared"] = statistics["identical_tables"] = len(identical_tables)
+        report["meta"]["statistics"] = statistics
+        report["meta"]["identical_tables"] = identical_tables
+        return report
+
     # Get all tables from both schemas
-    all_tables = sorted(set(list(tables1.keys()) + list(tables2.keys())))
+    all_tables = sorted(set(tables1) | set(tables2))
 
     # Evaluate each table
     for table in all_tables:
-        expectation = {
-            "expectation_type": "expect_table_schema_to_match",
-            "kwargs": {
-                "table": table
-            },
-            "meta": {
-                "column_results": []
-            }
-        }
-
-        # Check if table exists in both schemas
-        if table in tables1 and table in tables2:
-            expectation["success"] = True
-            expectation["meta"]["status"] = "✅"
-
-            # Compare columns
-            all_columns = sorted(set(list(tables1[table]["columns"].keys()) + list(tables2[table]["columns"].keys())))
-
-            for col in all_columns:
-                if col in tables1[table]["columns"] and col in tables2[table]["columns"]:
-                    datatype1 = tables1[table]["columns"][col]
-                    datatype2 = tables2[table]["columns"][col]
-
-                    if datatype1 == datatype2:
-                        expectation["meta"]["column_results"].append(
-                            f"✅ Column '{col}' matches with datatype: {datatype1}")
-                    else:
-                        expectation["success"] = False
-                        expectation["meta"]["column_results"].append(
-                            f"❌ Column '{col}' has different datatypes: {datatype1} vs {datatype2}")
-                elif col in tables1[table]["columns"]:
-                    expectation["meta"]["column_results"].append(f"❌ Column '{col}' is missing in {schema2_name}")
-                elif col in tables2[table]["columns"]:
-                    expectation["meta"]["column_results"].append(f"❌ Column '{col}' is missing in {schema1_name}")
+        statistics["tables_compared"] += 1
+        table1 = tables1.get(table)
+        table2 = tables2.get(table)
+
+        if table1 is not None and table2 is not None:
+            if table1.fingerprint == table2.fingerprint:
+                statistics["identical_tables"] += 1
+                if not verbose:
+                    identical_tables.append(table)
+                    continue
+            else:
+                statistics["different_tables"] += 1
+        elif table1 is not None:
+            statistics["missing_in_destination"] += 1
+        else:
+            statistics["missing_in_source"] += 1
+
+        expectation = previous_results.get(table)
+        if expectation is None or not (_same_table(table1, previous_tables1.get(table))
+                                       and _same_table(table2, previous_tables2.get(table))):
+            expectation = compare_table(table, table1, table2, schema1_name, schema2_name, verbose=verbose)
+        else:
+            reused += 1
+        if not expectation["success"]:
+            report["success"] = False
 
         # Add to the report
         report["results"].append(expectation)
 
+    report["meta"]["statistics"] = statistics
+    report["meta"]["identical_tables"] = identical_tables
+    if previous is not None:
+        report["meta"]["reused_results"] = reused
     return report
+
+
+def _same_table(table, previous_table):
+    """Whether a table is unchanged since an earlier comparison (both absent counts as unchanged)"""
+    if table is None or previous_table is None:
+        return table is previous_table
+    return table.fingerprint == previous_table.fingerprint
+
+
+def compare_table(table, table1, table2, schema1_name, schema2_name, verbose=False):
+    """
+    Compare one table across two schemas
+
+    The outcome of every differing column (and of every column with
+    ``verbose``) is a typed record in ``meta["column_diffs"]``, stored as a
+    row of COLUMN_FIELDS (see validators.diff_records); differing table
+    constraints add one CONSTRAINT_MISMATCH record. ``meta["status"]`` is the
+    table-level kind.
+
+    Args:
+        table (str): Lowercase table name
+        table1 (Table or None): The table in the first schema
+        table2 (Table or None): The table in the second schema
+        schema1_name (str): Name of the first schema
+        schema2_name (str): Name of the second schema
+        verbose (bool): List matching columns instead of only counting them
+
+    Returns:
+        dict: GE-style expectation result for the table
+    """
+    expectation = {
+        "expectation_type": "expect_table_schema_to_match",
+        "kwargs": {
+            "table": table
+        },
+        "meta": {}
+    }
+
+    # Check if table exists in both schemas
+    if table1 is None or table2 is None:
+        expectation["success"] = False
+        expectation["meta"]["status"] = MISSING_IN_DESTINATION if table2 is None else MISSING_IN_SOURCE
+        return expectation
+
+    column_diffs = expectation["meta"]["column_diffs"] = []
+    matching_columns = 0
+
+    # Compare columns; equal column fingerprints mean equal name and definition
+    all_columns = sorted(set(table1.column_names()) | set(table2.column_names()))
+
+    for col in all_columns:
+        fingerprint1 = table1.column_fingerprint(col)
+        fingerprint2 = table2.column_fingerprint(col)
+
+        column1 = table1.column(col)
+        column2 = table2.column(col)
+
+        if fingerprint1 is not None and fingerprint1 == fingerprint2:
+            matching_columns += 1
+            if verbose:
+                add_column_diff(column_diffs, MATCH, col, column1, column2)
+        elif fingerprint1 is not None and fingerprint2 is not None:
+            kind = TYPE_MISMATCH if column1.type != column2.type else DEFINITION_MISMATCH
+            add_column_diff(column_diffs, kind, col, column1, column2)
+        elif fingerprint1 is not None:
+            add_column_diff(column_diffs, MISSING_IN_DESTINATION, col, column1, None)
+        else:
+            add_column_diff(column_diffs, MISSING_IN_SOURCE, col, None, column2)
+
+    # Keys, checks and other table-level constraints
+    same_constraints = table1.constraint_keys == table2.constraint_keys
+    if not same_constraints:
+        add_constraint_diff(column_diffs, table1.constraint_keys, table2.constraint_keys)
+
+    expectation["success"] = matching_columns == len(all_columns) and same_constraints
+    expectation["meta"]["status"] = MATCH if expectation["success"] else DIFFERENT
+    expectation["meta"]["matching_columns"] = matching_columns
+    return expectation
@@ -0,0 +1,233 @@
+import json
+import os
+import time
+
+from generate_report import (GE_VALIDATION_PATH, HTML_REPORT_PATH, collect_schemas, list_data_files,
+                             load_config, load_ge_context, resolve_schema_names, run_ge_validation)
+from parsers.docx_schema_parser import parse_schema_files
+from parsers.schema_ir import build_schema_ir
+from validators.schema_comparator import compare_schemas
+from utils.html_report import generate_html_report
+from utils.metrics import count, metrics_run, span
+from utils.report_io import report_file_path, write_report
+
+
+def _schema_key(file_path):
+    return os.path.basename(file_path).split('.')[0]
+
+
+class SchemaWatcher:
+    """
+    Long-running, incremental validation of the data directory
+
+    Keeps the parsed files, the table IR of the compared schemas, the last
+    report and (optionally) the embedding function and the Great Expectations
+    context in memory. On every change only the changed files are parsed
+    again, only tables whose fingerprints changed are compared again, and the
+    reports are rewritten only when the comparison changed.
+    """
+
+    def __init__(self, config, write_html=True, use_vector_store=False, ge_context=None):
+        self.config = config
+        self.write_html = write_html
+        self.use_vector_store = use_vector_store
+        self.ge_context = ge_context
+        self.interval = config.get("watch_interval", 0.2)
+        self.debounce = config.get("watch_debounce", 0.3)
+        self.file_states = {}   # file path -> (mtime_ns, size) of the parsed version
+        self.parsed_files = {}  # file path -> parse_schema_files result
+        self.previous = None    # (report, source IR, destination IR) of the last comparison
+        self.ge_results = None
+        self.embedding_function = None
+        self.stored_schemas = set()  # Schemas whose records are in ChromaDB
+
+    def snapshot(self):
+        """Modification time and size of every schema file"""
+        states = {}
+        for file_path in list_data_files(self.config):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                # Deleted between listing and stat; picked up on the next poll
+                continue
+            states[file_path] = (stat.st_mtime_ns, stat.st_size)
+        return states
+
+    def wait_for_changes(self):
+        """
+        Poll until the data directory changes and then stays quiet for the debounce period
+
+        Returns:
+            dict: The settled snapshot
+        """
+        pending = None
+        changed_at = None
+        while True:
+            time.sleep(self.interval)
+            states = self.snapshot()
+            if states == self.file_states:
+                # Changes that were reverted before settling are ignored
+                pending = None
+                continue
+            if states != pending:
+                pending = states
+                changed_at = time.monotonic()
+                continue
+            if time.monotonic() - changed_at >= self.debounce:
+                return states
+
+    def refresh(self, states):
+        """
+        Bring the reports in line with a snapshot of the data directory
+
+        Args:
+            states: Snapshot returned by snapshot()
+
+        Returns:
+            dict: The comparison report, or None when nothing could be compared
+        """
+        started = time.perf_counter()
+        changed = sorted(path for path, state in states.items() if self.file_states.get(path) != state)
+        removed = sorted(path for path in self.file_states if path not in states)
+
+        with span("parse"):
+            for parsed in parse_schema_files(changed, max_workers=self.config.get("parse_workers", 1)):
+                self.parsed_files[parsed["file_path"]] = parsed
+            for file_path in removed:
+                del self.parsed_files[file_path]
+            self.file_states = dict(states)
+            all_schemas, schemas_by_file = collect_schemas(
+                self.config, [self.parsed_files[path] for path in sorted(self.parsed_files)], verbose=False)
+        count("files_changed", len(changed) + len(removed))
+        for file_path in changed:
+            error = self.parsed_files[file_path]["error"]
+            if not error:
+                print(f"📄 Parsed file: {file_path} ({len(self.parsed_files[file_path]['schemas'])} tables)")
+        for file_path in removed:
+            print(f"📄 Removed file: {file_path}")
+
+        # Tables carry their file's schema name (see collect_schemas)
+        affected = {_schema_key(path) for path in changed + removed}
+
+        if self.ge_context is not None:
+            self._validate(schemas_by_file, affected)
+        if self.use_vector_store:
+            self._store(all_schemas, affected)
+
+        report = self._compare(schemas_by_file)
+        if report is not None:
+            statistics = report["meta"]["statistics"]
+            print(f"🔁 Re-validated in {(time.perf_counter() - started) * 1000:.0f} ms: "
+                  f"{len(changed) + len(removed)} files changed, {len(all_schemas)} tables, "
+                  f"{statistics['different_tables']} different, "
+                  f"{statistics['missing_in_source'] + statistics['missing_in_destination']} missing")
+        return report
+
+    def _compare(self, schemas_by_file):
+        schema_names = resolve_schema_names(self.config, schemas_by_file)
+        if schema_names is None:
+            return None
+        schema1, schema2 = schema_names[:2]
+
+        with span("build_ir"):
+            source = build_schema_ir(schema1, schemas_by_file.get(schema1, []))
+            destination = build_schema_ir(schema2, schemas_by_file.get(schema2, []))
+
+        if self.previous is not None:
+            previous_report, previous_source, previous_destination = self.previous
+            if (previous_source.name, previous_destination.name) == (schema1, schema2) \
+                    and previous_source.fingerprint == source.fingerprint \
+                    and previous_destination.fingerprint == destination.fingerprint:
+                print(f"✅ No table of {schema1} or {schema2} changed; reports left as they are")
+                return previous_report
+
+        with span("compare"):
+            report = compare_schemas(source, destination, schema1_name=schema1, schema2_name=schema2,
+                                     verbose=self.config.get("verbose_report", False), previous=self.previous)
+        count("tables_recompared", len(report["results"]) - report["meta"].get("reused_results", 0))
+        self.previous = (report, source, destination)
+
+        report_path = report_file_path(self.config)
+        with span("write_report"):
+            write_report(report, report_path)
+        if self.write_html:
+            with span("html"):
+                generate_html_report(report, HTML_REPORT_PATH, page_size=self.config.get("html_page_size"))
+        return report
+
+    def _validate(self, schemas_by_file, affected):
+        """Validate the schemas of changed files with the warm Great Expectations context"""
+        names = affected if self.ge_results is not None else set(schemas_by_file)
+        names = [name for name in sorted(names) if name in schemas_by_file]
+        if not names:
+            return
+        results = run_ge_validation(self.ge_context, {name: schemas_by_file[name] for name in names})
+        if results is None:
+            return
+        if self.ge_results is None:
+            self.ge_results = results
+            return
+
+        # Keep the results of the schemas that were not validated again
+        self.ge_results["schemas"].update(results["schemas"])
+        for name in list(self.ge_results["schemas"]):
+            if name not in schemas_by_file:
+                del self.ge_results["schemas"][name]
+        self.ge_results["success"] = all(result["success"] for result in self.ge_results["schemas"].values())
+        with open(GE_VALIDATION_PATH, "w") as f:
+            json.dump(self.ge_results, f, indent=2)
+
+    def _store(self, all_schemas, affected):
+        """Sync the chunks of changed schemas into ChromaDB with the warm embedding function"""
+        from database.chroma_store import LangchainEmbeddingFunction, delete_schemas, store_schemas
+        from utils.chunk_utils import chunk_tables, column_records
+
+        if self.embedding_function is None:
+            self.embedding_function = LangchainEmbeddingFunction.from_config(self.config)
+            schemas = all_schemas
+        else:
+            schemas = [schema for schema in all_schemas if schema["schema_name"] in affected]
+        present = {schema["schema_name"] for schema in all_schemas}
+        # Schemas whose last file was removed are not pruned by store_schemas
+        removed = self.stored_schemas - present
+
+        try:
+            if removed:
+                with span("store"):
+                    delete_schemas(removed, self.config)
+            self.stored_schemas = present
+            if not schemas:
+                return
+            with span("chunk"):
+                chunks = chunk_tables(schemas, self.config.get("chunk_size"), self.config.get("chunk_overlap", 0))
+                columns = column_records(schemas) if self.config.get("column_index", True) else None
+            with span("store"):
+                store_schemas(chunks, self.config, embedding_function=self.embedding_function,
+                              column_records=columns)
+        except Exception as e:
+            print(f"⚠️ Error storing schemas: {e}")
+
+    def run(self):
+        """Validate once, then re-validate after every change until interrupted"""
+        self.refresh(self.snapshot())
+        print(f"👀 Watching {self.config['data_directory']} for changes (Ctrl+C to stop)")
+        try:
+            while True:
+                self.refresh(self.wait_for_changes())
+        except KeyboardInterrupt:
+            print("Stopped watching")
+
+
+def main(config_path="config.yaml", write_html=True, use_vector_store=False, validate=False):
+    config = load_config(config_path)
+    if validate:
+        os.makedirs(os.path.dirname(GE_VALIDATION_PATH), exist_ok=True)
+    ge_context = load_ge_context(config) if validate else None
+
+    with metrics_run(config, "watch"):
+        SchemaWatcher(config, write_html=write_html, use_vector_store=use_vector_store,
+                      ge_context=ge_context).run()
+
+
+if __name__ == "__main__":
+    main()